@@ -1,10 +1,11 @@
 """Application settings using Pydantic for validation."""
 
-from typing import Optional  # Optional[T] = Union[T, None]
+from functools import lru_cache  # Least Recently Used cache decorator
+from typing import Literal
+
 # Pydantic: Data validation using Python type annotations
 # Why: Validates types, parses env vars, provides defaults, raises errors on invalid config
 from pydantic_settings import BaseSettings
-from functools import lru_cache  # Least Recently Used cache decorator
 
 
 # BaseSettings: Pydantic class that auto-loads config from environment variables
@@ -14,22 +15,35 @@ class Settings(BaseSettings):
     """Application configuration with environment variable support."""
     
     # Azure Event Hub settings
-    # Optional[str] = Union[str, None] - can be string or None (not required)
-    event_hub_connection_string: Optional[str] = None  # Loaded from EVENT_HUB_CONNECTION_STRING
-    event_hub_name: Optional[str] = None  # Loaded from EVENT_HUB_NAME
+    # str | None: can be string or None (not required)
+    event_hub_connection_string: str | None = None  # Loaded from EVENT_HUB_CONNECTION_STRING
+    event_hub_name: str | None = None  # Loaded from EVENT_HUB_NAME
     
     # Azure AI Search settings
-    search_endpoint: Optional[str] = None
-    search_api_key: Optional[str] = None
+    search_endpoint: str | None = None
+    search_api_key: str | None = None
     search_index_name: str = "fruits-quality"
     
     # Detection settings
     yolo_model: str = "yolov8n.pt"
     detection_confidence: float = 0.3
+    # Literal: only these strings validate ("onnx" needs the onnxruntime package)
+    detector_engine: Literal["torch", "onnx"] = "torch"
+    detector_imgsz: int = 640  # Model input size in pixels
+    detector_precision: Literal["fp32", "int8"] = "fp32"  # int8: onnx engine, after `calibrate`
+    detector_warmup: int = 1  # Dummy inferences when a process first loads the model
+    detector_tile_size: int = 0  # >0: detect on overlapping tiles (high-resolution cameras)
+    detector_tile_overlap: float = 0.2  # Fraction of a tile shared with its neighbour
+    model_cache_dir: str = "data/cache/models"  # ONNX exports keyed by weights hash + imgsz
     
     # Video settings
     default_camera_source: str = "0"
     output_directory: str = "output"
+    output_codec: str = "XVID"  # FourCC for annotated output video (e.g. XVID, MJPG, mp4v)
+    frame_cache_dir: str = "data/cache/frames"  # Decoded frame cache used by `detect --cache`
+    # Shelf polygons per camera id ("default" = single --source), JSON in the environment:
+    # CAMERA_ROIS='{"aisle3-left": [[0, 120], [1280, 90], [1280, 620], [0, 650]]}'
+    camera_rois: dict[str, list[list[int]]] = {}
     
     class Config:
         """Pydantic configuration."""
@@ -42,7 +56,7 @@ class Settings(BaseSettings):
 # Why: Ensures get_settings() returns same instance every time (singleton pattern)
 # Pattern: Prevents re-loading .env file on every call, saves memory
 # Result: First call creates Settings, subsequent calls return cached instance
-@lru_cache()
+@lru_cache
 def get_settings() -> Settings:
     """
     Get cached settings instance.
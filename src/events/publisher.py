@@ -1,9 +1,7 @@
 """Event publishing to Azure Event Hub with async patterns."""
 
 import json
-import asyncio
-from dataclasses import dataclass, asdict
-from typing import Optional, Any
+from dataclasses import asdict, dataclass
 from datetime import datetime
 
 
@@ -15,14 +13,18 @@ class FruitQualityEvent:
     freshness_level: str
     quality_score: float
     confidence: float
-    location: Optional[str] = None
-    camera_id: Optional[str] = None
+    location: str | None = None
+    camera_id: str | None = None
+    capture_timestamp: str | None = None  # When the frame was decoded (ISO, UTC)
+    frame_id: int | None = None  # Frame position in the source
+    trace_id: str | None = None  # Correlates events and search documents of one frame
+    track_id: int | None = None  # Same physical fruit across frames (per camera)
 
 
 class EventPublisher:
     """Azure Event Hub publisher with connection pooling."""
     
-    def __init__(self, connection_string: Optional[str] = None, event_hub_name: Optional[str] = None):
+    def __init__(self, connection_string: str | None = None, event_hub_name: str | None = None):
         """
         Initialize Event Hub publisher.
         
@@ -72,7 +74,7 @@ class EventPublisher:
 
 async def publish_event(
     event: FruitQualityEvent,
-    publisher: Optional[EventPublisher] = None
+    publisher: EventPublisher | None = None
 ) -> bool:
     """
     Functional wrapper for event publishing.
@@ -95,8 +97,12 @@ def create_quality_event(
     freshness_level: str,
     quality_score: float,
     confidence: float,
-    location: Optional[str] = None,
-    camera_id: Optional[str] = None
+    location: str | None = None,
+    camera_id: str | None = None,
+    capture_timestamp: str | None = None,
+    frame_id: int | None = None,
+    trace_id: str | None = None,
+    track_id: int | None = None
 ) -> FruitQualityEvent:
     """Factory function for creating quality events."""
     return FruitQualityEvent(
@@ -106,5 +112,9 @@ def create_quality_event(
         quality_score=quality_score,
         confidence=confidence,
         location=location,
-        camera_id=camera_id
+        camera_id=camera_id,
+        capture_timestamp=capture_timestamp,
+        frame_id=frame_id,
+        trace_id=trace_id,
+        track_id=track_id
     )
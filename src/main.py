@@ -1,47 +1,200 @@
 """Main entry point with Click CLI for PoC demo."""
 
-import click
+import json
 from pathlib import Path
 
-from .pipeline.orchestrator import process_shelf_video, PipelineConfig
+import click
+
 from .config.settings import get_settings
+from .pipeline.orchestrator import PipelineConfig, process_shelf_video
+from .pipeline.parallel import process_video_segments
 
 
 @click.group()
 @click.version_option(version="0.1.0")
 def cli():
     """Fruits Quality Detection System - Supermarket shelf monitoring PoC."""
-    pass
 
 
 @cli.command()
-@click.option('--source', '-s', required=True, help='Video source (camera index, file, or URL)')
+@click.option('--source', '-s', help='Video source (camera index, file, or URL)')
+# multiple=True: option can be repeated, values arrive as a tuple
+@click.option('--camera', '-k', 'cameras', multiple=True,
+              help='Extra camera as ID=SOURCE (repeat for multi-camera mode)')
 @click.option('--output', '-o', help='Output video file path')
 @click.option('--max-frames', '-m', default=0, help='Max frames to process (0 = unlimited)')
 @click.option('--conf', '-c', default=0.3, help='Detection confidence threshold')
 @click.option('--events/--no-events', default=False, help='Enable Event Hub publishing')
 @click.option('--search/--no-search', default=False, help='Enable AI Search indexing')
 @click.option('--display/--no-display', default=True, help='Display video window')
-def detect(source, output, max_frames, conf, events, search, display):
+@click.option('--prefetch', default=0,
+              help='Frames to decode ahead on a background thread (0 = off)')
+@click.option('--live/--no-live', default=False, help='Keep only the newest frame (live cameras)')
+@click.option('--pool-size', default=0, help='Reusable frame buffers (0 = allocate per frame)')
+@click.option('--stride', default=1,
+              help='Analyse every Nth frame (skipped frames are not decoded)')
+@click.option('--target-fps', type=float, help='Frames per second to analyse (overrides --stride)')
+@click.option('--workers', '-w', default=1, help='Worker processes for offline video files')
+# click.Choice: restricts the value to a fixed set (validated by click)
+@click.option('--gate', type=click.Choice(['absdiff', 'phash']),
+              help='Skip detection on frames that match the last analysed one')
+@click.option('--gate-threshold', type=float, help='Scene-change threshold (default per method)')
+@click.option('--codec', help='FourCC codec for --output (default: OUTPUT_CODEC setting)')
+@click.option('--writer-policy', type=click.Choice(['drop', 'block']), default='drop',
+              help='When the encoder falls behind: drop frames or block detection')
+@click.option('--resize', help='Resize frames after decode, as WIDTHxHEIGHT (e.g. 960x540)')
+@click.option('--cache/--no-cache', default=False,
+              help='Decode the video file once into FRAME_CACHE_DIR, re-runs read the cache')
+@click.option('--batch-size', default=1, help='Frames per detector forward pass (1 = no batching)')
+@click.option('--batch-timeout', default=20.0,
+              help='Max ms to wait for a batch to fill after its first frame')
+@click.option('--engine', type=click.Choice(['torch', 'onnx']),
+              help='Inference engine (default: DETECTOR_ENGINE setting)')
+@click.option('--imgsz', type=int, help='Model input size (default: DETECTOR_IMGSZ setting)')
+@click.option('--precision', type=click.Choice(['fp32', 'int8']),
+              help='onnx engine precision, int8 after `calibrate` (default: DETECTOR_PRECISION)')
+@click.option('--tile-size', type=int,
+              help='Detect on overlapping tiles of this size '
+                   '(default: DETECTOR_TILE_SIZE, 0 = off)')
+@click.option('--tile-overlap', type=float,
+              help='Fraction of a tile shared with its neighbour (default: DETECTOR_TILE_OVERLAP)')
+@click.option('--track/--no-track', default=False,
+              help='Track fruit across frames: score and publish each one once, '
+                   'again when it changes')
+@click.option('--track-metric', type=click.Choice(['iou', 'centroid']), default='iou',
+              help='Detection-to-track matching (centroid tolerates small or moving boxes)')
+@click.option('--keyframe-interval', default=0,
+              help='Detect every K frames (or on --gate scene change), optical flow in between')
+@click.option('--latency-budget', type=float, default=0.0,
+              help='Detector ms per camera frame; adapts the input size to fit (0 = fixed --imgsz)')
+@click.option('--imgsz-min', default=320, help='Smallest input size for --latency-budget')
+@click.option('--imgsz-max', default=0,
+              help='Largest input size for --latency-budget (0 = --imgsz)')
+def detect(source, cameras, output, max_frames, conf, events, search, display, prefetch, live,
+           pool_size, stride, target_fps, workers, gate, gate_threshold, codec, writer_policy,
+           resize, cache, batch_size, batch_timeout, engine, imgsz, precision,
+           tile_size, tile_overlap, track, track_metric, keyframe_interval, latency_budget,
+           imgsz_min, imgsz_max):
     """Run fruit quality detection on video source."""
+    if not source and not cameras:
+        raise click.UsageError("Provide --source or at least one --camera ID=SOURCE")
+    
+    sources = _parse_cameras(cameras)
+    if source and sources:
+        sources = {"0": source, **sources}  # **dict: merge, --source becomes camera "0"
+    
+    settings = get_settings()
     config = PipelineConfig(
-        source=source,
+        source=source or "",
+        sources=sources,
         output_path=output,
         max_frames=max_frames,
         detector_conf=conf,
+        model_name=settings.yolo_model,
+        engine=engine or settings.detector_engine,
+        imgsz=imgsz or settings.detector_imgsz,
+        precision=precision or settings.detector_precision,
+        # `is None` checks: --tile-size 0 turns tiling off, --tile-overlap 0 is a valid overlap
+        tile_size=settings.detector_tile_size if tile_size is None else tile_size,
+        tile_overlap=settings.detector_tile_overlap if tile_overlap is None else tile_overlap,
+        warmup=settings.detector_warmup,
+        model_cache_dir=settings.model_cache_dir,
         enable_events=events,
         enable_search=search,
-        display=display
+        display=display,
+        prefetch_depth=prefetch,
+        live=live,
+        frame_pool_size=pool_size,
+        frame_stride=stride,
+        target_fps=target_fps,
+        workers=workers,
+        scene_gate=gate,
+        scene_threshold=gate_threshold,
+        output_codec=codec or settings.output_codec,
+        writer_policy=writer_policy,
+        resize=_parse_size(resize) if resize else None,
+        frame_cache_dir=settings.frame_cache_dir if cache else None,
+        rois=settings.camera_rois,
+        batch_size=batch_size,
+        batch_timeout_ms=batch_timeout,
+        tracking=track,
+        track_metric=track_metric,
+        keyframe_interval=keyframe_interval,
+        latency_budget_ms=latency_budget,
+        imgsz_min=imgsz_min,
+        imgsz_max=imgsz_max
     )
-    
-    click.echo(f"Processing video from: {source}")
-    stats = process_shelf_video(config)
+    if latency_budget and config.engine == "onnx" and config.precision == "int8":
+        raise click.UsageError(
+            "--latency-budget cannot switch input sizes with --precision int8: `calibrate` "
+            "builds an INT8 model for DETECTOR_IMGSZ only; use fp32 or drop --latency-budget"
+        )
+
+    click.echo(f"Processing video from: {', '.join(sources.values()) if sources else source}")
+    if workers > 1:
+        if sources:
+            raise click.UsageError("--workers splits a single video file; drop --camera")
+        if track or keyframe_interval > 1 or latency_budget:
+            raise click.UsageError("--track, --keyframe-interval and --latency-budget need one "
+                                   "continuous stream; drop --workers")
+        if live or output or batch_size > 1 or pool_size:
+            raise click.UsageError("--live, --output, --batch-size and --pool-size are not "
+                                   "supported by segment workers; drop --workers")
+        stats = process_video_segments(config)  # Offline: split file across processes
+    else:
+        stats = process_shelf_video(config)
     
     click.echo("\n=== Processing Complete ===")
     click.echo(f"Frames processed: {stats['frames_processed']}")
+    click.echo(f"Frames dropped: {stats['frames_dropped']}")
+    click.echo(f"Source reconnects: {stats.get('reconnects', 0)}")
     click.echo(f"Detections: {stats['detections']}")
+    if gate:
+        click.echo(f"Inference skipped (unchanged scene): {stats['inference_skipped']}")
+    if keyframe_interval > 1:
+        click.echo(f"Frames propagated (optical flow): {stats.get('frames_propagated', 0)}")
+    if 'imgsz_frames' in stats:
+        click.echo(f"Input size: {stats['imgsz']} at the end, {stats['imgsz_changes']} changes, "
+                   f"frames per size {stats['imgsz_frames']}")
+    if 'detector_duty_cycle' in stats:
+        click.echo(f"Detector duty cycle: {stats['detector_duty_cycle']:.0%} of frames")
+    if output:
+        click.echo(f"Frames written: {stats.get('frames_written', 0)} "
+                   f"(dropped by writer: {stats.get('frames_write_dropped', 0)})")
+    if track:
+        click.echo(f"Tracks: {stats.get('tracks_created', 0)} "
+                   f"(quality assessed {stats['quality_assessed']} times)")
     click.echo(f"Events published: {stats['events_published']}")
     click.echo(f"Documents indexed: {stats['documents_indexed']}")
+    if 'mean_batch_size' in stats and batch_size > 1:
+        click.echo(f"Batches: {stats['batches']} (mean size {stats['mean_batch_size']})")
+    if 'frame_cache' in stats:
+        click.echo(f"Frame cache: {stats['frame_cache']}")
+    for stage, percentiles in stats.get('latency_ms', {}).items():
+        click.echo(f"Latency {stage}: p50 {percentiles['p50']} ms, "
+                   f"p95 {percentiles['p95']} ms, p99 {percentiles['p99']} ms")
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    """Parse WIDTHxHEIGHT into a (width, height) tuple."""
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError as err:
+        raise click.BadParameter(
+            f"Expected WIDTHxHEIGHT, got '{value}'", param_hint='--resize'
+        ) from err
+    return width, height
+
+
+def _parse_cameras(cameras: tuple[str, ...]) -> dict[str, str]:
+    """Parse repeated ID=SOURCE options into a camera_id -> source mapping."""
+    sources = {}
+    for spec in cameras:
+        camera_id, sep, camera_source = spec.partition('=')
+        if not sep or not camera_id or not camera_source:
+            raise click.BadParameter(f"Expected ID=SOURCE, got '{spec}'", param_hint='--camera')
+        sources[camera_id] = camera_source
+    return sources
 
 
 @cli.command()
@@ -62,6 +215,42 @@ def demo():
     click.echo(f"\nDemo complete: {stats['frames_processed']} frames, {stats['detections']} detections")
 
 
+@cli.command()
+# required=True + multiple=True: at least one --source, repeatable
+@click.option('--source', '-s', 'sources', multiple=True, required=True,
+              help='Video file to sample calibration frames from (repeatable)')
+# IntRange(min=2): at least one calibration and one held-out evaluation frame
+@click.option('--frames', '-n', type=click.IntRange(min=2), default=200,
+              help='Frames to sample (half calibrate, half evaluate)')
+@click.option('--conf', '-c', default=0.3, help='Detection confidence for the comparison')
+@click.option('--report', type=click.Path(), help='Also write the FP32 vs INT8 report as JSON')
+def calibrate(sources, frames, conf, report):
+    """Build the INT8 detector from sampled frames and compare it with FP32."""
+    from .vision.onnx_engine import export_onnx, int8_path
+    from .vision.quantize import compare_models, iter_report_lines, quantize_int8, sample_frames
+    
+    settings = get_settings()
+    fp32_model = export_onnx(settings.yolo_model, settings.detector_imgsz, settings.model_cache_dir)
+    sampled = sample_frames(sources, frames)
+    if len(sampled) < 2:
+        raise click.ClickException(f"Only {len(sampled)} frame(s) could be sampled, need 2 or more")
+    # Interleaved split: both halves cover every video, evaluation frames are never calibrated on
+    calibration, evaluation = sampled[::2], sampled[1::2]
+    
+    click.echo(f"Calibrating on {len(calibration)} frames from {len(sources)} video(s)...")
+    int8_model = quantize_int8(fp32_model, calibration, int8_path(fp32_model))
+    click.echo(f"INT8 model: {int8_model}")
+    
+    click.echo(f"\n=== FP32 vs INT8 ({len(evaluation)} held-out frames) ===")
+    results = compare_models(fp32_model, int8_model, evaluation, conf)
+    for line in iter_report_lines(results):
+        click.echo(line)
+    if report:
+        Path(report).write_text(json.dumps(results, indent=2))
+        click.echo(f"Report written to {report}")
+    click.echo("Use it with DETECTOR_ENGINE=onnx DETECTOR_PRECISION=int8 (or --precision int8)")
+
+
 @cli.command()
 def config():
     """Show current configuration."""
@@ -70,7 +259,16 @@ def config():
     click.echo("\n=== Current Configuration ===")
     click.echo(f"YOLO Model: {settings.yolo_model}")
     click.echo(f"Detection Confidence: {settings.detection_confidence}")
+    click.echo(f"Detector Engine: {settings.detector_engine} "
+               f"(imgsz {settings.detector_imgsz}, {settings.detector_precision})")
+    click.echo(f"Model Cache Directory: {settings.model_cache_dir}")
+    click.echo(f"Detector Warm-up Runs: {settings.detector_warmup}")
+    click.echo(f"Detector Tiles: {settings.detector_tile_size or 'Off'} "
+               f"(overlap {settings.detector_tile_overlap})")
     click.echo(f"Output Directory: {settings.output_directory}")
+    click.echo(f"Output Codec: {settings.output_codec}")
+    click.echo(f"Frame Cache Directory: {settings.frame_cache_dir}")
+    click.echo(f"Camera ROIs: {', '.join(settings.camera_rois) or 'None (full frame)'}")
     click.echo(f"\nAzure Event Hub: {'Configured' if settings.event_hub_connection_string else 'Not configured'}")
     click.echo(f"Azure AI Search: {'Configured' if settings.search_endpoint else 'Not configured'}")
 
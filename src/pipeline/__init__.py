@@ -1,6 +1,7 @@
 """Pipeline module - Orchestration and processing chains."""
 
+from .decorators import log_execution, retry, timer
 from .orchestrator import process_shelf_video
-from .decorators import timer, retry, log_execution
+from .parallel import process_video_segments
 
-__all__ = ["process_shelf_video", "timer", "retry", "log_execution"]
+__all__ = ["log_execution", "process_shelf_video", "process_video_segments", "retry", "timer"]
@@ -0,0 +1,114 @@
+"""Batch analysis: gate reuse, keyframe propagation and one detector pass per batch."""
+
+import time
+
+from ..vision.detect import FruitDetector
+from ..vision.frames import CapturedFrame
+from ..vision.roi import detect_in_rois
+from .camera_state import CameraState
+from .governor import ResolutionGovernor
+from .keyframes import KeyframeSchedule, propagate_results
+from .latency import LatencyTracker
+from .results import FrameResults, assess
+
+
+def analyse_batch(
+    batch: list[tuple[str | None, CapturedFrame]],
+    detector: FruitDetector,
+    cameras: dict[str | None, CameraState],
+    stats: dict,
+    latency: LatencyTracker,
+    governor: ResolutionGovernor | None = None
+) -> list[FrameResults]:
+    """
+    FrameResults for every frame of a batch.
+
+    Frames whose scene is unchanged reuse the results of the last analysed frame
+    of their camera (possibly an earlier frame of this batch); all other frames
+    go through the detector together in one forward pass. Cameras with a
+    propagator only detect on keyframes (see keyframes.py). A governor sees
+    every detector call and may change the input size.
+    """
+    results: list = [None] * len(batch)
+    to_detect: list[int] = []
+    reuse_from: dict[int, int] = {}  # Frame index -> index of earlier frame in this batch
+    analysed: dict[str | None, int] = {}  # Camera -> last frame of this batch to detect
+    propagated: set[int] = set()
+    schedule = KeyframeSchedule()
+
+    for i, (camera_id, captured) in enumerate(batch):
+        state = cameras[camera_id]
+        state.mark_seen(captured.captured_at)
+        has_results = camera_id in analysed or state.last_results is not None
+        if state.propagator is not None:
+            if schedule.propagate(camera_id, state, captured.image, has_results):
+                propagated.add(i)
+                continue
+        elif not state.scene_changed(captured.image) and has_results:
+            # Scene unchanged: reuse previous detections and quality results
+            stats['inference_skipped'] += 1
+            if camera_id in analysed:
+                reuse_from[i] = analysed[camera_id]
+            else:
+                results[i] = state.last_results.reused()
+            continue
+        to_detect.append(i)
+        analysed[camera_id] = i
+
+    if to_detect:
+        detected_results = _detect(
+            [batch[i] for i in to_detect], detector, cameras, stats, latency, governor
+        )
+        for i, frame_results in zip(to_detect, detected_results):
+            results[i] = frame_results
+
+    # In frame order: propagation continues from the previous frame of the same camera
+    detected = set(to_detect)
+    for i, (camera_id, captured) in enumerate(batch):
+        state = cameras[camera_id]
+        if i in reuse_from:
+            results[i] = results[reuse_from[i]].reused()
+            continue
+        if i in propagated:
+            results[i] = propagate_results(state, captured.image, stats, latency)
+        elif i in detected:
+            if state.propagator is not None:
+                state.propagator.reset(captured.image, results[i].detections)
+        else:
+            continue  # Unchanged scene, reused results of an earlier batch
+        state.last_results = results[i]
+    return results
+
+
+def _detect(
+    items: list[tuple[str | None, CapturedFrame]],
+    detector: FruitDetector,
+    cameras: dict[str | None, CameraState],
+    stats: dict,
+    latency: LatencyTracker,
+    governor: ResolutionGovernor | None
+) -> list[FrameResults]:
+    """One detector pass over (camera_id, frame) items, then quality per frame."""
+    frames = [captured.image for _, captured in items]
+    start = time.perf_counter()
+    with latency.measure('detect'):
+        batch_detections = detect_in_rois(
+            detector, frames, [cameras[camera_id].roi for camera_id, _ in items]
+        )
+    if governor is not None:
+        # Frames analysed per input size (how much of the run was degraded)
+        per_size = stats.setdefault('imgsz_frames', {})
+        per_size[detector.imgsz] = per_size.get(detector.imgsz, 0) + len(frames)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        now = max(captured.captured_at for _, captured in items)
+        active = sum(state.is_active(now) for state in cameras.values())  # Not cameras ever seen
+        new_size = governor.observe(elapsed_ms, len(frames), cameras=active)
+        if new_size is not None:
+            detector.set_imgsz(new_size)
+    results = []
+    for (camera_id, _), frame, detections in zip(items, frames, batch_detections):
+        with latency.measure('quality'):
+            results.append(assess(detections, frame, cameras[camera_id].tracker, stats))
+    stats['batches'] = stats.get('batches', 0) + 1
+    stats['frames_batched'] = stats.get('frames_batched', 0) + len(items)
+    return results
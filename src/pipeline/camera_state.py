@@ -0,0 +1,69 @@
+"""Per-camera analysis state kept across batches (ROI, gate, tracker, propagator, results)."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..vision.propagate import FlowPropagator
+from ..vision.roi import ShelfROI, roi_for_camera
+from ..vision.tracker import Tracker
+from .config import PipelineConfig
+from .gating import SceneChangeGate
+from .results import FrameResults
+
+# A camera counts as active while its last frame is newer than this many seconds,
+# or than ACTIVE_INTERVALS of its own frame interval (slow cameras)
+ACTIVE_TIMEOUT_S = 2.0
+ACTIVE_INTERVALS = 3
+
+
+@dataclass
+class CameraState:
+    """Everything the pipeline remembers about one camera between its frames."""
+    roi: ShelfROI | None = None
+    gate: SceneChangeGate | None = None
+    tracker: Tracker | None = None
+    propagator: FlowPropagator | None = None  # Set when keyframe_interval > 1
+    keyframe_interval: int = 0
+    last_results: FrameResults | None = None  # Results of the camera's latest analysed frame
+    last_seen: float | None = None  # Capture time (monotonic) of the camera's latest frame
+    frame_interval: float = 0.0  # Smoothed seconds between the camera's frames
+
+    @classmethod
+    def from_config(cls, config: PipelineConfig, camera_id: str | None) -> "CameraState":
+        """Fresh state for a camera, with the components the configuration enables."""
+        return cls(
+            roi=roi_for_camera(config.rois, camera_id),
+            gate=SceneChangeGate(config.scene_gate, config.scene_threshold)
+            if config.scene_gate else None,
+            tracker=Tracker(config.track_metric,
+                            appearance_threshold=config.track_appearance_threshold)
+            if config.tracking else None,
+            propagator=FlowPropagator() if config.keyframe_interval > 1 else None,
+            keyframe_interval=config.keyframe_interval
+        )
+
+    def mark_seen(self, captured_at: float):
+        """Record a frame of this camera (capture time, monotonic clock)."""
+        if self.last_seen is not None:
+            gap = max(captured_at - self.last_seen, 0.0)
+            # Exponential moving average: one late frame does not reset the estimate
+            previous = self.frame_interval or gap
+            self.frame_interval = 0.8 * previous + 0.2 * gap
+        self.last_seen = captured_at
+
+    def is_active(self, now: float) -> bool:
+        """True while the camera keeps delivering frames (went quiet = offline)."""
+        if self.last_seen is None:
+            return False
+        return now - self.last_seen <= max(ACTIVE_TIMEOUT_S, ACTIVE_INTERVALS * self.frame_interval)
+
+    def scene_changed(self, frame: np.ndarray) -> bool:
+        """
+        Gate check (updates the gate reference on a change); True without a gate.
+
+        Gates on the ROI only: shoppers walking through the aisle are not shelf changes.
+        """
+        if self.gate is None:
+            return True
+        return self.gate.should_analyse(self.roi.crop(frame) if self.roi else frame)
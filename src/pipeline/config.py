@@ -0,0 +1,67 @@
+"""Pipeline configuration shared by the single-process and segment-parallel pipelines."""
+
+from dataclasses import dataclass, field  # field: per-instance defaults for mutable types
+
+from ..utils.fleet import CameraSpec
+
+
+@dataclass
+class PipelineConfig:
+    """Configuration for processing pipeline."""
+    source: str
+    output_path: str | None = None
+    max_frames: int = 0
+    detector_conf: float = 0.3
+    model_name: str = "yolov8n.pt"  # Weights, model name or .onnx file
+    engine: str = "torch"  # "torch" or "onnx" (ONNX Runtime CPU)
+    imgsz: int = 640  # Model input size in pixels
+    precision: str = "fp32"  # "int8" = calibrated ONNX model (onnx engine)
+    warmup: int = 1  # Dummy inferences when the process first loads the model
+    tile_size: int = 0  # >0: detect on overlapping tiles of this size, one batch per frame
+    tile_overlap: float = 0.2  # Fraction of a tile shared with its neighbour
+    model_cache_dir: str = "data/cache/models"  # ONNX exports (onnx engine)
+    enable_events: bool = False
+    enable_search: bool = False
+    display: bool = True
+    prefetch_depth: int = 0  # Frames decoded ahead on a background thread (0 = off)
+    live: bool = False  # Latest-frame-wins capture for live cameras (drops stale frames)
+    frame_pool_size: int = 0  # Reusable frame buffers kept by the pool (0 = allocate per frame)
+    # field(default_factory=dict): new dict per instance (a shared {} default would leak state)
+    sources: dict[str, str] = field(default_factory=dict)  # camera_id -> source (multi-camera)
+    frame_stride: int = 1  # Process every Nth frame (skipped frames are grabbed, not decoded)
+    target_fps: float | None = None  # Frames per second to analyse (overrides frame_stride)
+    workers: int = 1  # Worker processes for process_video_segments (offline files)
+    scene_gate: str | None = None  # "absdiff" / "phash": skip detection on unchanged frames
+    scene_threshold: float | None = None  # Gate threshold (None = method default)
+    output_codec: str = "XVID"  # FourCC for output_path
+    writer_queue_size: int = 32  # Annotated frames buffered for the encoder thread
+    writer_policy: str = "drop"  # "drop" frames or "block" when the encoder falls behind
+    max_reconnects: int = 5  # Live sources: reconnect attempts with exponential backoff
+    resize: tuple[int, int] | None = None  # (width, height) applied to frames after decode
+    frame_cache_dir: str | None = None  # Decode video files once, re-runs read the mmap cache
+    fleet: list[CameraSpec] = field(default_factory=list)  # Simulated cameras (load testing)
+    # camera_id ("default" for a single source) -> shelf polygon [[x, y], ...]
+    rois: dict[str, list[list[int]]] = field(default_factory=dict)
+    batch_size: int = 1  # Frames per detector forward pass (1 = no micro-batching)
+    batch_timeout_ms: float = 20.0  # Max wait for a batch to fill after its first frame
+    tracking: bool = False  # Score and publish each tracked fruit once, again when its look changes
+    track_metric: str = "iou"  # "iou" or "centroid" detection-to-track matching
+    track_appearance_threshold: float = 12.0  # Mean colour change (0-255) that re-scores a track
+    keyframe_interval: int = 0  # >1: detect every K frames (or on scene change), flow in between
+    latency_budget_ms: float = 0.0  # >0: adapt imgsz so detection fits this budget per camera frame
+    imgsz_min: int = 320  # Lowest input size the governor may pick
+    imgsz_max: int = 0  # Highest input size the governor may pick (0 = imgsz)
+
+
+def detector_options(config: PipelineConfig) -> dict:
+    """FruitDetector keyword arguments selecting the model and inference engine."""
+    return {
+        'model_name': config.model_name,
+        'engine': config.engine,
+        'imgsz': config.imgsz,
+        'cache_dir': config.model_cache_dir,
+        'precision': config.precision,
+        'tile_size': config.tile_size,
+        'tile_overlap': config.tile_overlap,
+        'warmup': config.warmup
+    }
@@ -0,0 +1,82 @@
+"""Scene-change gating: skip detection when a frame matches the last analysed one."""
+
+
+import cv2
+import numpy as np
+
+# Default thresholds per method (tuned for static shelf cameras)
+DEFAULT_THRESHOLDS = {
+    "absdiff": 0.5,  # Percent of thumbnail pixels that changed (0-100)
+    "phash": 4.0,  # Hamming distance between 64-bit perceptual hashes (0-64)
+}
+# Grey-level change below which a thumbnail pixel counts as noise (absdiff)
+PIXEL_DELTA = 25
+
+
+# Gate Pattern: cheap check in front of an expensive stage
+# Why: Shelves are static most of the time; comparing a 64x36 thumbnail costs
+# microseconds while a YOLO forward pass costs tens of milliseconds.
+class SceneChangeGate:
+    """
+    Decide whether a frame differs enough from the last analysed frame.
+
+    The reference is only updated when a frame is analysed, so slow drift
+    accumulates until it crosses the threshold instead of being missed.
+    """
+
+    def __init__(
+        self,
+        method: str = "absdiff",  # "absdiff" (pixel difference) or "phash" (perceptual hash)
+        threshold: float | None = None,  # None = method default
+        thumbnail_size: tuple[int, int] = (64, 36)  # (width, height) for absdiff
+    ):
+        if method not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown gate method '{method}', use {list(DEFAULT_THRESHOLDS)}")
+
+        self.method = method
+        self.threshold = threshold if threshold is not None else DEFAULT_THRESHOLDS[method]
+        self.thumbnail_size = thumbnail_size
+        self._reference: np.ndarray | None = None  # Signature of last analysed frame
+
+    def score(self, frame: np.ndarray) -> float:
+        """Change score vs the last analysed frame (inf when there is no reference)."""
+        return self._compare(self._signature(frame))
+
+    def should_analyse(self, frame: np.ndarray) -> bool:
+        """True if the frame changed; the frame then becomes the new reference."""
+        signature = self._signature(frame)
+        if self._compare(signature) <= self.threshold:
+            return False
+        self._reference = signature
+        return True
+
+    def reset(self):
+        """Forget the reference (next frame is always analysed)."""
+        self._reference = None
+
+    def _signature(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale first, then convert to grey (cheaper than the other way round)."""
+        size = self.thumbnail_size if self.method == "absdiff" else (32, 32)
+        # INTER_AREA: averages source pixels, suppresses sensor noise and compression artefacts
+        thumbnail = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if thumbnail.ndim == 3:
+            thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+        if self.method == "absdiff":
+            return thumbnail
+        return _perceptual_hash(thumbnail)
+
+    def _compare(self, signature: np.ndarray) -> float:
+        if self._reference is None:
+            return float("inf")
+        if self.method == "absdiff":
+            # Percent of changed pixels: a single missing fruit still counts, noise does not
+            changed = cv2.absdiff(signature, self._reference) > PIXEL_DELTA
+            return 100.0 * float(np.count_nonzero(changed)) / changed.size
+        return float(np.count_nonzero(signature != self._reference))  # Hamming distance
+
+
+def _perceptual_hash(gray32: np.ndarray) -> np.ndarray:
+    """64-bit pHash: low-frequency 8x8 DCT block compared against its median."""
+    dct = cv2.dct(gray32.astype(np.float32))
+    low = dct[:8, :8].flatten()
+    return low > np.median(low[1:])  # Skip DC term (overall brightness)
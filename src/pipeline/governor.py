@@ -0,0 +1,96 @@
+"""Resolution governor: pick the detector input size that fits a per-camera latency budget."""
+
+import logging
+import statistics
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+STRIDE = 32  # YOLO input sizes must be multiples of the largest feature stride
+UPSCALE_MARGIN = 0.8  # Step up only if the estimate at the next size stays under 80% of target
+
+
+# Feedback Controller Pattern: measure, compare to a set point, adjust one knob
+# Why: CPU time per frame grows with imgsz^2; dropping 640 -> 448 roughly halves it,
+# so a node can absorb a burst of cameras at lower resolution instead of queuing.
+class ResolutionGovernor:
+    """
+    Rolling detector latency vs a budget, mapped to an input size in [min, max].
+
+    The budget is per camera: with N cameras sharing one detector, each frame
+    may take budget / N. Over it, the governor drops to the largest size whose
+    estimated latency fits (cost ~ imgsz^2); with headroom it steps up one size.
+    After each change it waits for a full window of new measurements.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float,
+        min_imgsz: int = 320,
+        max_imgsz: int = 640,
+        step: int = 64,
+        window: int = 10,
+        start: int | None = None
+    ):
+        """
+        Args:
+            budget_ms: Detector time each camera may spend per analysed frame
+            min_imgsz, max_imgsz: Input size bounds (multiples of 32)
+            step: Size increment between levels (multiple of 32)
+            window: Detector calls per decision (median latency of the window)
+            start: Initial size (default: max_imgsz, snapped to a level)
+        """
+        if budget_ms <= 0:
+            raise ValueError(f"Latency budget must be > 0 ms, got {budget_ms}")
+        if any(v % STRIDE for v in (min_imgsz, max_imgsz, step)) or not 0 < min_imgsz <= max_imgsz:
+            raise ValueError(
+                f"Input sizes must be multiples of {STRIDE} with min <= max, "
+                f"got min={min_imgsz} max={max_imgsz} step={step}"
+            )
+        self.budget_ms = budget_ms
+        self.window = window
+        # dict.fromkeys: ordered de-duplication (max is always a level)
+        self.sizes = list(dict.fromkeys([*range(min_imgsz, max_imgsz, step), max_imgsz]))
+        start = max_imgsz if start is None else start
+        self.imgsz = max((s for s in self.sizes if s <= start), default=self.sizes[0])
+        self.changes = 0
+        self._samples: deque = deque(maxlen=window)  # ms per frame of recent calls
+
+    def observe(self, elapsed_ms: float, frames: int = 1, cameras: int = 1) -> int | None:
+        """
+        Record one detector call; return the new input size when it changes.
+
+        Args:
+            elapsed_ms: Duration of the call
+            frames: Frames analysed by the call (batched frames share its time)
+            cameras: Cameras currently sharing the detector
+        """
+        self._samples.append(elapsed_ms / max(frames, 1))
+        if len(self._samples) < self.window:
+            return None
+
+        latency = statistics.median(self._samples)  # Median: one GC pause is not "load"
+        target = self.budget_ms / max(cameras, 1)
+        level = self.sizes.index(self.imgsz)
+        if latency > target and level > 0:
+            # Largest smaller size whose estimate fits, else the minimum
+            fits = [s for s in self.sizes[:level] if self._estimate(latency, s) <= target]
+            new = fits[-1] if fits else self.sizes[0]
+        elif (level + 1 < len(self.sizes)
+              and self._estimate(latency, self.sizes[level + 1]) <= target * UPSCALE_MARGIN):
+            new = self.sizes[level + 1]
+        else:
+            return None
+
+        logger.info(
+            f"Detector input size {self.imgsz} -> {new} "
+            f"(median {latency:.1f} ms/frame, target {target:.1f} ms for {cameras} camera(s))"
+        )
+        self.imgsz = new
+        self.changes += 1
+        self._samples.clear()  # Judge the new size on its own measurements
+        return new
+
+    def _estimate(self, latency_ms: float, imgsz: int) -> float:
+        """Latency expected at `imgsz`, from the current one (cost ~ pixel count)."""
+        return latency_ms * (imgsz / self.imgsz) ** 2
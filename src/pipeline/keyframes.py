@@ -0,0 +1,54 @@
+"""Keyframe cadence: detect every K frames (or on a scene change), propagate boxes in between."""
+
+from dataclasses import replace
+
+import numpy as np
+
+from .camera_state import CameraState
+from .latency import LatencyTracker
+from .results import FrameResults, assess
+
+
+class KeyframeSchedule:
+    """
+    Decides keyframe vs propagated for the frames of one batch.
+
+    A camera may appear several times in a batch; frames since its last
+    keyframe are counted here until the batch's keyframes have been detected.
+    """
+
+    def __init__(self):
+        self._ages: dict[str | None, int] = {}  # Camera -> frames since keyframe, this batch
+
+    def propagate(
+        self,
+        camera_id: str | None,
+        state: CameraState,
+        frame: np.ndarray,
+        has_results: bool
+    ) -> bool:
+        """True if the frame can be propagated; False = keyframe, run the detector."""
+        changed = state.gate is not None and state.scene_changed(frame)
+        age = self._ages.get(camera_id, state.propagator.age)
+        if has_results and age + 1 < state.keyframe_interval and not changed:
+            self._ages[camera_id] = age + 1
+            return True
+        self._ages[camera_id] = 0
+        return False
+
+
+def propagate_results(
+    state: CameraState,
+    frame: np.ndarray,
+    stats: dict,
+    latency: LatencyTracker
+) -> FrameResults:
+    """Results for a non-keyframe: the camera's last boxes moved with optical flow."""
+    with latency.measure('propagate'):
+        detections = state.propagator.propagate(frame)
+    stats['frames_propagated'] = stats.get('frames_propagated', 0) + 1
+    if state.tracker is not None:  # Tracks follow the moved boxes, re-scored on change only
+        with latency.measure('quality'):
+            return assess(detections, frame, state.tracker, stats)
+    # Same fruit as the keyframe: keep its quality scores
+    return replace(state.last_results.reused(), detections=detections)
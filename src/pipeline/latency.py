@@ -0,0 +1,59 @@
+"""Per-stage latency tracking with percentile summaries."""
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
+
+# Pipeline stages in report order ("end_to_end" = capture timestamp -> published)
+STAGES = ("queue_wait", "detect", "quality", "publish", "end_to_end")
+
+
+# Why: Averages hide the tail; a p99 of 400 ms on a shelf camera means stale
+# alerts even when the mean looks fine, so every stage keeps its own samples.
+class LatencyTracker:
+    """
+    Record durations per stage and summarise them as p50/p95/p99.
+
+    Only the most recent `window` samples per stage are kept (bounded memory
+    on endless camera streams).
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+
+    def record(self, stage: str, seconds: float):
+        """Add one duration (seconds) for a stage."""
+        if stage not in self._samples:
+            # deque(maxlen=N): appending beyond N silently discards the oldest sample
+            self._samples[stage] = deque(maxlen=self.window)
+        self._samples[stage].append(seconds)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Time the body of a 'with' block: with tracker.measure("detect"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """{stage: {'p50', 'p95', 'p99', 'count'}} with percentiles in milliseconds."""
+        report = {}
+        ordered = sorted(
+            self._samples, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)
+        )
+        for stage in ordered:
+            samples_ms = np.asarray(self._samples[stage]) * 1000
+            p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+            report[stage] = {
+                'p50': round(float(p50), 2),
+                'p95': round(float(p95), 2),
+                'p99': round(float(p99), 2),
+                'count': len(samples_ms)
+            }
+        return report
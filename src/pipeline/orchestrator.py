@@ -1,28 +1,24 @@
 """End-to-end pipeline orchestration for fruit quality detection."""
 
-import cv2
 import asyncio
-from typing import Optional
-from dataclasses import dataclass
 
-from ..vision.capture import stream_frames
-from ..vision.detect import FruitDetector, draw_detections
-from ..quality.score import assess_freshness
-from ..events.publisher import EventPublisher, create_quality_event
-from ..search.indexer import SearchRepository, create_fruit_document
-from .decorators import timer, log_execution
+import cv2
 
+from ..events.publisher import EventPublisher
+from ..search.indexer import SearchRepository
+from ..vision.detect import FruitDetector, draw_detections
+from ..vision.frame_pool import FramePool
+from .analysis import analyse_batch
+from .camera_state import CameraState
+from .config import PipelineConfig, detector_options
+from .decorators import log_execution, timer
+from .governor import ResolutionGovernor
+from .latency import LatencyTracker
+from .output import open_writer, publish_detection, publish_results
+from .sources import iter_batches
+from .writer import AsyncVideoWriter
 
-@dataclass
-class PipelineConfig:
-    """Configuration for processing pipeline."""
-    source: str
-    output_path: Optional[str] = None
-    max_frames: int = 0
-    detector_conf: float = 0.3
-    enable_events: bool = False
-    enable_search: bool = False
-    display: bool = True
+__all__ = ["PipelineConfig", "detector_options", "process_shelf_video", "publish_detection"]
 
 
 @timer
@@ -46,69 +42,131 @@ def process_shelf_video(config: PipelineConfig) -> dict:
         Processing statistics
     """
     # Initialize components
-    detector = FruitDetector(conf_threshold=config.detector_conf)
+    detector = FruitDetector(conf_threshold=config.detector_conf, **detector_options(config))
+    governor = _start_governor(config, detector) if config.latency_budget_ms > 0 else None
     event_publisher = EventPublisher() if config.enable_events else None
     search_repo = SearchRepository() if config.enable_search else None
+    pool = FramePool(config.frame_pool_size) if config.frame_pool_size > 0 else None
+    latency = LatencyTracker()
+    
+    # Per camera: output writer and analysis state (ROI, gate, tracker, last results, ...)
+    writers: dict[str | None, AsyncVideoWriter] = {}
+    cameras: dict[str | None, CameraState] = {}
     
     stats = {
         'frames_processed': 0,
+        'frames_dropped': 0,
+        'reconnects': 0,
         'detections': 0,
         'events_published': 0,
-        'documents_indexed': 0
+        'documents_indexed': 0,
+        'inference_skipped': 0,
+        'quality_assessed': 0
     }
     
     try:
-        for success, frame in stream_frames(config.source, config.max_frames):
-            if not success:
-                break
+        for batch in iter_batches(config, stats, pool):
+            for _, captured in batch:
+                latency.record('queue_wait', captured.age())  # Decode -> picked up by this loop
+            for camera_id, _ in batch:
+                if camera_id not in cameras:
+                    cameras[camera_id] = CameraState.from_config(config, camera_id)
             
-            # Detect fruits in frame
-            detections = detector.detect(frame)
-            stats['detections'] += len(detections)
+            # Detect (one forward pass per batch), propagate or reuse unchanged scenes
+            results = analyse_batch(batch, detector, cameras, stats, latency, governor)
             
-            # Process each detection
-            for det in detections:
-                # Assess quality
-                quality = assess_freshness(frame, det.bbox, det.label)
+            quit_requested = False
+            for (camera_id, captured), result in zip(batch, results):
+                frame = captured.image
+                detections = result.detections
+                if quit_requested:  # Stop requested earlier in this batch: just recycle
+                    if pool:
+                        pool.release(frame)
+                    continue
+                stats['detections'] += len(detections)
                 
-                # Publish event asynchronously
-                if event_publisher:
-                    event = create_quality_event(
-                        fruit_type=det.label,
-                        freshness_level=quality.freshness_level.value,
-                        quality_score=quality.score,
-                        confidence=det.confidence
+                with latency.measure('publish'):
+                    publish_results(
+                        result, camera_id, captured, event_publisher, search_repo, stats
                     )
-                    asyncio.run(event_publisher.publish(event))
-                    stats['events_published'] += 1
+                latency.record('end_to_end', captured.age())  # Glass-to-event for this frame
                 
-                # Index in AI Search
-                if search_repo:
-                    document = create_fruit_document(
-                        fruit_type=det.label,
-                        freshness_level=quality.freshness_level.value,
-                        quality_score=quality.score,
-                        confidence=det.confidence
-                    )
-                    search_repo.index_document(document)
-                    stats['documents_indexed'] += 1
-            
-            # Annotate frame
-            annotated = draw_detections(frame, detections)
-            
-            # Display or save
-            if config.display:
-                cv2.imshow('Fruit Quality Detection', annotated)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            
-            # TODO: Add video writer if output_path specified
-            
-            stats['frames_processed'] += 1
+                # Annotate frame (into a recycled buffer when pooling)
+                out = pool.acquire(frame.shape) if pool else None
+                annotated = draw_detections(frame, detections, out=out)
+                
+                # Display or save
+                if config.display:
+                    window = 'Fruit Quality Detection' + (f' - {camera_id}' if camera_id else '')
+                    cv2.imshow(window, annotated)
+                    quit_requested = cv2.waitKey(1) & 0xFF == ord('q')
+                
+                # Save: encoded on a background thread, never stalls detection
+                if config.output_path:
+                    if camera_id not in writers:
+                        writers[camera_id] = open_writer(config, camera_id, annotated, pool)
+                    writers[camera_id].write(annotated)
+                
+                stats['frames_processed'] += 1
+                if camera_id:
+                    per_camera = stats.setdefault('frames_per_camera', {})
+                    per_camera[camera_id] = per_camera.get(camera_id, 0) + 1
+                
+                # Every stage is done with this frame: recycle both buffers
+                if pool:
+                    pool.release(annotated)
+                    pool.release(frame)
+            if quit_requested:
+                break
     
     finally:
+        for writer in writers.values():
+            writer.close()  # Flush queued frames and finalize the file
+            stats['frames_written'] = stats.get('frames_written', 0) + writer.written
+            stats['frames_write_dropped'] = stats.get('frames_write_dropped', 0) + writer.dropped
+        if pool:
+            stats['frame_buffers_allocated'] = pool.allocated
+        stats['latency_ms'] = latency.summary()
+        _summarise_analysis(stats, cameras, governor)
         cv2.destroyAllWindows()
         if event_publisher:
             asyncio.run(event_publisher.close())
     
     return stats
+
+
+def _summarise_analysis(
+    stats: dict,
+    cameras: dict[str | None, CameraState],
+    governor: ResolutionGovernor | None
+):
+    """Add batching, tracking, governor and duty-cycle figures to the run stats."""
+    trackers = [state.tracker for state in cameras.values() if state.tracker is not None]
+    if trackers:
+        stats['tracks_created'] = sum(tracker.created for tracker in trackers)
+    if stats.get('batches'):
+        stats['mean_batch_size'] = round(stats['frames_batched'] / stats['batches'], 2)
+    if governor is not None:
+        stats['imgsz'] = governor.imgsz
+        stats['imgsz_changes'] = governor.changes
+    if stats['frames_processed']:
+        # Share of frames that ran the detector (1.0 = every frame)
+        stats['detector_duty_cycle'] = round(
+            stats.get('frames_batched', 0) / stats['frames_processed'], 3
+        )
+
+
+def _start_governor(config: PipelineConfig, detector: FruitDetector) -> ResolutionGovernor:
+    """Resolution governor for the configured budget, with the detector at its start size."""
+    if config.engine == "onnx" and config.precision == "int8":
+        # calibrate quantizes the DETECTOR_IMGSZ export only: no other size to switch to
+        raise ValueError("latency_budget_ms needs fp32: INT8 models exist for one input size")
+    governor = ResolutionGovernor(
+        config.latency_budget_ms, config.imgsz_min, config.imgsz_max or config.imgsz,
+        start=config.imgsz
+    )
+    if config.engine == "onnx":  # Static input shapes: export/load every size now, not mid-stream
+        for size in governor.sizes:
+            detector.set_imgsz(size)
+    detector.set_imgsz(governor.imgsz)
+    return governor
@@ -0,0 +1,119 @@
+"""Pipeline outputs: Event Hub / AI Search publishing and per-camera video writers."""
+
+import asyncio
+from pathlib import Path
+
+import numpy as np
+
+from ..events.publisher import EventPublisher, create_quality_event
+from ..quality.score import QualityScore
+from ..search.indexer import SearchRepository, create_fruit_document
+from ..vision.capture import get_video_props
+from ..vision.detect import Detection
+from ..vision.frame_pool import FramePool
+from ..vision.frames import CapturedFrame
+from .config import PipelineConfig
+from .results import FrameResults
+from .writer import AsyncVideoWriter
+
+
+def publish_detection(
+    det: Detection,
+    quality: QualityScore,
+    camera_id: str | None,
+    event_publisher: EventPublisher | None,
+    search_repo: SearchRepository | None,
+    stats: dict,
+    captured: CapturedFrame | None = None,  # Source frame: adds capture time and trace id
+    track_id: int | None = None  # Tracker id of this fruit (tracking on)
+):
+    """Publish one assessed detection to Event Hub and AI Search (when enabled)."""
+    # Same trace fields on the event and the document, so both can be joined per frame
+    trace = {}
+    if captured is not None:
+        trace = {
+            'capture_timestamp': captured.captured_wall.isoformat(),
+            'frame_id': captured.frame_id,
+            'trace_id': captured.trace_id
+        }
+    if track_id is not None:
+        trace['track_id'] = track_id
+    
+    # Publish event asynchronously
+    if event_publisher:
+        event = create_quality_event(
+            fruit_type=det.label,
+            freshness_level=quality.freshness_level.value,
+            quality_score=quality.score,
+            confidence=det.confidence,
+            camera_id=camera_id,
+            **trace  # **dict: unpack keys as keyword arguments
+        )
+        asyncio.run(event_publisher.publish(event))
+        stats['events_published'] += 1
+    
+    # Index in AI Search
+    if search_repo:
+        document = create_fruit_document(
+            fruit_type=det.label,
+            freshness_level=quality.freshness_level.value,
+            quality_score=quality.score,
+            confidence=det.confidence,
+            camera_id=camera_id,
+            **trace
+        )
+        search_repo.index_document(document)
+        stats['documents_indexed'] += 1
+
+
+def publish_results(
+    result: FrameResults,
+    camera_id: str | None,
+    captured: CapturedFrame,
+    event_publisher: EventPublisher | None,
+    search_repo: SearchRepository | None,
+    stats: dict
+):
+    """Publish a frame's detections; tracked fruit only when new or changed."""
+    for k, (det, quality) in enumerate(zip(result.detections, result.qualities)):
+        if result.publish is not None and not result.publish[k]:
+            continue  # Tracked fruit already published, unchanged since
+        track_id = result.track_ids[k] if result.track_ids else None
+        publish_detection(
+            det, quality, camera_id, event_publisher, search_repo, stats, captured, track_id
+        )
+
+
+def open_writer(
+    config: PipelineConfig,
+    camera_id: str | None,
+    first_frame: np.ndarray,
+    pool: FramePool | None
+) -> AsyncVideoWriter:
+    """Start the background writer for one camera (one output file per camera)."""
+    output_path = Path(config.output_path)
+    if camera_id:
+        output_path = output_path.with_stem(f"{output_path.stem}_{camera_id}")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    fleet_fps = {spec.camera_id: spec.fps for spec in config.fleet}
+    if camera_id in fleet_fps:
+        fps = fleet_fps[camera_id]  # Simulated camera: no source file to probe
+    else:
+        source = config.sources.get(camera_id, config.source) if camera_id else config.source
+        fps = get_video_props(source)['fps']  # Cached probe: source is already open
+    if config.target_fps:
+        fps = min(fps, config.target_fps)
+    else:
+        fps = fps / config.frame_stride
+    
+    height, width = first_frame.shape[:2]
+    return AsyncVideoWriter(
+        str(output_path),
+        fps,
+        (width, height),
+        codec=config.output_codec,
+        queue_size=config.writer_queue_size,
+        policy=config.writer_policy,
+        pool=pool
+    )
@@ -0,0 +1,214 @@
+"""Segment-parallel offline processing: one video file, many worker processes."""
+
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor  # Pool of worker processes (bypasses the GIL)
+from dataclasses import dataclass, field, replace
+
+from ..events.publisher import EventPublisher
+from ..quality.score import QualityScore, assess_freshness
+from ..search.indexer import SearchRepository
+from ..vision.capture import capture_frames, get_video_props
+from ..vision.detect import MODEL_OPTIONS, Detection, FruitDetector, load_model
+from ..vision.frame_cache import FrameCache
+from ..vision.frames import CapturedFrame
+from ..vision.roi import ShelfROI, roi_for_camera
+from .config import PipelineConfig, detector_options
+from .decorators import log_execution, timer
+from .gating import SceneChangeGate
+from .output import publish_detection
+
+# Per-process state, created once by _init_worker (module global = one per worker)
+_detector: FruitDetector | None = None
+_roi: ShelfROI | None = None
+_capture_options: dict = {}  # resize / prefetch / cache_dir, as in the single-process path
+_gate_options: tuple[str, float | None] | None = None  # (method, threshold), None = off
+
+
+@dataclass
+class FrameResult:
+    """Detections and quality scores for one frame (picklable, sent back to the parent)."""
+    frame_index: int
+    detections: list[Detection] = field(default_factory=list)
+    qualities: list[QualityScore] = field(default_factory=list)
+    captured: CapturedFrame | None = None  # Capture metadata only (pixels stay in the worker)
+    reused: bool = False  # Unchanged scene: results of the previous analysed frame
+
+
+def split_frame_ranges(total_frames: int, segments: int, stride: int = 1) -> list[tuple[int, int]]:
+    """
+    Split [0, total_frames) into contiguous (start, end) ranges.
+
+    Boundaries are multiples of `stride` so every segment keeps the global
+    every-Nth-frame cadence.
+    """
+    steps = -(-total_frames // stride)  # -(-a // b): ceiling division
+    segments = max(1, min(segments, steps))
+    bounds = [round(i * steps / segments) * stride for i in range(segments + 1)]
+    return [
+        (bounds[i], min(bounds[i + 1], total_frames))
+        for i in range(segments)
+        if bounds[i] < bounds[i + 1]
+    ]
+
+
+def iter_segment_results(
+    source: str,
+    ranges: list[tuple[int, int]],
+    workers: int,
+    detector_conf: float = 0.3,
+    stride: int = 1,
+    roi_polygon: list[list[int]] | None = None,
+    detector_kwargs: dict | None = None,
+    capture_options: dict | None = None,
+    gate_options: tuple[str, float | None] | None = None
+) -> Iterator[FrameResult]:
+    """
+    Process frame ranges in worker processes and yield results in frame order.
+
+    Args:
+        capture_options: capture_frames() keywords for every segment (resize, prefetch, cache_dir)
+        gate_options: (method, threshold) of a scene-change gate per segment (None = off)
+    """
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Load the weights before forking: workers share the parent's pages copy-on-write
+        # and find the model in the inherited registry (each still warms up its own)
+        options = {k: v for k, v in (detector_kwargs or {}).items() if k in MODEL_OPTIONS}
+        load_model(**{**options, 'threads': threads}, warmup=0)
+        context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,  # None = platform default (spawn: each worker loads its own)
+        initializer=_init_worker,
+        initargs=(
+            detector_conf, threads, roi_polygon, detector_kwargs, capture_options, gate_options
+        )
+    ) as executor:
+        # executor.map returns results in submission order -> global frame order
+        segments = executor.map(
+            _process_segment,
+            [source] * len(ranges), [start for start, _ in ranges],
+            [end for _, end in ranges], [stride] * len(ranges)
+        )
+        for segment in segments:
+            yield from segment
+
+
+@timer
+@log_execution
+def process_video_segments(config: PipelineConfig) -> dict:
+    """
+    Offline pipeline for video files, parallel across `config.workers` processes.
+
+    Detection and quality scoring run in the workers; events and documents are
+    published by this process in frame order. No display or video output.
+    """
+    props = get_video_props(config.source)
+    total_frames = props['frame_count']
+    source_fps = props['fps']
+    if total_frames <= 0:
+        raise ValueError(f"Cannot split {config.source}: frame count unknown (live stream?)")
+
+    stride = config.frame_stride
+    if config.target_fps:
+        stride = max(1, round(source_fps / config.target_fps))
+    if config.max_frames > 0:
+        total_frames = min(total_frames, config.max_frames * stride)
+
+    capture_options = {'resize': config.resize, 'prefetch': config.prefetch_depth}
+    if config.frame_cache_dir:
+        # Decode once here: workers starting on a cold cache would each build it
+        FrameCache(config.frame_cache_dir, config.resize).open(config.source)
+        capture_options['cache_dir'] = config.frame_cache_dir
+    gate_options = (config.scene_gate, config.scene_threshold) if config.scene_gate else None
+
+    event_publisher = EventPublisher() if config.enable_events else None
+    search_repo = SearchRepository() if config.enable_search else None
+    ranges = split_frame_ranges(total_frames, config.workers, stride)
+    stats = {
+        'frames_processed': 0,
+        'frames_dropped': 0,
+        'detections': 0,
+        'events_published': 0,
+        'documents_indexed': 0,
+        'inference_skipped': 0,
+        'segments': len(ranges)
+    }
+
+    roi = roi_for_camera(config.rois, None)
+    results = iter_segment_results(
+        config.source, ranges, config.workers, config.detector_conf, stride,
+        roi.polygon.tolist() if roi else None, detector_options(config),
+        capture_options, gate_options
+    )
+    try:
+        for result in results:
+            stats['frames_processed'] += 1
+            stats['inference_skipped'] += result.reused
+            stats['detections'] += len(result.detections)
+            for det, quality in zip(result.detections, result.qualities):
+                publish_detection(
+                    det, quality, None, event_publisher, search_repo, stats, result.captured
+                )
+    finally:
+        if event_publisher:
+            asyncio.run(event_publisher.close())
+
+    return stats
+
+
+def _init_worker(
+    detector_conf: float,
+    threads: int,
+    roi_polygon: list | None = None,
+    detector_kwargs: dict | None = None,
+    capture_options: dict | None = None,
+    gate_options: tuple[str, float | None] | None = None
+):
+    """Worker initializer: split CPU threads and load one detector per process."""
+    # global: assign the module-level variables, not locals
+    global _detector, _roi, _capture_options, _gate_options
+    try:
+        import torch
+        torch.set_num_threads(threads)  # Avoid N workers x all-core thread pools
+    except ImportError:
+        pass
+    _detector = FruitDetector(
+        conf_threshold=detector_conf, threads=threads, **(detector_kwargs or {})
+    )
+    _roi = ShelfROI(roi_polygon) if roi_polygon else None
+    _capture_options = capture_options or {}
+    _gate_options = gate_options
+
+
+def _process_segment(source: str, start: int, end: int, stride: int) -> list[FrameResult]:
+    """
+    Worker task: detect and score every `stride`-th frame in [start, end).
+
+    With a gate, unchanged frames reuse the previous frame's results; each
+    segment starts with a fresh gate, so its first frame is always analysed.
+    """
+    gate = SceneChangeGate(*_gate_options) if _gate_options else None
+    results: list[FrameResult] = []
+    max_frames = -(-(end - start) // stride)
+    frames = capture_frames(
+        source, max_frames, frame_stride=stride, start_frame=start, **_capture_options
+    )
+    for i, captured in enumerate(frames):
+        frame = captured.image
+        metadata = replace(captured, image=None)  # Sent to the parent for event tracing
+        changed = gate is None or gate.should_analyse(_roi.crop(frame) if _roi else frame)
+        if not changed and results:
+            previous = results[-1]
+            results.append(FrameResult(
+                start + i * stride, previous.detections, previous.qualities, metadata, True
+            ))
+            continue
+        detections = _roi.detect(_detector, frame) if _roi else _detector.detect(frame)
+        qualities = [assess_freshness(frame, det.bbox, det.label) for det in detections]
+        results.append(FrameResult(start + i * stride, detections, qualities, metadata))
+    return results
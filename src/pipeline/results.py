@@ -0,0 +1,49 @@
+"""Per-frame analysis results and quality assessment (optionally once per track)."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..quality.score import QualityScore, assess_freshness
+from ..vision.detect import Detection
+from ..vision.tracker import Tracker
+
+
+@dataclass
+class FrameResults:
+    """Analysis of one frame: detections with their quality and tracking state."""
+    detections: Sequence[Detection]
+    qualities: list[QualityScore]
+    track_ids: list[int] | None = None  # None = tracking off
+    publish: list[bool] | None = None  # Per detection: new or changed track (None = all)
+
+    def reused(self) -> "FrameResults":
+        """Same results for an unchanged frame; tracked fruit is not published again."""
+        publish = None if self.track_ids is None else [False] * len(self.detections)
+        return FrameResults(self.detections, self.qualities, self.track_ids, publish)
+
+
+def assess(
+    detections: Sequence[Detection],
+    frame: np.ndarray,
+    tracker: Tracker | None,
+    stats: dict
+) -> FrameResults:
+    """Quality per detection; with a tracker, only new or changed tracks are re-scored."""
+    if tracker is None:
+        stats['quality_assessed'] += len(detections)
+        qualities = [assess_freshness(frame, det.bbox, det.label) for det in detections]
+        return FrameResults(detections, qualities)
+
+    tracks = tracker.update(detections, frame)
+    for det, track in zip(detections, tracks):
+        if track.refresh:  # New fruit, or its colour changed (e.g. browning)
+            track.payload = assess_freshness(frame, det.bbox, det.label)
+            stats['quality_assessed'] += 1
+    return FrameResults(
+        detections,
+        [track.payload for track in tracks],  # Unchanged tracks keep their last score
+        [track.track_id for track in tracks],
+        [track.refresh for track in tracks]
+    )
@@ -0,0 +1,83 @@
+"""Frame sources for the pipeline: one file/camera, a camera set or a simulated fleet."""
+
+from collections.abc import Iterator
+
+from ..utils.fleet import CameraFleet
+from ..vision.capture import capture_frames
+from ..vision.frame_pool import FramePool
+from ..vision.frames import CapturedFrame
+from ..vision.multi_source import MultiSourceCapture
+from .batching import MicroBatcher
+from .config import PipelineConfig
+
+
+def iter_batches(
+    config: PipelineConfig,
+    stats: dict,
+    pool: FramePool | None
+) -> Iterator[list[tuple[str | None, CapturedFrame]]]:
+    """Group frames from all cameras into micro-batches (single-frame lists when off)."""
+    frames = iter_frames(config, stats, pool)
+    if config.batch_size <= 1:
+        for item in frames:
+            yield [item]
+        return
+    on_drop = (lambda item: pool.release(item[1].image)) if pool else None
+    batcher = MicroBatcher(
+        frames, config.batch_size, config.batch_timeout_ms / 1000, config.live, on_drop
+    )
+    try:
+        yield from batcher
+    finally:
+        # Live frames replaced while waiting for a batch count as dropped, like capture drops
+        stats['frames_dropped'] = stats.get('frames_dropped', 0) + batcher.dropped
+
+
+def iter_frames(
+    config: PipelineConfig,
+    stats: dict,
+    pool: FramePool | None
+) -> Iterator[tuple[str | None, CapturedFrame]]:
+    """
+    Yield (camera_id, captured_frame) from the configured source(s).
+    
+    camera_id is None for the single-source pipeline.
+    """
+    if not config.sources and not config.fleet:
+        for captured in capture_frames(
+            config.source,
+            config.max_frames,
+            prefetch=config.prefetch_depth,
+            live=config.live,
+            stats=stats,
+            pool=pool,
+            frame_stride=config.frame_stride,
+            target_fps=config.target_fps,
+            max_reconnects=config.max_reconnects,
+            resize=config.resize,
+            cache_dir=config.frame_cache_dir
+        ):
+            yield None, captured
+        return
+    
+    # Multi-camera: one reader thread per camera feeding a single detector
+    if config.fleet:
+        capture = CameraFleet(config.fleet, config.max_frames, pool=pool)
+    else:
+        capture = MultiSourceCapture(
+            config.sources,
+            config.max_frames,
+            live=config.live,
+            pool=pool,
+            frame_stride=config.frame_stride,
+            target_fps=config.target_fps,
+            max_reconnects=config.max_reconnects,
+            resize=config.resize
+        )
+    try:
+        for camera_id, captured in capture.iter_captured():
+            stats['frames_dropped'] = capture.frames_dropped
+            stats['reconnects'] = capture.reconnects
+            yield camera_id, captured
+    finally:
+        capture.close()
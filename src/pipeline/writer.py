@@ -0,0 +1,104 @@
+"""Asynchronous video writer stage: encode annotated frames off the detection loop."""
+
+import logging
+import queue
+import threading
+from typing import Self  # Self: the class being defined (subclasses get their own type)
+
+import numpy as np
+
+from ..vision.capture import video_writer
+from ..vision.frame_pool import FramePool
+
+logger = logging.getLogger(__name__)
+
+# Sentinel object: tells the encoder thread to flush and exit
+_END_OF_STREAM = object()
+
+WRITER_POLICIES = ("drop", "block")
+
+
+# Producer-Consumer Pattern: detection loop enqueues, encoder thread writes
+# Why: cv2.VideoWriter.write() encodes synchronously (often 5-20 ms per HD frame);
+# on its own thread it overlaps with inference instead of adding to it.
+class AsyncVideoWriter:
+    """
+    Encode frames on a background thread fed by a bounded queue.
+
+    policy="drop":  write() never blocks; frames are dropped when the queue is full
+    policy="block": write() waits for the encoder (complete output, may slow the loop)
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: float,
+        frame_size: tuple[int, int],  # (width, height)
+        codec: str = "XVID",  # FourCC code, e.g. "XVID", "MJPG", "mp4v"
+        queue_size: int = 32,
+        policy: str = "drop",
+        pool: FramePool | None = None  # Retain pooled frames until encoded
+    ):
+        if policy not in WRITER_POLICIES:
+            raise ValueError(f"Unknown writer policy '{policy}', use one of {WRITER_POLICIES}")
+
+        self.output_path = output_path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.codec = codec
+        self.policy = policy
+        self.pool = pool
+        self.written = 0  # Frames encoded
+        self.dropped = 0  # Frames discarded because the encoder fell behind
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._encode_loop, name="video-writer", daemon=True)
+        self._thread.start()
+
+    # __enter__/__exit__: Context manager protocol ('with AsyncVideoWriter(...) as w:')
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, frame: np.ndarray) -> bool:
+        """Queue a frame for encoding. Returns False if it was dropped."""
+        if self.pool:
+            self.pool.retain(frame)  # Keep the buffer alive until the encoder is done
+
+        if self.policy == "block":
+            self._queue.put(frame)
+            return True
+
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.pool:
+                self.pool.release(frame)
+            return False
+
+    def close(self, timeout: float | None = None):
+        """Flush queued frames, finalize the file and stop the encoder thread."""
+        if self._thread.is_alive():
+            self._queue.put(_END_OF_STREAM)  # Always blocking: the end marker must not drop
+            self._thread.join(timeout)
+
+    def _encode_loop(self):
+        """Encoder thread body."""
+        width, height = self.frame_size
+        with video_writer(self.output_path, self.fps, width, height, codec=self.codec) as writer:
+            if not writer.isOpened():
+                logger.error(
+                    f"Cannot open video writer for {self.output_path} (codec {self.codec})"
+                )
+            while True:
+                frame = self._queue.get()
+                if frame is _END_OF_STREAM:
+                    break
+                if writer.isOpened():
+                    writer.write(frame)
+                    self.written += 1
+                if self.pool:
+                    self.pool.release(frame)
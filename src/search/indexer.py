@@ -1,9 +1,8 @@
 """Azure AI Search repository with document indexing."""
 
-from dataclasses import dataclass, asdict
-from typing import Optional, List
-from datetime import datetime
 import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
 
 
 @dataclass
@@ -15,9 +14,13 @@ class FruitDocument:
     freshness_level: str
     quality_score: float
     confidence: float
-    location: Optional[str] = None
-    camera_id: Optional[str] = None
-    image_url: Optional[str] = None
+    location: str | None = None
+    camera_id: str | None = None
+    image_url: str | None = None
+    capture_timestamp: str | None = None  # When the frame was decoded (ISO, UTC)
+    frame_id: int | None = None  # Frame position in the source
+    trace_id: str | None = None  # Same id as the matching Event Hub event
+    track_id: int | None = None  # Same physical fruit across frames (per camera)
 
 
 class SearchRepository:
@@ -25,8 +28,8 @@ class SearchRepository:
     
     def __init__(
         self,
-        endpoint: Optional[str] = None,
-        api_key: Optional[str] = None,
+        endpoint: str | None = None,
+        api_key: str | None = None,
         index_name: str = "fruits-quality"
     ):
         """
@@ -76,9 +79,9 @@ class SearchRepository:
     def search(
         self,
         query: str,
-        filter_expr: Optional[str] = None,
+        filter_expr: str | None = None,
         top: int = 10
-    ) -> List[FruitDocument]:
+    ) -> list[FruitDocument]:
         """
         Search fruit quality documents.
         
@@ -110,7 +113,6 @@ class SearchRepository:
         # TODO: Implement index creation
         # from azure.search.documents.indexes import SearchIndexClient
         # from azure.search.documents.indexes.models import SearchIndex, SimpleField, SearchableField
-        pass
 
 
 def create_fruit_document(
@@ -118,9 +120,13 @@ def create_fruit_document(
     freshness_level: str,
     quality_score: float,
     confidence: float,
-    location: Optional[str] = None,
-    camera_id: Optional[str] = None,
-    image_url: Optional[str] = None
+    location: str | None = None,
+    camera_id: str | None = None,
+    image_url: str | None = None,
+    capture_timestamp: str | None = None,
+    frame_id: int | None = None,
+    trace_id: str | None = None,
+    track_id: int | None = None
 ) -> FruitDocument:
     """Factory function for creating fruit documents."""
     doc_id = f"{fruit_type}_{datetime.utcnow().timestamp()}"
@@ -134,5 +140,9 @@ def create_fruit_document(
         confidence=confidence,
         location=location,
         camera_id=camera_id,
-        image_url=image_url
+        image_url=image_url,
+        capture_timestamp=capture_timestamp,
+        frame_id=frame_id,
+        trace_id=trace_id,
+        track_id=track_id
     )
@@ -1,5 +1,20 @@
 """Utility functions for offline testing and development."""
 
-from .video_simulator import VideoStreamSimulator, generate_test_video
+from .fleet import CameraFleet, CameraSpec, fleet_specs
+from .pacing import FramePacer
+from .synthetic import GroundTruth, SyntheticFrame, SyntheticSource, match_ground_truth
+from .video_simulator import SyntheticStream, VideoStreamSimulator, generate_test_video
 
-__all__ = ["VideoStreamSimulator", "generate_test_video"]
+__all__ = [
+    "CameraFleet",
+    "CameraSpec",
+    "FramePacer",
+    "GroundTruth",
+    "SyntheticFrame",
+    "SyntheticSource",
+    "SyntheticStream",
+    "VideoStreamSimulator",
+    "fleet_specs",
+    "generate_test_video",
+    "match_ground_truth"
+]
@@ -0,0 +1,192 @@
+"""Simulated camera fleet: N paced streams multiplexed like MultiSourceCapture."""
+
+import itertools
+import logging
+import queue
+import random
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..vision.frame_cache import resize_frame
+from ..vision.frame_pool import FramePool
+from ..vision.frames import CapturedFrame
+from .video_simulator import SyntheticStream, VideoStreamSimulator
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC = "synthetic"  # CameraSpec.source value for generated frames
+
+
+@dataclass
+class CameraSpec:
+    """Profile of one simulated camera."""
+    camera_id: str
+    source: str = SYNTHETIC  # Video file to loop, or "synthetic"
+    fps: float = 25.0
+    resolution: tuple[int, int] | None = None  # (width, height); None = native (640x480 synthetic)
+    jitter_ms: float = 0.0  # Std deviation of per-frame delivery delay (network jitter)
+    pacing: str = "drop"  # Late frames are skipped, like a real camera
+    duration: float | None = None  # Seconds until the camera stops (None = max_frames / endless)
+
+
+def fleet_specs(
+    count: int,
+    sources: Sequence[str] = (SYNTHETIC,),
+    fps: Sequence[float] = (25.0,),
+    resolutions: Sequence[tuple[int, int] | None] = (None,),
+    jitter_ms: Sequence[float] = (0.0,),
+    duration: float | None = None
+) -> list[CameraSpec]:
+    """Build `count` camera profiles, cycling through each list (mixed fleets)."""
+    # itertools.cycle: repeat a sequence endlessly (camera i gets element i % len)
+    profiles = zip(itertools.cycle(sources), itertools.cycle(fps),
+                   itertools.cycle(resolutions), itertools.cycle(jitter_ms))
+    return [
+        CameraSpec(f"sim-{i:02d}", source, rate, size, jitter, duration=duration)
+        for i, (source, rate, size, jitter) in zip(range(count), profiles)
+    ]
+
+
+# Multiplexer Pattern (same interface as MultiSourceCapture, so the pipeline
+# consumes either). Why: load-test one node with a store's worth of cameras
+# without owning the cameras.
+class CameraFleet:
+    """
+    Run simulated cameras on one thread each and yield their frames as they arrive.
+
+    A camera never waits for the consumer: when the shared queue is full the
+    frame is dropped and counted, so drops show where the node saturates.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[CameraSpec],
+        max_frames: int = 0,  # Frames generated per camera, delivered or dropped (0 = unlimited)
+        queue_size: int = 0,  # Frames buffered across all cameras (0 = 2 per camera)
+        pool: FramePool | None = None,  # Shared buffer pool (caller releases frames)
+        seed: int | None = None  # Jitter RNG seed (reproducible load tests)
+    ):
+        if not specs:
+            raise ValueError("CameraFleet needs at least one camera")
+
+        self.specs = {spec.camera_id: spec for spec in specs}
+        self.max_frames = max_frames
+        self.pool = pool
+        self.frame_counts = {camera_id: 0 for camera_id in self.specs}
+        self.errors: dict[str, Exception] = {}
+        # frames_dropped: queue full (consumer too slow); pacer_dropped: camera thread too slow
+        self.camera_stats = {
+            camera_id: {'frames_dropped': 0, 'pacer_dropped': 0, 'achieved_fps': 0.0}
+            for camera_id in self.specs
+        }
+        # One RNG per camera (threads never share one); string seeds hash deterministically
+        self._rngs = {
+            camera_id: random.Random(None if seed is None else f"{seed}-{camera_id}")
+            for camera_id in self.specs
+        }
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or 2 * len(specs))
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run_camera, args=(spec,), name=f"sim-{spec.camera_id}",
+                             daemon=True)
+            for spec in specs
+        ]
+
+    @property
+    def frames_dropped(self) -> int:
+        """Frames lost to back-pressure or late camera threads, summed over all cameras."""
+        return sum(s['frames_dropped'] + s['pacer_dropped'] for s in self.camera_stats.values())
+
+    @property
+    def reconnects(self) -> int:
+        """Always 0: simulated cameras never disconnect (MultiSourceCapture parity)."""
+        return 0
+
+    def __iter__(self) -> Iterator[tuple[str, float, np.ndarray]]:
+        """Yield (camera_id, timestamp, frame) in arrival order."""
+        for camera_id, captured in self.iter_captured():
+            yield camera_id, captured.captured_at, captured.image
+
+    def iter_captured(self) -> Iterator[tuple[str, CapturedFrame]]:
+        """Start every camera and yield (camera_id, CapturedFrame) until all are done."""
+        for thread in self._threads:
+            thread.start()
+
+        active = len(self._threads)
+        try:
+            while active > 0:
+                camera_id, captured = self._queue.get()
+                if captured is None:  # (camera_id, None) = camera finished
+                    active -= 1
+                    continue
+                yield camera_id, captured
+        finally:
+            self.close()
+
+    def close(self, timeout: float = 2.0):
+        """Stop all camera threads."""
+        self._stop.set()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def _open(self, spec: CameraSpec):
+        """Stream object for one camera (file loop or generator)."""
+        if spec.source == SYNTHETIC:
+            width, height = spec.resolution or (640, 480)
+            phase = self._rngs[spec.camera_id].randrange(1000)
+            return SyntheticStream(width, height, spec.fps, pacing=spec.pacing, phase=phase)
+        return VideoStreamSimulator(
+            spec.source, loop=True, fps_override=spec.fps, pacing=spec.pacing
+        )
+
+    def _run_camera(self, spec: CameraSpec):
+        """Camera thread body: paced frames -> shared queue (drop when full)."""
+        stats = self.camera_stats[spec.camera_id]
+        rng = self._rngs[spec.camera_id]
+        stream = None
+        try:
+            stream = self._open(spec)
+            end_time = time.monotonic() + spec.duration if spec.duration else None
+            for frame_id, frame in enumerate(stream.stream(pool=self.pool)):
+                if self._stop.is_set() or (end_time and time.monotonic() >= end_time):
+                    self._release(frame)
+                    break
+                if spec.jitter_ms > 0:
+                    # abs(gauss): delivery is only ever delayed, never early
+                    time.sleep(abs(rng.gauss(0.0, spec.jitter_ms)) / 1000)
+                frame = resize_frame(frame, spec.resolution, self.pool)
+                try:
+                    self._queue.put_nowait((spec.camera_id, CapturedFrame(frame, frame_id)))
+                    self.frame_counts[spec.camera_id] += 1
+                except queue.Full:
+                    stats['frames_dropped'] += 1
+                    self._release(frame)
+                stats['pacer_dropped'] = stream.pacer.dropped
+                stats['achieved_fps'] = round(stream.pacer.achieved_fps, 2)
+                if self.max_frames and frame_id + 1 >= self.max_frames:
+                    break
+        except Exception as e:  # noqa: BLE001 - one camera failing must not stop the others
+            self.errors[spec.camera_id] = e
+            logger.warning(f"Simulated camera {spec.camera_id} ({spec.source}) stopped: {e}")
+        finally:
+            if stream:
+                stream.close()
+            self._put_end_marker(spec.camera_id)
+
+    def _put_end_marker(self, camera_id: str):
+        """Blocking put of (camera_id, None) that gives up once the consumer has stopped."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put((camera_id, None), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _release(self, frame: np.ndarray):
+        if self.pool:
+            self.pool.release(frame)
@@ -0,0 +1,83 @@
+"""Deadline-based frame pacing against a monotonic clock."""
+
+import time
+
+PACING_POLICIES = ("catchup", "drop")
+
+
+# Scheduler Pattern: frame n is due at start + n / fps (absolute deadlines)
+# Why: sleeping a fixed 1/fps after each frame adds decode time to every period,
+# so a "25 fps" camera drifts to ~22 fps; absolute deadlines never accumulate error.
+class FramePacer:
+    """
+    Release frames on a fixed-rate schedule.
+
+    policy="catchup": late frames are released immediately until back on schedule
+                      (every frame is delivered, in bursts after a stall)
+    policy="drop":    frames whose deadline has passed are skipped, like a real
+                      camera that keeps capturing while the consumer is busy
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        policy: str = "catchup",
+        max_catchup: float | None = 1.0  # Seconds of backlog to burst through (None = all)
+    ):
+        if fps <= 0:
+            raise ValueError(f"fps must be > 0, got {fps}")
+        if policy not in PACING_POLICIES:
+            raise ValueError(f"Unknown pacing policy '{policy}', use one of {PACING_POLICIES}")
+
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.policy = policy
+        self.max_catchup = max_catchup
+        self.emitted = 0  # Frames released
+        self.dropped = 0  # Frames skipped by the drop policy
+        self.late = 0  # Frames released a full period (or more) after their deadline
+        self.resyncs = 0  # Schedule restarts after a backlog longer than max_catchup
+        self._start: float | None = None  # Schedule anchor (moved by resyncs)
+        self._first: float | None = None  # First frame release (never moved)
+        self._slot = 0  # Schedule slot of the next frame
+
+    @property
+    def achieved_fps(self) -> float:
+        """Frames released per second of wall-clock time since the first frame."""
+        if self._first is None or self.emitted < 2:
+            return 0.0
+        elapsed = time.monotonic() - self._first  # Not _start: stalls must lower the rate
+        return (self.emitted - 1) / elapsed if elapsed > 0 else 0.0
+
+    def wait(self) -> int:
+        """
+        Block until the next frame is due.
+
+        Returns:
+            Number of frames the caller should skip before the next one
+            (always 0 with the catchup policy)
+        """
+        now = time.monotonic()
+        if self._start is None:
+            self._start = self._first = now  # First frame is due immediately, anchors the schedule
+
+        deadline = self._start + self._slot * self.period
+        skip = 0
+        if now < deadline:
+            time.sleep(deadline - now)
+        else:
+            behind = int((now - deadline) / self.period)  # Whole periods we are late
+            if behind > 0:
+                self.late += 1
+            if self.policy == "drop":
+                skip = behind
+                self.dropped += skip
+                self._slot += skip
+            elif self.max_catchup is not None and now - deadline > self.max_catchup:
+                # Too far behind to burst: restart the schedule from now
+                self._start = now - self._slot * self.period
+                self.resyncs += 1
+
+        self._slot += 1
+        self.emitted += 1
+        return skip
@@ -1,9 +1,11 @@
 """
 Video stream simulator for offline testing.
 
-This module provides TWO separate utilities:
+This module provides these utilities:
 1. VideoStreamSimulator - Loops existing video files as live streams (REQUIRES VIDEO)
-2. generate_test_video() - Creates synthetic test videos from scratch (NO INPUT NEEDED)
+2. SyntheticStream - Paced live stream of generated frames (NO INPUT NEEDED)
+3. generate_test_video() - Creates synthetic test videos from scratch (NO INPUT NEEDED)
+4. fleet command - Runs N simulated cameras at once (see utils/fleet.py)
 
 Usage:
     # Generate synthetic video (no input needed):
@@ -11,13 +13,20 @@ Usage:
     
     # Loop existing video as stream (requires video file):
     python -m src.utils.video_simulator stream my_video.mp4 --loop
+    
+    # 64 simulated cameras through the detection pipeline:
+    python -m src.utils.video_simulator fleet --cameras 64 --source synthetic --detect
 """
 
-import cv2
-import time
-from pathlib import Path
-from typing import Optional
 import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from ..vision.capture import read_into_pool
+from ..vision.frame_pool import FramePool
+from .pacing import FramePacer
 
 
 class VideoStreamSimulator:
@@ -30,7 +39,13 @@ class VideoStreamSimulator:
     Use Case: Make recorded video behave like live camera feed (loop infinitely).
     """
     
-    def __init__(self, video_path: str, loop: bool = True, fps_override: Optional[float] = None):
+    def __init__(
+        self,
+        video_path: str,
+        loop: bool = True,
+        fps_override: float | None = None,
+        pacing: str = "catchup"
+    ):
         """
         Initialize video stream simulator.
         
@@ -38,6 +53,8 @@ class VideoStreamSimulator:
             video_path: Path to video file
             loop: Whether to loop video infinitely
             fps_override: Override video FPS (None = use original)
+            pacing: "catchup" (deliver every frame, burst when late) or
+                "drop" (skip frames whose deadline has passed, like a real camera)
         """
         self.video_path = Path(video_path)
         self.loop = loop
@@ -49,19 +66,42 @@ class VideoStreamSimulator:
         self.cap = cv2.VideoCapture(str(self.video_path))
         self.original_fps = self.cap.get(cv2.CAP_PROP_FPS) or 25.0
         self.fps = fps_override or self.original_fps
-        self.frame_delay = 1.0 / self.fps  # Delay between frames in seconds
+        self.frame_delay = 1.0 / self.fps  # Nominal interval between frames in seconds
+        self.pacer = FramePacer(self.fps, policy=pacing)  # Deadlines, drops, achieved fps
     
-    def stream(self):
+    def stream(self, pool: FramePool | None = None):
         """
         Stream video frames with realistic timing.
         
+        Args:
+            pool: Decode into recycled buffers; caller must pool.release(frame) after use
+        
         Yields:
-            Frames from video file
+            Frames from video file, released on the pacer's fixed-rate schedule
         """
         frame_count = 0
+        shape = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            3
+        )
         
+        waited = False  # Already waited for the pending frame's deadline
+        skip = 0
         while True:
-            ret, frame = self.cap.read()
+            if not waited:
+                skip = self.pacer.wait()  # Sleep until due; drop policy returns frames to skip
+                waited = True
+            # Drop policy: skip the frames a real camera would have captured meanwhile
+            while skip > 0 and self.cap.grab():
+                skip -= 1
+            
+            if skip > 0:
+                ret, frame = False, None  # End of file reached while skipping
+            elif pool is None:
+                ret, frame = self.cap.read()
+            else:
+                ret, frame = read_into_pool(self.cap, pool, shape)
             
             if not ret:
                 if not self.loop:
@@ -72,9 +112,7 @@ class VideoStreamSimulator:
                 frame_count = 0
                 continue
             
-            # Simulate real-time streaming with delay
-            time.sleep(self.frame_delay)
-            
+            waited = False
             frame_count += 1
             yield frame
     
@@ -83,6 +121,69 @@ class VideoStreamSimulator:
         self.cap.release()
 
 
+class SyntheticStream:
+    """
+    Live stream of generated frames (moving circle), paced like VideoStreamSimulator.
+    
+    Same stream()/pacer/close() interface, so a fleet can mix files and generators.
+    """
+    
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 480,
+        fps: float = 25.0,
+        pacing: str = "catchup",
+        phase: int = 0  # Frame offset, so cameras of a fleet show different frames
+    ):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.phase = phase
+        self.pacer = FramePacer(fps, policy=pacing)
+        # Warm-up: the first OpenCV drawing call initialises fonts (50-200 ms); doing it
+        # here keeps that one-off cost out of the pacing schedule
+        synthetic_frame(0, width, height)
+    
+    def stream(self, pool: FramePool | None = None):
+        """
+        Generate frames on the pacer's schedule (endless).
+        
+        Args:
+            pool: Draw into recycled buffers; caller must pool.release(frame) after use
+        """
+        i = self.phase
+        while True:
+            i += 1 + self.pacer.wait()  # Dropped slots advance the animation too
+            out = pool.acquire((self.height, self.width, 3)) if pool else None
+            yield synthetic_frame(i, self.width, self.height, out=out)
+    
+    def close(self):
+        """Nothing to release (interface parity with VideoStreamSimulator)."""
+
+
+def synthetic_frame(
+    i: int,
+    width: int = 640,
+    height: int = 480,
+    total_frames: int | None = None,
+    out: np.ndarray | None = None  # Reusable output buffer (e.g. from FramePool)
+) -> np.ndarray:
+    """Frame i of the synthetic test scene: tinted background, moving circle, frame counter."""
+    frame = out if out is not None else np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :] = [50 + i % 50, 100, 150]  # Gradient background
+    
+    # Add moving circle (simulates fruit)
+    x = int((width / 2) + 100 * np.sin(i / 10))
+    y = int((height / 2) + 100 * np.cos(i / 10))
+    cv2.circle(frame, (x, y), 30, (0, 255, 0), -1)
+    
+    # Add timestamp text
+    label = f"Frame {i}/{total_frames}" if total_frames else f"Frame {i}"
+    cv2.putText(frame, label, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    return frame
+
+
 def generate_test_video(
     output_path: str = "data/samples/test_shelf.avi",
     duration: int = 10,
@@ -121,8 +222,6 @@ def generate_test_video(
         height: Frame height
         fps: Frames per second
     """
-    import numpy as np
-    
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     
     fourcc = cv2.VideoWriter_fourcc(*'XVID')
@@ -131,27 +230,45 @@ def generate_test_video(
     total_frames = int(fps * duration)
     
     for i in range(total_frames):
-        # Create frame with gradient background
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
-        frame[:, :] = [50 + i % 50, 100, 150]
-        
-        # Add moving circle (simulates fruit)
-        x = int((width / 2) + 100 * np.sin(i / 10))
-        y = int((height / 2) + 100 * np.cos(i / 10))
-        cv2.circle(frame, (x, y), 30, (0, 255, 0), -1)
-        
-        # Add timestamp text
-        cv2.putText(
-            frame, f"Frame {i}/{total_frames}", (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-        )
-        
-        writer.write(frame)
+        writer.write(synthetic_frame(i, width, height, total_frames))
     
     writer.release()
     print(f"Generated test video: {output_path}")
 
 
+def run_fleet(args: argparse.Namespace):
+    """Run the fleet command: report delivered fps and drops per camera."""
+    from .fleet import CameraFleet, fleet_specs
+    
+    sizes = [tuple(int(v) for v in s.lower().split('x')) for s in args.size.split(',')] \
+        if args.size else [None]
+    specs = fleet_specs(
+        args.cameras,
+        sources=args.source or ['synthetic'],
+        fps=[float(v) for v in args.fps.split(',')],
+        resolutions=sizes,
+        jitter_ms=[float(v) for v in args.jitter.split(',')],
+        duration=args.duration
+    )
+    print(f"Running {len(specs)} simulated cameras for {args.duration:.0f}s")
+    
+    if args.detect:
+        # Imported here: the pipeline imports this package (avoids a circular import)
+        from ..pipeline.orchestrator import PipelineConfig, process_shelf_video
+        stats = process_shelf_video(PipelineConfig(source="", fleet=specs, display=False))
+        delivered = stats['frames_processed']
+        dropped = stats['frames_dropped']
+    else:
+        fleet = CameraFleet(specs)
+        delivered = sum(1 for _ in fleet)  # Consume only: measures capture capacity
+        dropped = fleet.frames_dropped
+    
+    expected = sum(spec.fps for spec in specs) * args.duration
+    print(f"Frames delivered: {delivered} ({delivered / args.duration:.1f} fps, "
+          f"{100 * delivered / expected:.1f}% of nominal)")
+    print(f"Frames dropped: {dropped}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Video stream simulator utilities")
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
@@ -161,6 +278,21 @@ def main():
     stream_parser.add_argument('video', help='Path to video file')
     stream_parser.add_argument('--loop', action='store_true', help='Loop video infinitely')
     stream_parser.add_argument('--fps', type=float, help='Override FPS')
+    stream_parser.add_argument('--pacing', choices=['catchup', 'drop'], default='catchup',
+                               help='Late frames: deliver in a burst (catchup) or skip them (drop)')
+    
+    # Simulated camera fleet command (load testing)
+    fleet_parser = subparsers.add_parser('fleet', help='Run N simulated cameras concurrently')
+    fleet_parser.add_argument('--cameras', type=int, default=8, help='Number of cameras')
+    fleet_parser.add_argument('--source', action='append',
+                              help='Video file or "synthetic" (repeat to mix; default synthetic)')
+    fleet_parser.add_argument('--fps', default='25',
+                              help='Comma-separated fps, cycled over cameras')
+    fleet_parser.add_argument('--size', help='Comma-separated WIDTHxHEIGHT, cycled over cameras')
+    fleet_parser.add_argument('--jitter', default='0', help='Comma-separated jitter (ms) profiles')
+    fleet_parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+    fleet_parser.add_argument('--detect', action='store_true',
+                              help='Feed the fleet through the detection pipeline')
     
     # Generate test video command
     gen_parser = subparsers.add_parser('generate', help='Generate synthetic test video')
@@ -170,7 +302,9 @@ def main():
     args = parser.parse_args()
     
     if args.command == 'stream':
-        simulator = VideoStreamSimulator(args.video, loop=args.loop, fps_override=args.fps)
+        simulator = VideoStreamSimulator(
+            args.video, loop=args.loop, fps_override=args.fps, pacing=args.pacing
+        )
         
         print(f"Streaming video: {args.video}")
         print("Press 'q' to quit")
@@ -183,6 +317,12 @@ def main():
         finally:
             simulator.close()
             cv2.destroyAllWindows()
+            pacer = simulator.pacer
+            print(f"Achieved {pacer.achieved_fps:.2f} fps (target {pacer.fps:.2f}), "
+                  f"late: {pacer.late}, dropped: {pacer.dropped}")
+    
+    elif args.command == 'fleet':
+        run_fleet(args)
     
     elif args.command == 'generate':
         generate_test_video(
@@ -1,6 +1,16 @@
 """Vision module - Video capture and object detection."""
 
-from .capture import stream_frames
-from .detect import detect_objects, FruitDetector
+from .capture import capture_frames, stream_frames
+from .detect import DetectionBatch, FruitDetector, detect_objects
+from .frames import CapturedFrame
+from .multi_source import MultiSourceCapture
 
-__all__ = ["stream_frames", "detect_objects", "FruitDetector"]
+__all__ = [
+    "CapturedFrame",
+    "DetectionBatch",
+    "FruitDetector",
+    "MultiSourceCapture",
+    "capture_frames",
+    "detect_objects",
+    "stream_frames"
+]
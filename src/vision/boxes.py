@@ -0,0 +1,105 @@
+"""Vectorized bounding-box geometry shared by detection, evaluation and tracking."""
+
+
+import numpy as np
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise intersection-over-union of two box sets.
+
+    Args:
+        boxes_a: (N, 4) array of (x1, y1, x2, y2)
+        boxes_b: (M, 4) array of (x1, y1, x2, y2)
+
+    Returns:
+        (N, M) IoU matrix (0.0 where boxes do not overlap)
+    """
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    # Broadcasting: a[:, None] is (N, 1), b[None] is (1, M) -> every pair at once
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    # np.divide(where=...): skip 0/0 for degenerate boxes, leave those entries at 0
+    return np.divide(intersection, union, out=np.zeros_like(union), where=union > 0)
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float = 0.7,
+    class_ids: np.ndarray | None = None,
+    max_det: int = 300
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression.
+
+    Args:
+        boxes: (N, 4) array of (x1, y1, x2, y2)
+        scores: (N,) confidence per box
+        iou_threshold: Boxes overlapping a kept box by more than this are dropped
+        class_ids: (N,) class per box; when given, only same-class boxes suppress each other
+        max_det: Maximum number of boxes kept
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if class_ids is not None and len(boxes):
+        # Shift each class to its own region of the plane: boxes of different classes never overlap
+        boxes = boxes + (np.asarray(class_ids, dtype=np.float32) * (boxes.max() + 1))[:, None]
+    order = np.argsort(scores)[::-1]  # Highest score first
+    keep = []
+    while order.size and len(keep) < max_det:
+        best = order[0]
+        keep.append(best)
+        overlap = iou_matrix(boxes[best:best + 1], boxes[order[1:]])[0]
+        order = order[1:][overlap <= iou_threshold]  # One vectorized pass per kept box
+    return np.array(keep, dtype=np.int64)
+
+
+def match_count(
+    boxes_a: np.ndarray,
+    boxes_b: np.ndarray,
+    iou_threshold: float = 0.5,
+    same_class: np.ndarray | None = None
+) -> int:
+    """
+    Greedy one-to-one matching by IoU; number of matched pairs.
+
+    Args:
+        boxes_a: (N, 4) boxes, e.g. detections
+        boxes_b: (M, 4) boxes, e.g. ground truth or a reference model's detections
+        iou_threshold: Minimum IoU for a pair to match
+        same_class: Optional (N, M) bool matrix; pairs with False never match
+    """
+    ious = iou_matrix(boxes_a, boxes_b)
+    if same_class is not None and ious.size:
+        ious = np.where(same_class, ious, 0.0)
+    return len(greedy_match(ious, iou_threshold))
+
+
+def greedy_match(scores: np.ndarray, threshold: float) -> list[tuple[int, int]]:
+    """
+    One-to-one (row, col) pairs, best score first, each with score >= threshold.
+
+    Only candidate pairs above the threshold are sorted (few, for box overlaps),
+    so crowded frames cost one sort plus a linear pass, not an argmax per pair.
+    """
+    rows, cols = np.nonzero(scores >= threshold)
+    order = np.argsort(-scores[rows, cols], kind='stable')
+    used_rows, used_cols, pairs = set(), set(), []
+    for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        pairs.append((row, col))
+    return pairs
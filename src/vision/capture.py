@@ -1,18 +1,27 @@
 """Video capture with generator pattern for frame streaming."""
 
-import cv2
-# Union[A, B]: Type can be either A or B (e.g., Union[int, str] = int OR str)
-# Why: Allows function to accept multiple types without overloading
-from typing import Generator, Union
+from collections.abc import Generator
 from contextlib import contextmanager  # Decorator for creating context managers (with statements)
 
+import cv2
+
+from .frame_cache import FrameCache, resize_frame
+from .frame_pool import FramePool
+from .frames import CapturedFrame
+from .live import LatestFrameReader
+from .prefetch import PrefetchReader
+from .shared_frames import SharedFrameRing
+from .source import VideoSource, cached_props
+
 
 # Generator: Function that yields values instead of returning (memory efficient)
 # Why: Streams frames one-by-one without loading entire video into memory
 # Pattern: Ideal for processing large/infinite streams (e.g., camera feeds)
 def stream_frames(
-    source: Union[int, str],  # Union = can be int (camera index) OR str (file/URL)
-    max_frames: int = 0  # 0 means unlimited (stream until user stops)
+    # A | B: type can be either A or B; accepts several types without overloading
+    source: int | str,  # int (camera index) OR str (file/URL)
+    max_frames: int = 0,  # 0 means unlimited (stream until user stops)
+    **options  # **options: keyword args forwarded to capture_frames (prefetch, live, pool, ...)
 ) -> Generator[tuple[bool, any], None, None]:  # Generator[YieldType, SendType, ReturnType]
     """
     Stream video frames from camera or file.
@@ -20,38 +29,238 @@ def stream_frames(
     Args:
         source: Camera index (int) or video file/stream URL (str)
         max_frames: Maximum frames to capture (0 = unlimited)
+        **options: Capture options, see capture_frames()
     
     Yields:
         (success, frame) tuples
     """
-    cap = cv2.VideoCapture(source)
+    for captured in capture_frames(source, max_frames, **options):
+        yield True, captured.image
+
+
+def capture_frames(
+    source: int | str,
+    max_frames: int = 0,
+    prefetch: int = 0,  # 0 = decode on caller thread, N = decode ahead into N-frame buffer
+    live: bool = False,  # True = always yield the newest frame, drop stale ones
+    stats: dict | None = None,  # Optional dict updated in place with capture counters
+    pool: FramePool | None = None,  # Decode into recycled buffers (caller releases them)
+    frame_stride: int = 1,  # Process every Nth frame, skip the rest with grab()
+    target_fps: float | None = None,  # Derive the stride from the source fps instead
+    start_frame: int = 0,  # Seek to this frame index first (video files only)
+    max_reconnects: int = 5,  # Live sources: reconnect attempts (exponential backoff)
+    resize: tuple[int, int] | None = None,  # (width, height) applied after decode
+    cache_dir: str | None = None  # Serve video files from a decode-once frame cache
+) -> Generator[CapturedFrame, None, None]:
+    """
+    Stream frames with capture timestamps and trace ids.
+    
+    Args:
+        source: Camera index (int) or video file/stream URL (str)
+        max_frames: Maximum frames to yield (0 = unlimited)
+        prefetch: Frames to decode ahead on a background thread (0 = disabled)
+        live: Latest-frame-wins mode for live sources (bounded latency)
+        stats: If given, kept up to date with 'frames_dropped' (live mode),
+            'reconnects' and 'read_latency_ms' (mean/max)
+        pool: Frame pool to decode into; call pool.release(frame) when done with a frame
+        frame_stride: Yield one frame out of every `frame_stride` (1 = every frame)
+        target_fps: Approximate frames per second of video to yield (overrides frame_stride)
+        start_frame: Index of the first frame to read (seek, for segment processing)
+        max_reconnects: Reconnect attempts for live sources before the stream ends
+        resize: Output frame size as (width, height) (None = native size)
+        cache_dir: Frame cache directory; the first run decodes the file into it,
+            later runs yield read-only zero-copy views of the cached frames
+            (stats['frame_cache'] = 'hit' / 'miss')
+    
+    Yields:
+        CapturedFrame envelopes, timestamped right after decode
+    """
+    if live and prefetch > 0:
+        raise ValueError("prefetch and live modes are mutually exclusive")
+    if frame_stride < 1:
+        raise ValueError(f"frame_stride must be >= 1, got {frame_stride}")
+    if live and cache_dir:
+        raise ValueError("frame cache is for offline video files, not live mode")
+    
+    # Frames read but never yielded (dropped, or the consumer stopped) go back to the pool
+    on_drop = (lambda captured: pool.release(captured.image)) if pool else None
+    if not live:
+        if cache_dir:
+            frames = _read_cached(
+                source, cache_dir, resize, max_frames, frame_stride, target_fps, start_frame, stats
+            )
+        else:
+            frames = _read_frames(
+                source, max_frames, pool, frame_stride, target_fps, start_frame,
+                max_reconnects, stats, resize
+            )
+        if prefetch > 0:
+            # Decode on a background thread so decode overlaps downstream inference
+            frames = PrefetchReader(frames, depth=prefetch, on_drop=on_drop)
+        yield from frames  # yield from: re-yield every item of another iterable
+        return
+    
+    # Live mode: capture thread reads unlimited, max_frames counts frames we consume
+    reader = LatestFrameReader(
+        _read_frames(
+            source, pool=pool, frame_stride=frame_stride, target_fps=target_fps,
+            max_reconnects=max_reconnects, stats=stats, resize=resize
+        ),
+        on_drop=on_drop
+    )
+    for frame_count, captured in enumerate(reader, start=1):
+        if stats is not None:
+            stats['frames_dropped'] = reader.dropped
+        yield captured
+        if max_frames > 0 and frame_count >= max_frames:
+            break
+
+
+def _read_frames(
+    source: int | str,
+    max_frames: int = 0,
+    pool: FramePool | None = None,
+    frame_stride: int = 1,
+    target_fps: float | None = None,
+    start_frame: int = 0,
+    max_reconnects: int = 5,
+    stats: dict | None = None,
+    resize: tuple[int, int] | None = None
+) -> Generator[CapturedFrame, None, None]:
+    """Read frames sequentially from a VideoSource (runs on the calling thread)."""
+    cap = VideoSource(source, max_reconnects=max_reconnects)  # Raises ValueError if unavailable
+    
+    if start_frame > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
     
-    if not cap.isOpened():
-        raise ValueError(f"Cannot open video source: {source}")
+    if target_fps:
+        frame_stride = max(1, round(cap.props['fps'] / target_fps))
     
     try:
         frame_count = 0
+        frame_id = start_frame  # Position in the source, including skipped frames
+        # Buffer shape for pooled reads; corrected from the first decoded frame
+        shape = (cap.props['height'], cap.props['width'], 3)
         while cap.isOpened():
             if max_frames > 0 and frame_count >= max_frames:
                 break
-                
-            ret, frame = cap.read()
+            
+            if pool is None:
+                ret, frame = cap.read()
+            else:
+                ret, frame = read_into_pool(cap, pool, shape)
             if not ret:
                 break
+            shape = frame.shape
+            frame = resize_frame(frame, resize, pool)
+            captured = CapturedFrame(frame, frame_id)  # Timestamped right after decode
+            if stats is not None:
+                _update_source_stats(stats, cap)
                 
-            yield ret, frame
+            yield captured
             frame_count += 1
+            frame_id += frame_stride
+            
+            if not _skip_frames(cap, frame_stride - 1):
+                break
     finally:
         cap.release()
 
 
+def _read_cached(
+    source: str,
+    cache_dir: str,
+    resize: tuple[int, int] | None,
+    max_frames: int = 0,
+    frame_stride: int = 1,
+    target_fps: float | None = None,
+    start_frame: int = 0,
+    stats: dict | None = None
+) -> Generator[CapturedFrame, None, None]:
+    """Yield frames from the frame cache (decoding the file into it on a miss)."""
+    video, hit = FrameCache(cache_dir, resize).open(source)
+    if stats is not None:
+        stats['frame_cache'] = 'hit' if hit else 'miss'
+    if target_fps:
+        frame_stride = max(1, round(video.fps / target_fps))
+    
+    # range slicing: stride and max_frames applied to indices, frames are never touched
+    indices = range(start_frame, len(video), frame_stride)
+    if max_frames > 0:
+        indices = indices[:max_frames]
+    for i in indices:
+        yield CapturedFrame(video.frame(i), i)
+
+
+def _update_source_stats(stats: dict, cap: VideoSource):
+    """Copy reconnect and read-latency counters into the caller's stats dict."""
+    stats['reconnects'] = cap.reconnects
+    stats['read_latency_ms'] = {
+        'mean': round(cap.mean_read_latency * 1000, 2),
+        'max': round(cap.max_read_latency * 1000, 2)
+    }
+
+
+def _skip_frames(cap: VideoSource, count: int) -> bool:
+    """
+    Advance `count` frames with grab() only.
+    
+    grab() demuxes/decodes without retrieve()'s colour conversion and copy
+    into a BGR ndarray, so skipped frames cost a fraction of a full read.
+    """
+    for _ in range(count):
+        if not cap.grab():
+            return False  # End of stream
+    return True
+
+
+def read_into_pool(
+    cap: cv2.VideoCapture | VideoSource,
+    pool: FramePool,
+    shape: tuple
+) -> tuple[bool, any]:
+    """Decode the next frame into a pooled buffer (cap.read(image=buf), no allocation)."""
+    buffer = pool.acquire(shape)
+    ret, frame = cap.read(image=buffer)
+    
+    if not ret:
+        pool.release(buffer)
+        return False, None
+    if frame is not buffer:
+        pool.replace(buffer, frame)  # Shape mismatch: OpenCV allocated a new array
+    return ret, frame
+
+
+def stream_to_ring(
+    source: int | str,
+    ring: SharedFrameRing,
+    max_frames: int = 0,
+    consumers: int = 1,
+    **options  # **options: extra keyword args forwarded to stream_frames (stride, live, ...)
+) -> int:
+    """
+    Producer side of a capture process: copy frames into shared-memory slots.
+    
+    Consumers in other processes read them zero-copy via ring.frames().
+    Returns the number of frames written.
+    """
+    written = 0
+    try:
+        for _, frame in stream_frames(source, max_frames, **options):
+            ring.write(frame)  # Blocks while all slots are held by consumers
+            written += 1
+    finally:
+        ring.finish(consumers)  # Always unblock consumers, even on capture errors
+    return written
+
+
 # @contextmanager: Decorator that turns generator into context manager
 # Why: Enables 'with' statement usage for automatic resource cleanup
 # Pattern: Ensures resources (files, connections) are always released, even on errors
 @contextmanager
-def video_writer(output_path: str, fps: float, width: int, height: int):
+def video_writer(output_path: str, fps: float, width: int, height: int, codec: str = 'XVID'):
     """Context manager for video writing."""
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')  # Video codec (XVID = compressed AVI)
+    fourcc = cv2.VideoWriter_fourcc(*codec)  # Video codec (XVID = compressed AVI)
     writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
     
     try:
@@ -60,18 +269,15 @@ def video_writer(output_path: str, fps: float, width: int, height: int):
         writer.release()  # Always executes, even if error occurs in 'with' block
 
 
-def get_video_props(source: Union[int, str]) -> dict:
-    """Extract video properties (fps, width, height)."""
-    cap = cv2.VideoCapture(source)
-    
-    if not cap.isOpened():
-        raise ValueError(f"Cannot open video source: {source}")
-    
-    props = {
-        'fps': cap.get(cv2.CAP_PROP_FPS) or 25.0,
-        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    }
+def get_video_props(source: int | str) -> dict:
+    """
+    Extract video properties (fps, width, height, frame_count).
     
-    cap.release()
-    return props
+    Served from the probe cache when the source is already open (no second capture).
+    """
+    props = cached_props(source)
+    if props is None:
+        cap = VideoSource(source, max_reconnects=0)  # Raises ValueError if unavailable
+        props = cap.props
+        cap.release()
+    return dict(props)  # Copy: callers may modify their dict
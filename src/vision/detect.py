@@ -1,10 +1,15 @@
 """Object detection using YOLOv8 with functional patterns."""
 
-import cv2
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass  # Auto-generates __init__, __repr__, __eq__ methods
-from typing import Optional  # Optional[T] = Union[T, None] - value can be T or None
-from ultralytics import YOLO
+
+import cv2
 import numpy as np
+from ultralytics import YOLO
+
+from .boxes import nms
+from .registry import MODEL_REGISTRY
+from .tiling import tile_grid, tiles_in_mask
 
 
 # @dataclass: Decorator that auto-generates boilerplate code for data-holding classes
@@ -18,50 +23,333 @@ class Detection:
     confidence: float  # Detection confidence score (0.0 to 1.0)
 
 
+# Structured dtype: one record per box, each field a contiguous column (no Python objects)
+DETECTION_DTYPE = np.dtype([
+    ('bbox', np.int32, (4,)),  # (x1, y1, x2, y2)
+    ('confidence', np.float64),
+    ('class_id', np.int32),  # Index into DetectionBatch.names
+])
+
+
+# Columnar (struct-of-arrays) Pattern
+# Why: crowded shelves yield hundreds of boxes per frame; one NumPy record array
+# replaces hundreds of small objects and lets filters run as boolean masks.
+class DetectionBatch(Sequence):
+    """
+    Detections of one frame stored as a DETECTION_DTYPE structured array.
+    
+    Behaves like a read-only list of Detection: integer indexing and iteration
+    build Detection objects on demand; slices and boolean masks return a new
+    DetectionBatch without materializing anything.
+    """
+    
+    def __init__(self, data: np.ndarray | None = None, names: Iterable[str] = ()):
+        """
+        Args:
+            data: DETECTION_DTYPE array (None = empty batch)
+            names: Class names indexed by class_id
+        """
+        self.data = data if data is not None else np.empty(0, dtype=DETECTION_DTYPE)
+        self.names = tuple(names)
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        class_ids: np.ndarray,
+        names: Iterable[str]
+    ) -> "DetectionBatch":
+        """Build from (N, 4) boxes, (N,) confidences and (N,) class ids."""
+        data = np.empty(len(class_ids), dtype=DETECTION_DTYPE)
+        data['bbox'] = boxes  # Float boxes truncate to int, like int(tensor) did
+        data['confidence'] = confidences
+        data['class_id'] = class_ids
+        return cls(data, names)
+    
+    @classmethod
+    def from_detections(cls, detections: Iterable[Detection]) -> "DetectionBatch":
+        """Build from Detection objects (class ids assigned in order of first appearance)."""
+        detections = list(detections)
+        # dict.fromkeys: ordered de-duplication of labels
+        names = tuple(dict.fromkeys(det.label for det in detections))
+        ids = {name: i for i, name in enumerate(names)}
+        return cls.from_arrays(
+            np.array([det.bbox for det in detections], dtype=np.int32).reshape(-1, 4),
+            np.array([det.confidence for det in detections], dtype=np.float64),
+            np.array([ids[det.label] for det in detections], dtype=np.int32),
+            names
+        )
+    
+    @classmethod
+    def concat(cls, batches: list["DetectionBatch"], names: Iterable[str]) -> "DetectionBatch":
+        """One batch holding all detections of `batches` (same class names)."""
+        if not batches:
+            return cls(names=names)
+        return cls(np.concatenate([batch.data for batch in batches]), names)
+    
+    @property
+    def boxes(self) -> np.ndarray:
+        """(N, 4) int32 view of the boxes."""
+        return self.data['bbox']
+    
+    @property
+    def confidences(self) -> np.ndarray:
+        return self.data['confidence']
+    
+    @property
+    def class_ids(self) -> np.ndarray:
+        return self.data['class_id']
+    
+    @property
+    def labels(self) -> list[str]:
+        return [self.names[i] for i in self.data['class_id'].tolist()]
+    
+    def translate(self, dx: int, dy: int) -> "DetectionBatch":
+        """Copy with every box shifted by (dx, dy) pixels."""
+        data = self.data.copy()
+        data['bbox'] += np.array([dx, dy, dx, dy], dtype=np.int32)
+        return DetectionBatch(data, self.names)
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def __getitem__(self, index):
+        """Integer -> Detection; slice, mask or index array -> DetectionBatch."""
+        if isinstance(index, (int, np.integer)):
+            record = self.data[index]
+            return Detection(
+                tuple(record['bbox'].tolist()), self.names[record['class_id']],
+                float(record['confidence'])
+            )
+        return DetectionBatch(self.data[index], self.names)
+    
+    def __iter__(self) -> Iterator[Detection]:
+        # .tolist(): convert each column to Python values once, not per element
+        for bbox, confidence, label in zip(self.boxes.tolist(),
+                                           self.confidences.tolist(), self.labels):
+            yield Detection(tuple(bbox), label, confidence)
+    
+    def __eq__(self, other) -> bool:
+        """Equal to any sequence holding the same detections in the same order."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+    
+    def __repr__(self) -> str:
+        return f"DetectionBatch({list(self)!r})"
+
+
+def as_batch(detections: Iterable[Detection]) -> DetectionBatch:
+    """Return detections as a DetectionBatch (no copy when it already is one)."""
+    if isinstance(detections, DetectionBatch):
+        return detections
+    return DetectionBatch.from_detections(detections)
+
+
+ENGINES = ("torch", "onnx")
+PRECISIONS = ("fp32", "int8")  # int8: calibrated ONNX model (see vision/quantize.py)
+
+
 class FruitDetector:
-    """YOLOv8-based fruit detector with configurable classes."""
+    """YOLOv8-based fruit detector with configurable classes and inference engine."""
     
     def __init__(
         self,
         model_name: str = 'yolov8n.pt',
-        classes: Optional[list[str]] = None,  # Optional means: can be list[str] OR None
-        conf_threshold: float = 0.3
+        classes: list[str] | None = None,  # X | None: can be list[str] OR None
+        conf_threshold: float = 0.3,
+        engine: str = "torch",
+        imgsz: int = 640,
+        cache_dir: str = "data/cache/models",
+        threads: int = 0,
+        precision: str = "fp32",
+        tile_size: int = 0,
+        tile_overlap: float = 0.2,
+        tile_iou: float = 0.5,
+        warmup: int = 1
     ):
-        self.model = YOLO(model_name)
+        """
+        Args:
+            model_name: Weights (.pt), model name, or .onnx file for the onnx engine
+            classes: Class names to keep (None = all)
+            conf_threshold: Minimum confidence
+            engine: "torch" (ultralytics/PyTorch) or "onnx" (ONNX Runtime CPU)
+            imgsz: Model input size in pixels
+            cache_dir: Where the onnx engine caches exported models
+            threads: ONNX Runtime intra-op threads (0 = all cores)
+            precision: "fp32" or "int8" (statically quantized, onnx engine only)
+            tile_size: Detect on overlapping tiles of this size (0 = whole frame)
+            tile_overlap: Fraction of a tile shared with its neighbour
+            tile_iou: Class-aware NMS threshold when merging tile results
+            warmup: Dummy inferences run the first time this process uses the model
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown detector engine '{engine}', use one of {ENGINES}")
+        if precision not in PRECISIONS or (precision == "int8" and engine != "onnx"):
+            raise ValueError(f"Precision '{precision}' is not available for engine '{engine}'")
+        self.engine = engine
+        self.imgsz = imgsz
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_iou = tile_iou
+        # Shared handle: weights are loaded (and warmed up) once per process
+        self.model = load_model(model_name, engine, imgsz, cache_dir, threads, precision, warmup)
+        self._model_options = {  # To load other input sizes later (set_imgsz)
+            'model_name': model_name, 'cache_dir': cache_dir, 'threads': threads,
+            'precision': precision, 'warmup': warmup
+        }
         self.classes = classes  # None = detect all classes, list = filter specific classes
         self.conf_threshold = conf_threshold
+        # model.names is {class_id: name}; a tuple makes class_id -> name a plain index
+        self.names = tuple(self.model.names[i] for i in range(len(self.model.names)))
+        # Boolean lookup table over class ids: mask[cls] filters a whole frame at once
+        self._class_mask = np.isin(self.names, classes) if classes else None
     
     # __call__: Makes class instance callable like a function
     # Why: Allows detector(frame) instead of detector.detect(frame)
     # Pattern: Common in ML/AI for model inference (e.g., PyTorch, sklearn)
-    def __call__(self, frame: np.ndarray) -> list[Detection]:
+    def __call__(self, frame: np.ndarray) -> DetectionBatch:
         """Detect objects in frame (callable pattern)."""
         return self.detect(frame)
     
-    def detect(self, frame: np.ndarray) -> list[Detection]:
-        """Run detection on a single frame."""
-        results = self.model(frame, conf=self.conf_threshold, verbose=False)
-        detections = []
+    def set_imgsz(self, imgsz: int):
+        """
+        Change the model input size (e.g. from the resolution governor).
         
-        for r in results:
-            for box in r.boxes:
-                cls_id = int(box.cls[0])
-                label = self.model.names[cls_id]
-                
-                # Filter by class if specified
-                if self.classes and label not in self.classes:
-                    continue
-                
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                confidence = float(box.conf[0])
-                
-                detections.append(Detection(
-                    bbox=(x1, y1, x2, y2),
-                    label=label,
-                    confidence=confidence
-                ))
+        torch takes the size per call; the onnx engine letterboxes to the size it
+        was exported at, so it switches to the export for that size (exported on
+        first use).
+        """
+        if self.engine == "onnx" and imgsz != self.imgsz:
+            self.model = load_model(engine=self.engine, imgsz=imgsz, **self._model_options)
+        self.imgsz = imgsz
+    
+    def detect(self, frame: np.ndarray, mask: np.ndarray | None = None) -> DetectionBatch:
+        """Run detection on a single frame (mask: see detect_batch)."""
+        return self.detect_batch([frame], [mask])[0]  # One frame in -> one result out
+    
+    def detect_batch(
+        self,
+        frames: list[np.ndarray],
+        masks: list[np.ndarray | None] | None = None
+    ) -> list[DetectionBatch]:
+        """
+        Run detection on several frames in one forward pass.
         
-        return detections
+        Frames may differ in size (each is letterboxed to the model input).
+        
+        Args:
+            frames: BGR frames
+            masks: Optional (H, W) region per frame; in tiled mode, tiles without
+                any non-zero mask pixel are not run
+        
+        Returns:
+            One detection list per frame, in input order
+        """
+        if not frames:
+            return []
+        if self.tile_size:
+            return self._detect_tiled(frames, masks or [None] * len(frames))
+        return self._infer(frames)
+    
+    def _detect_tiled(
+        self,
+        frames: list[np.ndarray],
+        masks: list[np.ndarray | None]
+    ) -> list[DetectionBatch]:
+        """Tiles of all frames in one batch, shifted back and merged per frame."""
+        jobs = [
+            (i, tile)
+            for i, (frame, mask) in enumerate(zip(frames, masks))
+            for tile in tiles_in_mask(
+                tile_grid(frame.shape, self.tile_size, self.tile_overlap), mask
+            )
+        ]
+        crops = [frames[i][y1:y2, x1:x2] for i, (x1, y1, x2, y2) in jobs]  # Views, no copies
+        parts: list[list[DetectionBatch]] = [[] for _ in frames]
+        for (i, (x1, y1, _, _)), detections in zip(jobs, self._infer(crops) if crops else []):
+            parts[i].append(detections.translate(x1, y1))
+        
+        merged = []
+        for frame_parts in parts:
+            detections = DetectionBatch.concat(frame_parts, self.names)
+            # Overlap zones see an object twice: keep the best box per object and class
+            keep = nms(detections.boxes, detections.confidences, self.tile_iou,
+                       detections.class_ids, max_det=len(detections))
+            merged.append(detections[keep])
+        return merged
+    
+    def _infer(self, frames: list[np.ndarray]) -> list[DetectionBatch]:
+        """Engine forward pass over whole images."""
+        if self.engine == "onnx":
+            # Dynamic batch axis: all frames go through the session in one run
+            return [
+                self._to_batch(*prediction)
+                for prediction in self.model.predict_batch(list(frames), self.conf_threshold)
+            ]
+        # list input: ultralytics stacks the frames into a single (N, 3, H, W) batch tensor
+        results = self.model(
+            list(frames), conf=self.conf_threshold, imgsz=self.imgsz, verbose=False
+        )
+        return [self._parse(r) for r in results]
+    
+    def _parse(self, result) -> DetectionBatch:
+        """Convert one ultralytics result into a DetectionBatch (no per-box Python loop)."""
+        boxes = result.boxes.cpu().numpy()  # One device -> host copy for all columns
+        return self._to_batch(boxes.xyxy, boxes.conf, boxes.cls)
+    
+    def _to_batch(
+        self,
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        class_ids: np.ndarray
+    ) -> DetectionBatch:
+        """Apply the class filter to engine output columns and build a DetectionBatch."""
+        class_ids = class_ids.astype(np.int32)
+        # Filter by class if specified (boolean mask indexed by class id)
+        keep = self._class_mask[class_ids] if self._class_mask is not None else slice(None)
+        return DetectionBatch.from_arrays(
+            boxes[keep], confidences[keep], class_ids[keep], self.names
+        )
+
+
+# FruitDetector arguments that select the model (the rest configure how it is used)
+MODEL_OPTIONS = ("model_name", "engine", "imgsz", "cache_dir", "threads", "precision")
+
+
+def load_model(
+    model_name: str = 'yolov8n.pt',
+    engine: str = "torch",
+    imgsz: int = 640,
+    cache_dir: str = "data/cache/models",
+    threads: int = 0,
+    precision: str = "fp32",
+    warmup: int = 1
+):
+    """
+    Shared YOLO (torch) or OnnxEngine (onnx) model from the process-wide registry.
+    
+    The first call per configuration loads the weights; the first call per
+    process runs `warmup` dummy inferences at `imgsz`.
+    """
+    # Thread count shapes an ONNX Runtime session; torch models ignore it
+    key = (model_name, engine, imgsz, precision, threads if engine == "onnx" else 0)
+    
+    def load():
+        if engine == "onnx":
+            from .onnx_engine import OnnxEngine  # Lazy: onnxruntime is an optional dependency
+            return OnnxEngine.from_weights(model_name, imgsz, cache_dir, threads, precision)
+        return YOLO(model_name)
+    
+    def run_dummy(model):
+        frame = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        if engine == "onnx":
+            model.predict(frame)
+        else:
+            model(frame, imgsz=imgsz, verbose=False)
+    
+    return MODEL_REGISTRY.get(key, load, run_dummy, warmup)
 
 
 def detect_objects(
@@ -72,9 +360,17 @@ def detect_objects(
     return detector.detect(frame)
 
 
-def draw_detections(frame: np.ndarray, detections: list[Detection]) -> np.ndarray:
-    """Draw bounding boxes on frame (pure function)."""
-    annotated = frame.copy()
+def draw_detections(
+    frame: np.ndarray,
+    detections: list[Detection],
+    out: np.ndarray | None = None  # Reusable output buffer (e.g. from FramePool)
+) -> np.ndarray:
+    """Draw bounding boxes on a copy of frame (input frame is never modified)."""
+    if out is None:
+        annotated = frame.copy()
+    else:
+        np.copyto(out, frame)  # Copy pixels into existing buffer, no allocation
+        annotated = out
     
     for det in detections:
         x1, y1, x2, y2 = det.bbox
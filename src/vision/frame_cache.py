@@ -0,0 +1,137 @@
+"""Decode-once frame cache: raw frames in a memory-mapped file for repeat runs."""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .frame_pool import FramePool
+from .source import VideoSource
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1  # Bump when the file layout changes (old entries are ignored)
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file contents (read in 1 MB chunks, not loaded at once)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        # iter(callable, sentinel): call f.read until it returns b'' (end of file)
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resize_frame(
+    frame: np.ndarray,
+    resize: tuple[int, int] | None,
+    pool: FramePool | None = None  # Resize into a pooled buffer and release the source
+) -> np.ndarray:
+    """Resize to (width, height); frames already at that size are returned as-is."""
+    if resize is None or (frame.shape[1], frame.shape[0]) == tuple(resize):
+        return frame
+    out = pool.acquire((resize[1], resize[0], frame.shape[2])) if pool else None
+    resized = cv2.resize(frame, tuple(resize), dst=out, interpolation=cv2.INTER_AREA)
+    if pool:
+        pool.release(frame)
+    return resized
+
+
+class CachedVideo:
+    """Read-only view of one cache entry: frame i is a zero-copy slice of the mmap."""
+
+    def __init__(self, data_path: Path, index: dict):
+        self.index = index
+        self.fps: float = index['fps']
+        self.timestamps_ms: list[float] = [entry['timestamp_ms'] for entry in index['frames']]
+        # np.memmap: ndarray backed by the file; pages are loaded lazily by the OS
+        size = data_path.stat().st_size
+        # Empty file: np.memmap cannot map 0 bytes
+        self._data = (
+            np.memmap(data_path, dtype=np.uint8, mode='r') if size else np.empty(0, np.uint8)
+        )
+
+    def __len__(self) -> int:
+        return len(self.index['frames'])
+
+    def frame(self, i: int) -> np.ndarray:
+        """Frame i as a read-only ndarray view (no copy, no decode)."""
+        entry = self.index['frames'][i]
+        count = int(np.prod(entry['shape']))
+        return self._data[entry['offset']:entry['offset'] + count].reshape(entry['shape'])
+
+
+# Cache-Aside Pattern: look up the decoded frames, decode and store them on a miss
+# Why: Threshold tuning re-runs the same file dozens of times; decoding H.264 costs
+# far more than reading raw pixels back from the page cache.
+class FrameCache:
+    """
+    Directory of decoded videos keyed by source file hash and resize setting.
+
+    Each entry is `<key>.frames` (raw BGR pixels, frames back to back) plus
+    `<key>.json` (fps and per-frame offset, shape and timestamp).
+    """
+
+    def __init__(self, cache_dir: str, resize: tuple[int, int] | None = None):
+        """
+        Args:
+            cache_dir: Directory holding cache entries (created on first build)
+            resize: (width, height) applied before caching (None = native size)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.resize = tuple(resize) if resize else None
+
+    def key(self, source: str) -> str:
+        """Cache key: changes when the file contents or the resize setting change."""
+        settings = json.dumps({'version': CACHE_VERSION, 'resize': self.resize})
+        return hashlib.sha256(f"{file_digest(source)}:{settings}".encode()).hexdigest()[:32]
+
+    def open(self, source: str) -> tuple[CachedVideo, bool]:
+        """Return (cached video, hit); decodes and stores the source on a miss."""
+        if not os.path.isfile(source):
+            raise ValueError(f"Frame cache needs a video file, got: {source}")
+        key = self.key(source)
+        data_path = self.cache_dir / f"{key}.frames"
+        index_path = self.cache_dir / f"{key}.json"
+        hit = index_path.exists() and data_path.exists()
+        if not hit:
+            self._build(source, data_path, index_path)
+        return CachedVideo(data_path, json.loads(index_path.read_text())), hit
+
+    def _build(self, source: str, data_path: Path, index_path: Path):
+        """Decode every frame once into the raw file and write the index."""
+        logger.info(f"Building frame cache for {source} -> {data_path}")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cap = VideoSource(source, max_reconnects=0)
+        frames, offset = [], 0
+        tmp_data = data_path.with_suffix('.frames.tmp')
+        try:
+            with open(tmp_data, 'wb') as f:
+                while True:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    frame = np.ascontiguousarray(resize_frame(frame, self.resize))
+                    frames.append({
+                        'offset': offset,
+                        'shape': list(frame.shape),
+                        'timestamp_ms': cap.get(cv2.CAP_PROP_POS_MSEC)
+                    })
+                    frame.tofile(f)  # Raw bytes straight to disk, no intermediate copy
+                    offset += frame.nbytes
+            fps = cap.props['fps']
+        finally:
+            cap.release()
+
+        # Rename last: a crashed build never leaves a half-written entry behind
+        os.replace(tmp_data, data_path)
+        index = {'version': CACHE_VERSION, 'source': source, 'fps': fps,
+                 'resize': self.resize, 'frames': frames}
+        tmp_index = index_path.with_suffix('.json.tmp')
+        tmp_index.write_text(json.dumps(index))
+        os.replace(tmp_index, index_path)  # Index appears last: its presence marks a complete entry
@@ -0,0 +1,26 @@
+"""Captured frame envelope: pixels plus capture-time metadata for tracing."""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+
+# @dataclass: Auto-generates __init__, __repr__, __eq__ methods
+# Why: Timestamps must be taken at capture, not at publish time, to measure
+# glass-to-event latency; the envelope carries them through every stage.
+@dataclass
+class CapturedFrame:
+    """Decoded frame with its capture timestamp and trace identifiers."""
+    image: np.ndarray  # BGR pixels (HxWx3)
+    frame_id: int  # Position in the source (frame index for files, read count for live)
+    captured_at: float = field(default_factory=time.monotonic)  # Monotonic clock, for latency
+    captured_wall: datetime = field(default_factory=datetime.utcnow)  # Wall clock, for events
+    # default_factory: called per instance -> every frame gets its own trace id
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def age(self) -> float:
+        """Seconds elapsed since capture."""
+        return time.monotonic() - self.captured_at
@@ -0,0 +1,95 @@
+"""Latest-frame-wins capture for live sources (bounded latency under overload)."""
+
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+# Sentinel object: marks the slot as empty (no unread frame)
+_EMPTY = object()
+
+
+# Single-Slot Mailbox Pattern: capture thread overwrites, consumer takes newest
+# Why: When detection is slower than the camera, queued frames only add latency.
+# Keeping just the newest frame bounds lag to ~1 frame and counts what was skipped.
+class LatestFrameReader:
+    """
+    Iterate only the freshest frame of a live stream.
+
+    A capture thread reads continuously; every frame the consumer did not
+    pick up before the next one arrived is dropped and counted.
+    """
+
+    def __init__(self, frames: Iterable[Any], on_drop: Callable[[Any], None] | None = None):
+        """
+        Args:
+            frames: Frame iterator to run on the capture thread (e.g. a generator)
+            on_drop: Called with each discarded item (e.g. to recycle its buffer)
+        """
+        self.frames = frames
+        self.on_drop = on_drop
+        self.captured = 0  # Frames read from the source
+        self.dropped = 0  # Frames overwritten before the consumer saw them
+        self._latest: Any = _EMPTY
+        self._done = False
+        self._stop = False
+        self._error: BaseException | None = None
+        # Condition: lock + wait/notify, lets the consumer sleep until a frame arrives
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._capture_loop, name="frame-live", daemon=True)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Start the capture thread and yield the newest frame each time."""
+        self._thread.start()
+        try:
+            while True:
+                with self._cond:
+                    while self._latest is _EMPTY and not self._done:
+                        self._cond.wait()
+                    if self._latest is _EMPTY:
+                        break  # Source finished and last frame already consumed
+                    item, self._latest = self._latest, _EMPTY  # Take ownership, empty slot
+                yield item
+
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.close()
+
+    def close(self, timeout: float = 2.0):
+        """Stop the capture thread, wait for it to release the source, drop the unread frame."""
+        with self._cond:
+            self._stop = True
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        with self._cond:
+            unread, self._latest = self._latest, _EMPTY
+        if unread is not _EMPTY and self.on_drop:
+            self.on_drop(unread)  # Consumer stopped early: nobody will read it
+
+    def _capture_loop(self):
+        """Capture thread body: keep overwriting the slot with the newest frame."""
+        try:
+            for item in self.frames:
+                with self._cond:
+                    if self._stop:
+                        stale = item  # Read after the consumer left: nobody will see it
+                    else:
+                        stale = self._latest
+                        if stale is not _EMPTY:
+                            self.dropped += 1  # Consumer fell behind: discard stale frame
+                        self._latest = item
+                        self.captured += 1
+                        self._cond.notify()
+                if stale is not _EMPTY and self.on_drop:
+                    self.on_drop(stale)  # Outside the lock: callback may block
+                if stale is item:
+                    break  # Consumer stopped
+        except Exception as e:  # noqa: BLE001 - re-raised on the consumer thread
+            self._error = e
+        finally:
+            close = getattr(self.frames, "close", None)
+            if close:
+                close()  # Release the capture on the thread that used it
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
@@ -0,0 +1,132 @@
+"""Multi-camera capture: N sources multiplexed into one frame stream."""
+
+import logging
+import queue
+import threading
+from collections.abc import Iterator
+
+import numpy as np
+
+from .capture import capture_frames
+from .frame_pool import FramePool
+from .frames import CapturedFrame
+
+logger = logging.getLogger(__name__)
+
+
+# Multiplexer Pattern: one reader thread per camera, one merged output stream
+# Why: A single pipeline process (one YOLO model in memory) can serve a whole
+# aisle instead of one process per camera, each loading its own weights.
+class MultiSourceCapture:
+    """
+    Read several video sources concurrently and yield frames as they arrive.
+
+    Yields (camera_id, timestamp, frame) tuples where timestamp is the
+    time.monotonic() value taken right after the frame was decoded.
+    A camera that fails to open is logged and skipped; the others keep running.
+    """
+
+    def __init__(
+        self,
+        sources: dict[str, int | str],  # camera_id -> camera index / file / URL
+        max_frames: int = 0,  # Per camera (0 = unlimited)
+        queue_size: int = 8,  # Frames buffered across all cameras
+        live: bool = False,  # Latest-frame-wins per camera (drop instead of lag)
+        pool: FramePool | None = None,  # Shared buffer pool (caller releases frames)
+        frame_stride: int = 1,  # Per camera: process every Nth frame
+        target_fps: float | None = None,  # Per camera: derive stride from source fps
+        max_reconnects: int = 5,  # Per camera: reconnect attempts before the camera is dropped
+        resize: tuple[int, int] | None = None  # (width, height) applied after decode
+    ):
+        if not sources:
+            raise ValueError("MultiSourceCapture needs at least one source")
+
+        self.sources = sources
+        self.max_frames = max_frames
+        self.live = live
+        self.pool = pool
+        self.frame_stride = frame_stride
+        self.target_fps = target_fps
+        self.max_reconnects = max_reconnects
+        self.resize = resize
+        self.frame_counts = {camera_id: 0 for camera_id in sources}
+        self.errors: dict[str, Exception] = {}
+        # Per-camera stats dicts filled in by capture_frames (drops, reconnects, read latency)
+        self.camera_stats = {camera_id: {'frames_dropped': 0} for camera_id in sources}
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(
+                target=self._read_camera, args=(camera_id, source),
+                name=f"camera-{camera_id}", daemon=True
+            )
+            for camera_id, source in sources.items()
+        ]
+
+    @property
+    def frames_dropped(self) -> int:
+        """Frames skipped by live-mode cameras, summed over all cameras."""
+        return sum(stats['frames_dropped'] for stats in self.camera_stats.values())
+
+    @property
+    def reconnects(self) -> int:
+        """Source reconnections, summed over all cameras."""
+        return sum(stats.get('reconnects', 0) for stats in self.camera_stats.values())
+
+    def __iter__(self) -> Iterator[tuple[str, float, np.ndarray]]:
+        """Start one reader thread per camera and yield frames in arrival order."""
+        for camera_id, captured in self.iter_captured():
+            yield camera_id, captured.captured_at, captured.image
+
+    def iter_captured(self) -> Iterator[tuple[str, CapturedFrame]]:
+        """Like iterating the capture, but yield full CapturedFrame envelopes (for tracing)."""
+        for thread in self._threads:
+            thread.start()
+
+        active = len(self._threads)
+        try:
+            while active > 0:
+                camera_id, captured = self._queue.get()
+                if captured is None:  # (camera_id, None) = camera finished
+                    active -= 1
+                    continue
+                yield camera_id, captured
+        finally:
+            self.close()
+
+    def close(self, timeout: float = 2.0):
+        """Stop all reader threads."""
+        self._stop.set()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def _read_camera(self, camera_id: str, source: int | str):
+        """Reader thread body for one camera."""
+        frames = capture_frames(
+            source, self.max_frames, live=self.live,
+            stats=self.camera_stats[camera_id], pool=self.pool,
+            frame_stride=self.frame_stride, target_fps=self.target_fps,
+            max_reconnects=self.max_reconnects, resize=self.resize
+        )
+        try:
+            for captured in frames:
+                if not self._put((camera_id, captured)):
+                    break
+                self.frame_counts[camera_id] += 1
+        except Exception as e:  # noqa: BLE001 - one camera failing must not stop the others
+            self.errors[camera_id] = e
+            logger.warning(f"Camera {camera_id} ({source}) stopped: {e}")
+        finally:
+            frames.close()  # Release the capture on this thread
+            self._put((camera_id, None))
+
+    def _put(self, item: tuple) -> bool:
+        """Blocking put that gives up once the consumer has stopped."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
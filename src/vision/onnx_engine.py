@@ -0,0 +1,206 @@
+"""ONNX Runtime CPU backend: cached YOLO exports, letterbox preprocessing, NumPy NMS."""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .boxes import nms
+from .frame_cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+EXPORT_VERSION = 2  # Bump when export arguments change (old entries are ignored)
+LETTERBOX_COLOR = 114  # Grey padding, same as ultralytics preprocessing
+
+
+def letterbox(image: np.ndarray, size: int) -> tuple[np.ndarray, float, tuple[int, int]]:
+    """
+    Resize keeping the aspect ratio and pad to a size x size square.
+
+    Returns:
+        (padded image, scale, (pad_x, pad_y)) - model pixel = frame pixel * scale + pad
+    """
+    height, width = image.shape[:2]
+    scale = min(size / height, size / width)
+    new_w, new_h = round(width * scale), round(height * scale)
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    padded = np.full((size, size, 3), LETTERBOX_COLOR, dtype=np.uint8)
+    if (new_w, new_h) != (width, height):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    padded[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = image
+    return padded, scale, (pad_x, pad_y)
+
+
+def decode_predictions(
+    output: np.ndarray,
+    conf_threshold: float,
+    iou_threshold: float,
+    scale: float,
+    pad: tuple[int, int],
+    frame_shape: tuple[int, ...],
+    max_det: int = 300
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn raw YOLOv8 output into boxes in frame pixels.
+
+    Args:
+        output: (4 + classes, anchors) array: cx, cy, w, h rows then one score row per class
+        conf_threshold: Minimum class score
+        iou_threshold: Class-aware NMS threshold
+        scale, pad: Letterbox transform used for the input
+        frame_shape: Original frame shape (boxes are clipped to it)
+        max_det: Maximum boxes kept after NMS
+
+    Returns:
+        (boxes (N, 4) float32 xyxy, scores (N,), class_ids (N,))
+    """
+    class_scores = output[4:]
+    class_ids = class_scores.argmax(axis=0)
+    scores = class_scores.max(axis=0)
+    keep = scores > conf_threshold  # Most of the ~8400 anchors go here, before any box math
+    cx, cy, w, h = output[:4, keep]
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    scores, class_ids = scores[keep], class_ids[keep]
+
+    kept = nms(boxes, scores, iou_threshold, class_ids, max_det)
+    pad_x, pad_y = pad
+    boxes = (boxes[kept] - np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)) / scale
+    height, width = frame_shape[:2]
+    np.clip(boxes, 0, [width, height, width, height], out=boxes)
+    return boxes, scores[kept], class_ids[kept]
+
+
+def int8_path(fp32_path: Path) -> Path:
+    """Where the INT8 model calibrated from an FP32 export is stored (same directory)."""
+    return fp32_path.with_name(f"{fp32_path.stem}-int8.onnx")
+
+
+def export_path(weights: str, imgsz: int, cache_dir: str) -> Path:
+    """
+    Cache path of the ONNX export of local `weights` at `imgsz` (may not exist yet).
+
+    Entries are keyed by the weights file hash and the input size, so retrained
+    weights saved under the same name get a fresh export.
+    """
+    settings = json.dumps({'version': EXPORT_VERSION, 'imgsz': imgsz})
+    key = hashlib.sha256(f"{file_digest(weights)}:{settings}".encode()).hexdigest()[:32]
+    return Path(cache_dir) / f"{Path(weights).stem}-{imgsz}-{key[:12]}.onnx"
+
+
+def export_onnx(weights: str, imgsz: int, cache_dir: str) -> Path:
+    """Path of the ONNX export of `weights` at `imgsz`, exporting on a cache miss."""
+    if not os.path.isfile(weights):
+        from ultralytics import YOLO
+        weights = YOLO(weights).ckpt_path  # Model name: ultralytics downloads the weights
+    target = export_path(weights, imgsz, cache_dir)
+    if target.exists():
+        return target
+
+    from ultralytics import YOLO  # Only a cache miss pays for torch and the export
+    logger.info(f"Exporting {weights} to ONNX (imgsz {imgsz}) -> {target}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # dynamic=True: free batch axis, so a batch of frames is one session.run
+    exported = YOLO(weights).export(format='onnx', imgsz=imgsz, dynamic=True, verbose=False)
+    tmp = target.with_suffix('.onnx.tmp')
+    shutil.move(exported, tmp)  # Export is written next to the weights: move it into the cache
+    os.replace(tmp, target)  # Rename last: a crashed export never leaves a partial entry
+    return target
+
+
+# Adapter Pattern: same names/predict surface FruitDetector uses for any engine
+# Why: ONNX Runtime on CPU runs YOLO faster than eager PyTorch, and a cached
+# export skips building the torch model at startup.
+class OnnxEngine:
+    """YOLOv8 ONNX model on the ONNX Runtime CPU execution provider."""
+
+    def __init__(self, model_path: str, threads: int = 0):
+        """
+        Args:
+            model_path: ONNX export, input (batch, 3, imgsz, imgsz); a fixed
+                batch of 1 (static export) runs batches frame by frame
+            threads: Intra-op threads (0 = runtime default, all cores)
+        """
+        try:
+            import onnxruntime as ort  # Optional dependency, only needed for this engine
+        except ImportError as e:
+            raise ImportError("ONNX engine needs onnxruntime: pip install onnxruntime") from e
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=['CPUExecutionProvider']
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # ultralytics stores class names and imgsz as literal strings in the model metadata
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names: dict[int, str] = ast.literal_eval(metadata['names'])
+        # Dynamic axes are named ('batch', 'height'), fixed ones are ints
+        height = model_input.shape[2]
+        self.imgsz = height if isinstance(height, int) else ast.literal_eval(metadata['imgsz'])[0]
+        self.batched = not isinstance(model_input.shape[0], int)
+
+    @classmethod
+    def from_weights(
+        cls,
+        weights: str,
+        imgsz: int = 640,
+        cache_dir: str = "data/cache/models",
+        threads: int = 0,
+        precision: str = "fp32"
+    ) -> "OnnxEngine":
+        """
+        Load an .onnx file directly, or export .pt weights through the cache.
+        
+        precision "int8" loads the model produced by the calibrate command for
+        the cached export of these weights.
+        """
+        if str(weights).endswith('.onnx'):
+            return cls(weights, threads)
+        path = export_onnx(weights, imgsz, cache_dir)
+        if precision == "int8":
+            path = int8_path(path)
+            if not path.exists():
+                raise ValueError(
+                    f"No INT8 model at {path}: run `python -m src.main calibrate` first"
+                )
+        return cls(path, threads)
+
+    def predict(
+        self,
+        frame: np.ndarray,
+        conf_threshold: float = 0.25,
+        iou_threshold: float = 0.7
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Detect in one BGR frame; returns (boxes, scores, class_ids) in frame pixels."""
+        return self.predict_batch([frame], conf_threshold, iou_threshold)[0]
+
+    def predict_batch(
+        self,
+        frames: list[np.ndarray],
+        conf_threshold: float = 0.25,
+        iou_threshold: float = 0.7
+    ) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Detect in several BGR frames with one forward pass (per frame on static exports)."""
+        letterboxed = [letterbox(frame, self.imgsz) for frame in frames]
+        # blobFromImages: BGR HWC uint8 -> one RGB NCHW float32 batch in [0, 1], one C++ pass
+        blob = cv2.dnn.blobFromImages(
+            [padded for padded, _, _ in letterboxed], 1 / 255, swapRB=True
+        )
+        if self.batched:
+            outputs = self.session.run(None, {self.input_name: blob})[0]
+        else:
+            outputs = [self.session.run(None, {self.input_name: image[None]})[0][0]
+                       for image in blob]
+        return [
+            decode_predictions(output, conf_threshold, iou_threshold, scale, pad, frame.shape)
+            for output, frame, (_, scale, pad) in zip(outputs, frames, letterboxed)
+        ]
@@ -0,0 +1,104 @@
+"""Background frame prefetching to overlap video decode with inference."""
+
+import queue  # Thread-safe FIFO queues (blocking put/get)
+import threading
+
+# Iterator[T]: Type hint for any object usable in a for-loop that yields T
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+# Sentinel object: unique marker for "end of stream" (can never be a real frame)
+_END_OF_STREAM = object()
+
+
+# Producer-Consumer Pattern: decoder thread produces frames, caller consumes them
+# Why: cv2 decode releases the GIL, so decoding frame N+1 overlaps YOLO on frame N
+class PrefetchReader:
+    """
+    Iterate frames that are decoded ahead of time on a background thread.
+
+    The decoder thread fills a bounded queue (ring buffer of `depth` frames).
+    When the buffer is full the decoder blocks, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        frames: Iterable[Any],
+        depth: int = 4,
+        on_drop: Callable[[Any], None] | None = None
+    ):
+        """
+        Args:
+            frames: Frame iterator to run on the decoder thread (e.g. a generator)
+            depth: Max number of decoded frames buffered ahead of the consumer
+            on_drop: Called with each item the consumer never received (it stopped
+                early), e.g. to recycle its buffer
+        """
+        if depth < 1:
+            raise ValueError(f"Prefetch depth must be >= 1, got {depth}")
+
+        self.frames = frames
+        self.depth = depth
+        self.on_drop = on_drop
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)  # Bounded = backpressure
+        self._stop = threading.Event()  # Set by consumer to ask the decoder to exit
+        self._error: BaseException | None = None  # Re-raised on the consumer side
+        # daemon=True: thread never blocks interpreter shutdown
+        self._thread = threading.Thread(
+            target=self._decode_loop, name="frame-prefetch", daemon=True
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        """Start the decoder thread and yield buffered frames in order."""
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _END_OF_STREAM:
+                    break
+                yield item
+
+            if self._error is not None:
+                raise self._error  # Surface decoder errors (e.g. cannot open source)
+        finally:
+            self.close()  # Runs on break/exception too (generator close)
+
+    def close(self, timeout: float = 2.0):
+        """Stop the decoder thread, wait for it to release the source, drop unread items."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _END_OF_STREAM and self.on_drop:
+                self.on_drop(item)
+
+    def _decode_loop(self):
+        """Decoder thread body: drain the frame iterator into the queue."""
+        try:
+            for item in self.frames:
+                if not self._put(item):
+                    if self.on_drop:
+                        self.on_drop(item)
+                    break  # Consumer went away
+        except Exception as e:  # noqa: BLE001 - re-raised on the consumer thread
+            self._error = e
+        finally:
+            # Close generator on THIS thread so cap.release() runs where cap is used
+            close = getattr(self.frames, "close", None)
+            if close:
+                close()
+            self._put(_END_OF_STREAM)
+
+    def _put(self, item: Any) -> bool:
+        """Blocking put that gives up once the consumer has stopped."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue  # Buffer full: wait for consumer, re-check stop flag
+        return False
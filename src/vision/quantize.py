@@ -0,0 +1,186 @@
+"""Static INT8 quantization of the ONNX detector, calibrated on frames from our own videos."""
+
+import logging
+import os
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .boxes import match_count
+from .capture import capture_frames, get_video_props
+from .onnx_engine import OnnxEngine, letterbox
+
+logger = logging.getLogger(__name__)
+
+try:  # Optional dependency: only the calibrate command needs it
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+except ImportError:
+    CalibrationDataReader = object  # Lets the reader class below still be defined
+    quantize_static = None
+
+# Ops that stay FP32: box decoding mixes pixel coordinates (0..640) and class
+# scores (0..1) in one Concat, and a single INT8 scale for both destroys the scores
+HEAD_OPS = {"Add", "Sub", "Mul", "Div", "Concat", "Sigmoid", "Split", "Slice", "Reshape",
+            "Transpose", "Softmax"}
+
+
+def sample_frames(sources: Sequence[str], count: int) -> list[np.ndarray]:
+    """
+    Frames spread evenly over each video (count split across the sources).
+
+    Skipped frames are grabbed, not decoded (capture_frames frame_stride).
+    """
+    if count < 1:
+        raise ValueError(f"Frame count must be >= 1, got {count}")
+    frames = []
+    per_source = -(-count // len(sources))  # Ceiling division
+    for source in sources:
+        total = get_video_props(source)['frame_count']
+        if total <= 0:
+            raise ValueError(f"Calibration needs video files with a frame count, got: {source}")
+        stride = max(1, total // per_source)
+        frames += [f.image for f in capture_frames(source, per_source, frame_stride=stride)]
+    return frames[:count]
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds letterboxed frames to the ONNX Runtime calibrator, one at a time."""
+
+    def __init__(self, frames: Sequence[np.ndarray], input_name: str, imgsz: int):
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._frames = iter(frames)
+
+    def get_next(self) -> dict | None:
+        """Next model input, or None when all frames were used (calibrator protocol)."""
+        frame = next(self._frames, None)
+        if frame is None:
+            return None
+        padded, _, _ = letterbox(frame, self.imgsz)
+        return {self.input_name: cv2.dnn.blobFromImage(padded, 1 / 255, swapRB=True)}
+
+
+def quantize_int8(fp32_path: Path, frames: Sequence[np.ndarray], output_path: Path) -> Path:
+    """
+    Statically quantize an FP32 ONNX export to INT8 (QDQ, per-channel weights).
+
+    Activation ranges come from running `frames` through the FP32 model. The
+    detection head (box decoding after the last convolutions) stays FP32.
+    """
+    if quantize_static is None:
+        raise ImportError("INT8 calibration needs onnxruntime and onnx: pip install -e '.[onnx]'")
+    import onnx
+
+    model = onnx.load(str(fp32_path))
+    engine = OnnxEngine(fp32_path)
+    tmp = output_path.with_suffix('.onnx.tmp')
+    logger.info(f"Calibrating {fp32_path} on {len(frames)} frames -> {output_path}")
+    quantize_static(
+        str(fp32_path), str(tmp),
+        FrameCalibrationReader(frames, engine.input_name, engine.imgsz),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        nodes_to_exclude=_head_nodes(model)
+    )
+    # Keep the class names (and other export metadata) the engine reads at load time
+    quantized = onnx.load(str(tmp))
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(model.metadata_props)
+    onnx.save(quantized, str(tmp))
+    os.replace(tmp, output_path)  # Rename last: a failed run never leaves a partial model
+    return output_path
+
+
+def _head_nodes(model) -> list[str]:
+    """Nodes between the model output and the last convolutions (walked backwards)."""
+    producers = {out: node for node in model.graph.node for out in node.output}
+    pending = [output.name for output in model.graph.output]
+    head = []
+    while pending:
+        node = producers.get(pending.pop())
+        if node is None or node.op_type not in HEAD_OPS or node.name in head:
+            continue  # Graph input, initializer, convolution or already visited
+        head.append(node.name)
+        pending.extend(node.input)
+    return head
+
+
+def compare_models(
+    fp32_model: Path,
+    int8_model: Path,
+    frames: Sequence[np.ndarray],
+    conf_threshold: float = 0.3,
+    iou_threshold: float = 0.5
+) -> dict:
+    """
+    FP32 vs INT8 report on held-out frames.
+
+    Agreement treats FP32 detections as the reference: recall is the share of
+    FP32 boxes matched by a same-class INT8 box with IoU >= iou_threshold.
+
+    Returns:
+        {'fp32': {...}, 'int8': {...}, 'agreement': {...}}, latencies in ms, sizes in MB
+    """
+    report, outputs = {}, {}
+    for name, path in (('fp32', fp32_model), ('int8', int8_model)):
+        rss_before = _rss_mb()
+        engine = OnnxEngine(path)
+        engine.predict(frames[0], conf_threshold)  # Warm-up: allocations, kernel selection
+        timings, outputs[name] = [], []
+        for frame in frames:
+            start = time.perf_counter()
+            outputs[name].append(engine.predict(frame, conf_threshold))
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p95 = np.percentile(timings, [50, 95])
+        report[name] = {
+            'latency_p50_ms': round(float(p50), 2),
+            'latency_p95_ms': round(float(p95), 2),
+            'model_mb': round(Path(path).stat().st_size / 1e6, 2),
+            'rss_growth_mb': round(_rss_mb() - rss_before, 1),
+            'detections': sum(len(ids) for _, _, ids in outputs[name])
+        }
+        del engine  # Release the session before loading the next model
+
+    matched = 0
+    for (ref_boxes, _, ref_ids), (boxes, _, ids) in zip(outputs['fp32'], outputs['int8']):
+        matched += match_count(ref_boxes, boxes, iou_threshold, ref_ids[:, None] == ids[None, :])
+    reference, candidate = report['fp32']['detections'], report['int8']['detections']
+    report['agreement'] = {
+        'iou_threshold': iou_threshold,
+        'matched': matched,
+        'recall': round(matched / reference, 4) if reference else 1.0,
+        'precision': round(matched / candidate, 4) if candidate else 1.0,
+        'speedup': round(report['fp32']['latency_p50_ms'] / report['int8']['latency_p50_ms'], 2)
+    }
+    return report
+
+
+def iter_report_lines(report: dict) -> Iterator[str]:
+    """Human-readable lines for a compare_models report."""
+    for name in ('fp32', 'int8'):
+        stats = report[name]
+        yield (f"{name.upper()}: p50 {stats['latency_p50_ms']} ms, "
+               f"p95 {stats['latency_p95_ms']} ms, model {stats['model_mb']} MB, "
+               f"RSS +{stats['rss_growth_mb']} MB, {stats['detections']} detections")
+    agreement = report['agreement']
+    yield (f"Agreement (IoU >= {agreement['iou_threshold']}): recall {agreement['recall']}, "
+           f"precision {agreement['precision']}, speedup x{agreement['speedup']}")
+
+
+def _rss_mb() -> float:
+    """Current resident memory of this process in MB (0.0 where /proc is missing)."""
+    try:
+        with open('/proc/self/statm') as f:  # Fields in pages: size, resident, ...
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return 0.0
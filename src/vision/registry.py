@@ -0,0 +1,69 @@
+"""Process-wide model registry: each model is loaded and warmed up once per process."""
+
+import logging
+import os
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+# Registry (Flyweight) Pattern: one shared model object per configuration
+# Why: YOLO weights are tens of MB and the first inference pays lazy initialization
+# (layer fusion, allocator warm-up); every detector in the process should pay once.
+class ModelRegistry:
+    """
+    Loaded models keyed by their configuration (e.g. model, engine, input size).
+
+    Handles are shared: callers must not run inference on the same handle
+    from several threads at once. Warm-up is tracked per process, so a child
+    forked after the weights were loaded warms up its own thread pools.
+    """
+
+    def __init__(self):
+        self._models: dict[Hashable, Any] = {}
+        self._warmed: set[tuple[Hashable, int]] = set()  # (key, pid)
+        self._lock = threading.Lock()  # Two threads asking for one model load it once
+
+    def get(
+        self,
+        key: Hashable,
+        load: Callable[[], Any],
+        warmup: Callable[[Any], Any] | None = None,
+        warmup_runs: int = 1
+    ) -> Any:
+        """
+        Shared model for `key`, loading it with `load()` on first use.
+
+        Args:
+            key: Hashable model configuration
+            load: Builds the model (called at most once per key)
+            warmup: Runs one dummy inference on the model
+            warmup_runs: Warm-up inferences per process (0 = none)
+        """
+        with self._lock:
+            if key not in self._models:
+                logger.info(f"Loading model {key}")
+                self._models[key] = load()
+            model = self._models[key]
+            if warmup and warmup_runs and (key, os.getpid()) not in self._warmed:
+                for _ in range(warmup_runs):
+                    warmup(model)
+                self._warmed.add((key, os.getpid()))
+        return model
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def clear(self):
+        """Drop all models (tests, or freeing memory after a reconfiguration)."""
+        with self._lock:
+            self._models.clear()
+            self._warmed.clear()
+
+
+MODEL_REGISTRY = ModelRegistry()  # Module global = one registry per process
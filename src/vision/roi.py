@@ -0,0 +1,109 @@
+"""Shelf regions of interest: detect inside a polygon instead of the whole frame."""
+
+from collections.abc import Sequence
+
+import cv2
+import numpy as np
+
+from .detect import Detection, DetectionBatch, FruitDetector, as_batch
+
+DEFAULT_ROI_KEY = "default"  # Settings key for the single-source pipeline (no camera_id)
+
+
+# Why: shelf cameras also see ceiling, aisle floor and price rails; YOLO cost scales
+# with input pixels, so cropping to the shelf cuts latency and removes false positives.
+class ShelfROI:
+    """
+    Polygon region of a camera image.
+
+    Detection runs on the polygon's bounding rectangle (a crop view, no copy);
+    boxes are mapped back to frame coordinates and kept only when their centre
+    lies inside the polygon.
+    """
+
+    def __init__(self, polygon: Sequence[Sequence[int]]):
+        """
+        Args:
+            polygon: Vertices [(x, y), ...] in frame pixels (at least 3)
+        """
+        self.polygon = np.asarray(polygon, dtype=np.int32).reshape(-1, 2)
+        if len(self.polygon) < 3:
+            raise ValueError(f"ROI polygon needs at least 3 points, got {len(self.polygon)}")
+        self._mask: np.ndarray | None = None  # Polygon mask in frame coordinates
+        self._rect: tuple[int, int, int, int] = (0, 0, 0, 0)
+
+    def rect(self, frame_shape: tuple[int, ...]) -> tuple[int, int, int, int]:
+        """Bounding rectangle (x1, y1, x2, y2) of the polygon, clipped to the frame."""
+        self._prepare(frame_shape)
+        return self._rect
+
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """Bounding-rectangle view of the frame (slicing shares memory, nothing is copied)."""
+        x1, y1, x2, y2 = self.rect(frame.shape)
+        return frame[y1:y2, x1:x2]
+
+    def crop_mask(self, frame_shape: tuple[int, ...]) -> np.ndarray:
+        """Polygon mask over the crop() rectangle (non-zero = inside the shelf)."""
+        self._prepare(frame_shape)
+        return self.crop(self._mask)
+
+    def to_frame(self, detections: Sequence[Detection]) -> DetectionBatch:
+        """Shift boxes found in the crop back to frame coordinates."""
+        x1, y1 = self._rect[:2]
+        return as_batch(detections).translate(x1, y1)
+
+    def contains(self, detections: Sequence[Detection]) -> np.ndarray:
+        """Boolean array: is each detection's centre inside the polygon? (mask lookup)"""
+        if not len(detections) or self._mask is None:
+            return np.zeros(len(detections), dtype=bool)
+        boxes = as_batch(detections).boxes
+        cx = np.clip((boxes[:, 0] + boxes[:, 2]) // 2, 0, self._mask.shape[1] - 1)
+        cy = np.clip((boxes[:, 1] + boxes[:, 3]) // 2, 0, self._mask.shape[0] - 1)
+        return self._mask[cy, cx] > 0
+
+    def detect(self, detector: FruitDetector, frame: np.ndarray) -> DetectionBatch:
+        """Detect on the crop, map boxes to the frame and drop those outside the polygon."""
+        return self.restore(detector.detect(self.crop(frame), self.crop_mask(frame.shape)))
+
+    def restore(self, crop_detections: Sequence[Detection]) -> DetectionBatch:
+        """Map detections made on crop() to the frame and keep those inside the polygon."""
+        detections = self.to_frame(crop_detections)
+        return detections[self.contains(detections)]  # Boolean mask -> filtered batch
+
+    def _prepare(self, frame_shape: tuple[int, ...]):
+        """Rasterize the polygon once per frame size."""
+        height, width = frame_shape[:2]
+        if self._mask is not None and self._mask.shape == (height, width):
+            return
+        self._mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(self._mask, [self.polygon], 255)
+        x, y, w, h = cv2.boundingRect(self.polygon)
+        self._rect = (max(0, x), max(0, y), min(width, x + w), min(height, y + h))
+
+
+def roi_for_camera(
+    rois: dict[str, Sequence[Sequence[int]]],
+    camera_id: str | None
+) -> ShelfROI | None:
+    """ROI configured for a camera (single-source pipeline uses the "default" key)."""
+    polygon = rois.get(camera_id if camera_id is not None else DEFAULT_ROI_KEY)
+    return ShelfROI(polygon) if polygon else None
+
+
+def detect_in_rois(
+    detector: FruitDetector,
+    frames: list[np.ndarray],
+    rois: list[ShelfROI | None]
+) -> list[Sequence[Detection]]:
+    """Batched detection where each frame may have its own ROI (None = full frame)."""
+    inputs = [roi.crop(frame) if roi else frame for frame, roi in zip(frames, rois)]
+    # Masks let a tiled detector skip tiles that hold no shelf pixels
+    masks = [roi.crop_mask(frame.shape) if roi else None for frame, roi in zip(frames, rois)]
+    if len(inputs) == 1:
+        batch_detections = [detector.detect(inputs[0], masks[0])]
+    else:
+        batch_detections = detector.detect_batch(inputs, masks)
+    return [
+        roi.restore(detections) if roi else detections
+        for detections, roi in zip(batch_detections, rois)
+    ]
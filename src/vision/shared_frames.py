@@ -0,0 +1,116 @@
+"""Shared-memory ring of frame slots for zero-copy frame transport between processes."""
+
+import multiprocessing as mp
+import queue
+from collections.abc import Iterator
+from multiprocessing import shared_memory  # Named OS shared memory blocks (Python 3.8+)
+
+import numpy as np
+
+# Sentinel slot index: producer finished, no more frames
+_END_OF_STREAM = -1
+
+
+# Ring Buffer + Ownership Handoff Pattern:
+# - One shared memory block split into fixed-size slots (no pickling of pixel data)
+# - free queue: slot indexes the producer may write (consumer -> producer)
+# - ready queue: (slot, shape, frame_index) the consumer may read (producer -> consumer)
+# Only small tuples travel through the queues; frames stay in shared memory.
+class SharedFrameRing:
+    """
+    Pass frames between processes through shared memory.
+
+    Create the ring in the parent, then hand it to child processes as a
+    multiprocessing.Process argument (queues must be inherited, not pickled later).
+
+    Producer:  ring.write(frame) ... ring.finish()
+    Consumer:  for slot, frame, index in ring.frames(): ...; ring.release(slot)
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        max_frame_shape: tuple[int, int, int],
+        dtype: type = np.uint8,
+        context: mp.context.BaseContext | None = None  # e.g. mp.get_context("spawn")
+    ):
+        """
+        Args:
+            slots: Number of frames that can be in flight at once
+            max_frame_shape: Largest (height, width, channels) a slot must hold
+            dtype: Pixel type
+            context: Multiprocessing context used to start the worker processes
+        """
+        if slots < 1:
+            raise ValueError(f"Shared frame ring needs at least 1 slot, got {slots}")
+
+        self.slots = slots
+        self.dtype = np.dtype(dtype)
+        self.slot_bytes = int(np.prod(max_frame_shape)) * self.dtype.itemsize
+        # create=True allocates; child processes re-attach by name when unpickled
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        context = context or mp.get_context()  # Queues must match the Process start method
+        self._free: mp.Queue = context.Queue()
+        self._ready: mp.Queue = context.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+        self._written = 0  # Producer-side frame counter
+
+    @property
+    def name(self) -> str:
+        """OS name of the shared memory block."""
+        return self._shm.name
+
+    def slot_view(self, slot: int, shape: tuple[int, ...]) -> np.ndarray:
+        """Wrap a slot as an ndarray (zero-copy view into shared memory)."""
+        if int(np.prod(shape)) * self.dtype.itemsize > self.slot_bytes:
+            raise ValueError(f"Frame shape {shape} exceeds slot size of {self.slot_bytes} bytes")
+        offset = slot * self.slot_bytes
+        return np.ndarray(shape, dtype=self.dtype, buffer=self._shm.buf, offset=offset)
+
+    def write(self, frame: np.ndarray, timeout: float | None = None) -> int:
+        """
+        Copy a frame into a free slot and hand it to the consumers.
+
+        Blocks while every slot is owned by a consumer (backpressure).
+        Returns the frame index assigned to this frame.
+        """
+        slot = self._free.get(timeout=timeout)
+        np.copyto(self.slot_view(slot, frame.shape), frame)
+        index = self._written
+        self._ready.put((slot, frame.shape, index))
+        self._written += 1
+        return index
+
+    def finish(self, consumers: int = 1):
+        """Signal end of stream (one marker per consumer process)."""
+        for _ in range(consumers):
+            self._ready.put((_END_OF_STREAM, None, None))
+
+    def frames(self, timeout: float | None = None) -> Iterator[tuple[int, np.ndarray, int]]:
+        """
+        Yield (slot, frame, frame_index) until the producer calls finish().
+
+        `frame` aliases shared memory: call release(slot) once done with it,
+        and copy it first if it must outlive the slot.
+        """
+        while True:
+            try:
+                slot, shape, index = self._ready.get(timeout=timeout)
+            except queue.Empty:
+                return  # Producer stalled or died
+            if slot == _END_OF_STREAM:
+                return
+            yield slot, self.slot_view(slot, shape), index
+
+    def release(self, slot: int):
+        """Give a slot back to the producer."""
+        self._free.put(slot)
+
+    def close(self):
+        """Detach this process from the shared memory block."""
+        self._shm.close()
+
+    def unlink(self):
+        """Destroy the shared memory block (creator only, after all processes closed)."""
+        self._shm.unlink()
@@ -0,0 +1,187 @@
+"""Resilient video source: cached property probe and reconnection with backoff."""
+
+import logging
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Properties recorded when a source is opened (so get_video_props never re-opens it):
+# source -> (file signature, props); one entry per source, oldest sources evicted first
+_PROBE_CACHE: dict[int | str, tuple[tuple[int, int] | None, dict]] = {}
+_PROBE_LOCK = threading.Lock()
+PROBE_CACHE_SIZE = 256
+
+
+def normalize_source(source: int | str) -> int | str:
+    """CLI passes camera indexes as strings: "0" -> 0 (OpenCV treats "0" as a file name)."""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+def is_live_source(source: int | str) -> bool:
+    """Camera index, device node or network URL (anything that is not a plain file)."""
+    if isinstance(source, int):
+        return True
+    return "://" in source or source.startswith("/dev/")
+
+
+def cached_props(source: int | str) -> dict | None:
+    """
+    Properties of a source already probed by a VideoSource.
+    
+    None if never opened, or if the file changed on disk since (mtime or size).
+    """
+    source = normalize_source(source)
+    with _PROBE_LOCK:
+        entry = _PROBE_CACHE.get(source)
+    if entry is None or entry[0] != _file_signature(source):
+        return None
+    return entry[1]
+
+
+def _file_signature(source: int | str) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a local file; None for cameras and streams."""
+    if is_live_source(source):
+        return None
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Adapter Pattern: same read()/grab()/retrieve() interface as cv2.VideoCapture,
+# plus reconnection and counters, so capture code works with either object.
+class VideoSource:
+    """
+    cv2.VideoCapture wrapper that survives flaky cameras.
+
+    - Live sources (camera index, RTSP/HTTP URL) reconnect with exponential
+      backoff when reading fails; network URLs also retry the initial open.
+    - Files fail fast: a failed read is end-of-file, not a network hiccup.
+    - Properties (fps, width, height, frame_count) are probed on open and cached.
+    """
+
+    def __init__(
+        self,
+        source: int | str,
+        max_reconnects: int = 5,  # Consecutive reconnect attempts before giving up
+        backoff: float = 0.5,  # Seconds before the first reconnect attempt (doubles each time)
+        max_backoff: float = 30.0  # Upper bound for the wait between attempts
+    ):
+        self.source = normalize_source(source)
+        self.is_live = is_live_source(self.source)
+        self.max_reconnects = max_reconnects if self.is_live else 0
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.reconnects = 0  # Successful reconnections since creation
+        self.frames_read = 0
+        self.read_time = 0.0  # Total seconds spent in read()/grab()
+        self.max_read_latency = 0.0  # Slowest single read (seconds)
+        self._cap: cv2.VideoCapture | None = None
+        self._props: dict = {}  # Probed on every (re)connect, independent of the shared cache
+        # Initial open: retry network streams only; a missing local camera fails fast
+        is_network = isinstance(self.source, str) and "://" in self.source
+        self._connect(self.max_reconnects if is_network else 0)
+
+    @property
+    def props(self) -> dict:
+        """fps/width/height/frame_count probed when the source was (re)opened."""
+        return self._props
+
+    @property
+    def mean_read_latency(self) -> float:
+        """Average seconds per read()/grab()."""
+        return self.read_time / self.frames_read if self.frames_read else 0.0
+
+    def isOpened(self) -> bool:  # camelCase: mirrors the cv2.VideoCapture API
+        return self._cap is not None and self._cap.isOpened()
+
+    def read(self, image: np.ndarray | None = None) -> tuple[bool, np.ndarray | None]:
+        """Grab and decode the next frame (into `image` when given), reconnecting if needed."""
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def grab(self) -> bool:
+        """Advance one frame without converting it, reconnecting live sources on failure."""
+        if self._cap is None:
+            return False  # Reconnection already given up
+        start = time.perf_counter()
+        ok = self._cap.grab()
+        if not ok and self.is_live and self._connect(self.max_reconnects, reconnect=True):
+            ok = self._cap.grab()
+        elapsed = time.perf_counter() - start
+        if ok:
+            self.frames_read += 1
+            self.read_time += elapsed
+            self.max_read_latency = max(self.max_read_latency, elapsed)
+        return ok
+
+    def retrieve(self, image: np.ndarray | None = None) -> tuple[bool, np.ndarray | None]:
+        """Decode the last grabbed frame."""
+        if image is None:
+            return self._cap.retrieve()
+        return self._cap.retrieve(image=image)
+
+    def get(self, prop_id: int) -> float:
+        return self._cap.get(prop_id)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return self._cap.set(prop_id, value)
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def _connect(self, attempts: int, reconnect: bool = False) -> bool:
+        """Open the source, retrying `attempts` times with exponential backoff."""
+        wait = self.backoff
+        for attempt in range(attempts + 1):
+            if attempt > 0:
+                logger.warning(f"Video source {self.source} unavailable, retry "
+                               f"{attempt}/{attempts} in {wait:.1f}s")
+                time.sleep(wait)
+                wait = min(wait * 2, self.max_backoff)
+            self.release()
+            self._cap = cv2.VideoCapture(self.source)
+            if self._cap.isOpened():
+                if reconnect:
+                    self.reconnects += 1
+                self._probe()
+                return True
+
+        self.release()
+        if reconnect:
+            logger.error(f"Video source {self.source} lost after {attempts} reconnect attempts")
+            return False
+        raise ValueError(f"Cannot open video source: {self.source}")
+
+    def _probe(self):
+        """
+        Record properties on (re)connect: later lookups never open the source again.
+        
+        Called on every reconnect, so a camera that comes back with another
+        resolution or frame rate replaces them. The instance keeps its own copy:
+        the shared cache entry goes stale when the file is touched or evicted.
+        """
+        props = {
+            'fps': self._cap.get(cv2.CAP_PROP_FPS) or 25.0,
+            'width': int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'frame_count': int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        }
+        self._props = props
+        signature = _file_signature(self.source)
+        with _PROBE_LOCK:
+            _PROBE_CACHE.pop(self.source, None)  # Re-insert: newest entries last
+            _PROBE_CACHE[self.source] = (signature, props)
+            while len(_PROBE_CACHE) > PROBE_CACHE_SIZE:
+                del _PROBE_CACHE[next(iter(_PROBE_CACHE))]  # dicts keep insertion order
@@ -0,0 +1,50 @@
+"""Overlapping tile grids for detecting small objects in high-resolution frames."""
+
+
+import numpy as np
+
+
+def tile_grid(
+    frame_shape: tuple[int, ...],
+    tile_size: int,
+    overlap: float = 0.2
+) -> list[tuple[int, int, int, int]]:
+    """
+    Tiles (x1, y1, x2, y2) covering the frame, neighbours overlapping by `overlap`.
+
+    All tiles have the same size (the last row/column is aligned to the frame
+    edge), so they can be stacked into one batch. A frame smaller than a tile
+    is a single tile.
+
+    Args:
+        frame_shape: (height, width, ...) of the frame
+        tile_size: Tile side in pixels
+        overlap: Fraction of a tile shared with its neighbour (0 <= overlap < 1)
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError(f"Tile overlap must be in [0, 1), got {overlap}")
+    height, width = frame_shape[:2]
+    step = max(1, int(tile_size * (1 - overlap)))
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in _starts(height, tile_size, step)
+        for x in _starts(width, tile_size, step)
+    ]
+
+
+def tiles_in_mask(
+    tiles: list[tuple[int, int, int, int]],
+    mask: np.ndarray | None
+) -> list[tuple[int, int, int, int]]:
+    """Tiles containing at least one non-zero mask pixel (all tiles when mask is None)."""
+    if mask is None:
+        return tiles
+    return [(x1, y1, x2, y2) for x1, y1, x2, y2 in tiles if mask[y1:y2, x1:x2].any()]
+
+
+def _starts(length: int, tile_size: int, step: int) -> list[int]:
+    """Tile start offsets along one axis; the last tile ends exactly at `length`."""
+    if length <= tile_size:
+        return [0]
+    starts = list(range(0, length - tile_size, step))
+    return starts + [length - tile_size]
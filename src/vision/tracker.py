@@ -0,0 +1,152 @@
+"""Multi-object tracking: stable ids for fruit across frames (IoU or centroid matching)."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import cv2
+import numpy as np
+
+from .boxes import greedy_match, iou_matrix
+from .detect import Detection, as_batch
+
+METRICS = ("iou", "centroid")
+
+
+@dataclass
+class Track:
+    """One physical object followed across frames."""
+    track_id: int
+    bbox: np.ndarray  # (x1, y1, x2, y2) float, last matched box
+    label: str
+    appearance: np.ndarray  # Mean BGR of the box centre when `payload` was last refreshed
+    hits: int = 1  # Frames with a matched detection
+    missed: int = 0  # Consecutive updates without a match
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(4, dtype=np.float32))
+    refresh: bool = True  # New, or appearance changed, in the latest update
+    payload: Any = None  # Caller's per-track result (e.g. its QualityScore)
+
+    def predicted(self) -> np.ndarray:
+        """Box expected in the next frame (constant velocity since the last match)."""
+        return self.bbox + self.velocity * (self.missed + 1)
+
+
+# Why: a static shelf shows the same apple in every frame; with a stable id the
+# pipeline scores and publishes it once, and again only when its look changes.
+class Tracker:
+    """
+    Greedy tracker over a vectorized (tracks x detections) similarity matrix.
+
+    No Kalman filter: tracks keep their last box, optionally extrapolated with a
+    smoothed per-frame velocity (`motion=True`) for fruit moved by shoppers or
+    conveyor footage. Only same-label pairs can match.
+    """
+
+    def __init__(
+        self,
+        metric: str = "iou",
+        iou_threshold: float = 0.3,
+        max_distance: float = 0.5,
+        max_missed: int = 30,
+        motion: bool = False,
+        appearance_threshold: float = 12.0
+    ):
+        """
+        Args:
+            metric: "iou" (box overlap) or "centroid" (centre distance)
+            iou_threshold: Minimum IoU for a match (metric "iou")
+            max_distance: Max centre distance as a fraction of the track's box diagonal
+                (metric "centroid")
+            max_missed: Updates a track survives without a match
+            motion: Extrapolate boxes with a constant-velocity model before matching
+            appearance_threshold: Mean colour change (0-255 levels, any channel) since
+                the last refresh that marks a track for refresh
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown tracking metric '{metric}', use one of {METRICS}")
+        self.metric = metric
+        self.iou_threshold = iou_threshold
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.motion = motion
+        self.appearance_threshold = appearance_threshold
+        self.tracks: list[Track] = []
+        self.created = 0  # Track ids handed out so far (ids are 1, 2, ...)
+
+    def update(self, detections: Sequence[Detection], frame: np.ndarray) -> list[Track]:
+        """
+        Match detections to tracks, start tracks for the rest, age out lost ones.
+
+        Returns:
+            The track of each detection, in detection order. `track.refresh` is
+            True when the track is new or its appearance changed.
+        """
+        batch = as_batch(detections)
+        boxes = batch.boxes.astype(np.float32)
+        labels = batch.labels
+        appearances = _appearance(frame, batch.boxes)
+
+        pairs = greedy_match(*self._similarity(boxes, labels))
+        assigned: list[Track | None] = [None] * len(batch)
+        matched_tracks = set()
+        for t, d in pairs:
+            track = self.tracks[t]
+            if self.motion:
+                step = (boxes[d] - track.bbox) / (track.missed + 1)
+                track.velocity = 0.5 * track.velocity + 0.5 * step  # Smoothed, Kalman-free
+            track.bbox = boxes[d]
+            track.hits += 1
+            track.missed = 0
+            change = np.abs(appearances[d] - track.appearance).max()
+            track.refresh = bool(change > self.appearance_threshold)
+            if track.refresh:
+                track.appearance = appearances[d]  # New reference for the next comparison
+            assigned[d] = track
+            matched_tracks.add(t)
+
+        # Unmatched tracks age; unmatched detections start new tracks
+        survivors = []
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.missed += 1
+                track.refresh = False
+            if track.missed <= self.max_missed:
+                survivors.append(track)
+        for d, track in enumerate(assigned):
+            if track is None:
+                self.created += 1
+                assigned[d] = Track(self.created, boxes[d], labels[d], appearances[d])
+                survivors.append(assigned[d])
+        self.tracks = survivors
+        return assigned
+
+    def _similarity(self, boxes: np.ndarray, labels: list[str]) -> tuple[np.ndarray, float]:
+        """(tracks x detections) similarity matrix and the minimum similarity to match."""
+        if not self.tracks or not len(boxes):
+            return np.zeros((len(self.tracks), len(boxes)), dtype=np.float32), 1.0
+        track_boxes = np.stack([
+            track.predicted() if self.motion else track.bbox for track in self.tracks
+        ])
+        same_label = np.array([track.label for track in self.tracks])[:, None] == \
+            np.array(labels)[None, :]
+        if self.metric == "iou":
+            return np.where(same_label, iou_matrix(track_boxes, boxes), 0.0), self.iou_threshold
+
+        # Centroid: 1 at the same centre, 0 at max_distance x the track's diagonal
+        track_centres = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        centres = (boxes[:, :2] + boxes[:, 2:]) / 2
+        distance = np.linalg.norm(track_centres[:, None] - centres[None], axis=2)  # (T, D)
+        diagonal = np.linalg.norm(track_boxes[:, 2:] - track_boxes[:, :2], axis=1)
+        similarity = 1 - distance / np.maximum(self.max_distance * diagonal, 1e-6)[:, None]
+        return np.where(same_label, similarity, 0.0), 1e-6  # Any positive similarity matches
+
+
+def _appearance(frame: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """(N, 3) mean BGR of the central half of each box (less shelf background)."""
+    appearances = np.zeros((len(boxes), 3), dtype=np.float32)
+    for i, (x1, y1, x2, y2) in enumerate(boxes.tolist()):
+        qx, qy = (x2 - x1) // 4, (y2 - y1) // 4
+        centre = frame[y1 + qy:y2 - qy, x1 + qx:x2 - qx]
+        if centre.size:
+            appearances[i] = cv2.mean(centre)[:3]  # C loop over the view, no copy
+    return appearances
@@ -1,8 +1,17 @@
 """Tests for pipeline decorators."""
 
-import pytest
+import itertools
 import time
-from src.pipeline.decorators import timer, retry, log_execution
+
+import numpy as np
+import pytest
+
+from src.pipeline import parallel
+from src.pipeline.decorators import log_execution, retry, timer
+from src.pipeline.parallel import split_frame_ranges
+from src.utils.video_simulator import generate_test_video
+from src.vision.capture import stream_frames
+from src.vision.detect import Detection
 
 
 def test_timer_decorator():
@@ -49,3 +58,289 @@ def test_log_execution_decorator():
     
     result = example_func()
     assert result == 42
+
+
+def test_split_frame_ranges_covers_video():
+    """Test segments are contiguous, ordered and aligned to the stride."""
+    assert split_frame_ranges(100, 4) == [(0, 25), (25, 50), (50, 75), (75, 100)]
+    assert split_frame_ranges(3, 8) == [(0, 1), (1, 2), (2, 3)]
+    
+    ranges = split_frame_ranges(103, 3, stride=5)
+    assert ranges[0][0] == 0 and ranges[-1][1] == 103
+    assert all(start % 5 == 0 for start, _ in ranges)
+    assert all(a[1] == b[0] for a, b in itertools.pairwise(ranges))
+
+
+def test_process_segment_uses_global_frame_indices(tmp_path, monkeypatch):
+    """Test a worker segment seeks to its start and reports global frame indices."""
+    video = str(tmp_path / "sample.avi")
+    generate_test_video(video, duration=1, fps=25.0)
+    
+    seen = []
+    
+    class StubDetector:
+        def detect(self, frame):
+            seen.append(frame.copy())
+            return [Detection(bbox=(0, 0, 10, 10), label="apple", confidence=0.9)]
+    
+    monkeypatch.setattr(parallel, "_detector", StubDetector())
+    results = parallel._process_segment(video, 10, 20, 5)
+    
+    assert [r.frame_index for r in results] == [10, 15]
+    assert all(len(r.qualities) == len(r.detections) == 1 for r in results)
+    # The seek must land on the frames a sequential read yields at those indices
+    expected = [frame for _, frame in stream_frames(video, 0)][10:20:5]
+    assert len(seen) == len(expected) == 2
+    assert all(np.array_equal(a, b) for a, b in zip(seen, expected))
+    # Events get the same trace metadata as in the single-process path
+    assert [r.captured.frame_id for r in results] == [10, 15]
+    assert results[0].captured.trace_id != results[1].captured.trace_id
+    assert results[0].captured.image is None  # Pixels are not sent back to the parent
+
+
+def test_process_segment_honours_resize_and_gate(tmp_path, monkeypatch):
+    """Test workers resize frames like the main path and reuse results on unchanged frames."""
+    import cv2
+    
+    video = str(tmp_path / "still.avi")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 25.0, (320, 240))
+    for _ in range(6):
+        writer.write(np.full((240, 320, 3), 90, dtype=np.uint8))  # Static shelf
+    writer.release()
+    shapes = []
+    
+    class StubDetector:
+        def detect(self, frame):
+            shapes.append(frame.shape)
+            return [Detection(bbox=(0, 0, 10, 10), label="apple", confidence=0.9)]
+    
+    monkeypatch.setattr(parallel, "_detector", StubDetector())
+    monkeypatch.setattr(parallel, "_capture_options", {'resize': (160, 120)})
+    monkeypatch.setattr(parallel, "_gate_options", ("absdiff", None))
+    results = parallel._process_segment(video, 0, 6, 1)
+    
+    assert shapes == [(120, 160, 3)]  # One detection at the resized size, then gated
+    assert [r.reused for r in results] == [False] + [True] * 5
+    assert all(len(r.detections) == 1 for r in results)
+    
+    from click.testing import CliRunner
+
+    from src.main import cli
+    result = CliRunner().invoke(cli, ["detect", "-s", video, "--workers", "2", "--live"])
+    assert result.exit_code == 2 and "drop --workers" in result.output
+
+
+@pytest.mark.parametrize("method", ["absdiff", "phash"])
+def test_scene_change_gate(method):
+    """Test gate skips identical frames and re-analyses when the scene changes."""
+    from src.pipeline.gating import SceneChangeGate
+    
+    shelf = np.full((360, 640, 3), 40, dtype=np.uint8)
+    shelf[100:250, 50:300] = (0, 200, 255)  # Crate of oranges on the left
+    restocked = shelf.copy()
+    restocked[100:250, 350:500] = (0, 0, 255)  # New crate of apples on the right
+    gate = SceneChangeGate(method)
+    
+    assert gate.should_analyse(shelf)  # No reference yet
+    assert not gate.should_analyse(shelf.copy())
+    assert gate.should_analyse(restocked)
+    assert not gate.should_analyse(restocked)
+
+
+@pytest.mark.parametrize("policy", ["block", "drop"])
+def test_async_video_writer(tmp_path, policy):
+    """Test writer encodes queued frames in the background and counts drops."""
+    import cv2
+
+    from src.pipeline.writer import AsyncVideoWriter
+    
+    output = str(tmp_path / "out.avi")
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    writer = AsyncVideoWriter(
+        output, 10.0, (160, 120), codec="MJPG", queue_size=2, policy=policy
+    )
+    with writer:
+        for _ in range(20):
+            writer.write(frame)
+    
+    assert writer.written + writer.dropped == 20
+    if policy == "block":
+        assert writer.dropped == 0
+    assert cv2.VideoCapture(output).get(cv2.CAP_PROP_FRAME_COUNT) == writer.written
+
+
+def test_latency_tracker_percentiles():
+    """Test per-stage percentiles are reported in milliseconds, in pipeline order."""
+    from src.pipeline.latency import LatencyTracker
+    
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 201):  # Only the last 100 samples (101..200 ms) are kept
+        tracker.record("end_to_end", ms / 1000)
+    with tracker.measure("detect"):
+        pass
+    summary = tracker.summary()
+    
+    assert list(summary) == ["detect", "end_to_end"]
+    assert summary["end_to_end"]["count"] == 100
+    assert summary["end_to_end"]["p50"] == pytest.approx(150.5)
+    assert summary["end_to_end"]["p99"] == pytest.approx(199.01)
+
+
+def test_micro_batcher_size_and_deadline():
+    """Test batches close when full, or with what arrived once the deadline passes."""
+    from src.pipeline.batching import MicroBatcher
+    
+    assert list(MicroBatcher(range(10), batch_size=4)) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    
+    def slow_camera():
+        yield from (0, 1)
+        time.sleep(0.2)  # Far past the 20 ms deadline: [0, 1] must not wait for 2
+        yield 2
+    
+    assert list(MicroBatcher(slow_camera(), batch_size=4, max_delay=0.02)) == [[0, 1], [2]]
+
+
+
+def test_micro_batcher_live_keeps_newest_frames():
+    """Test live batching replaces stale frames instead of queuing them behind a slow consumer."""
+    import threading
+
+    from src.pipeline.batching import MicroBatcher
+    
+    burst = threading.Event()
+    dropped = []
+    
+    def live_camera():
+        yield 0
+        burst.wait()
+        yield from range(1, 10)  # Arrives while the consumer is busy with [0]
+    
+    batcher = MicroBatcher(
+        live_camera(), batch_size=4, max_delay=0.02, live=True, on_drop=dropped.append
+    )
+    batches = iter(batcher)
+    assert next(batches) == [0]
+    burst.set()
+    time.sleep(0.1)  # Detector busy: the reader keeps only the newest batch
+    
+    assert list(batches) == [[6, 7, 8, 9]]
+    assert dropped == [1, 2, 3, 4, 5] and batcher.dropped == 5
+
+
+def test_keyframe_interval_propagates_between_detections(tmp_path, monkeypatch):
+    """Test the detector runs only on keyframes and boxes are carried in between."""
+    from src.pipeline import orchestrator
+    
+    video = str(tmp_path / "shelf.avi")
+    generate_test_video(video, duration=1, fps=20.0)
+    detected = []
+    
+    class CountingDetector:
+        def __init__(self, *args, **kwargs):
+            pass
+        
+        def detect(self, frame, mask=None):
+            detected.append(frame)
+            return [Detection((100, 100, 160, 160), "apple", 0.9)]
+        
+        def detect_batch(self, frames, masks=None):
+            return [self.detect(frame) for frame in frames]
+    
+    monkeypatch.setattr(orchestrator, "FruitDetector", CountingDetector)
+    stats = orchestrator.process_shelf_video(orchestrator.PipelineConfig(
+        source=video, display=False, enable_events=False, keyframe_interval=5
+    ))
+    
+    assert len(detected) == 4 and stats['frames_propagated'] == 16
+    assert stats['detector_duty_cycle'] == 0.2
+    assert stats['detections'] == 20  # Propagated frames keep the keyframe's fruit
+
+
+def test_resolution_governor_follows_budget():
+    """Test the governor lowers imgsz over budget and raises it with headroom."""
+    from src.pipeline.governor import ResolutionGovernor
+    
+    governor = ResolutionGovernor(budget_ms=100, min_imgsz=320, max_imgsz=640, window=3)
+    assert governor.sizes == [320, 384, 448, 512, 576, 640] and governor.imgsz == 640
+    
+    # 4 cameras share the detector: 25 ms per frame; 60 ms at 640 is ~22 at 384, ~29 at 448
+    assert [governor.observe(60, cameras=4) for _ in range(3)] == [None, None, 384]
+    
+    # Cameras went offline: plenty of headroom, one step up per full window
+    assert [governor.observe(21, cameras=1) for _ in range(3)] == [None, None, 448]
+    assert governor.changes == 2
+    
+    with pytest.raises(ValueError):
+        ResolutionGovernor(budget_ms=50, min_imgsz=300)
+
+
+def test_governor_rejects_int8_precision():
+    """Test --precision int8 with --latency-budget fails in the CLI and in the library."""
+    from click.testing import CliRunner
+
+    from src.main import cli
+    from src.pipeline import orchestrator
+    
+    class SizedDetector:
+        imgsz = 640
+        
+        def set_imgsz(self, imgsz):
+            raise AssertionError("no INT8 model may be loaded for another size")
+    
+    config = orchestrator.PipelineConfig(
+        source="", engine="onnx", precision="int8", latency_budget_ms=40
+    )
+    with pytest.raises(ValueError, match="fp32"):
+        orchestrator._start_governor(config, SizedDetector())
+    
+    result = CliRunner().invoke(cli, [
+        "detect", "--source", "shelf.mp4", "--engine", "onnx", "--precision", "int8",
+        "--latency-budget", "40"
+    ])
+    assert result.exit_code == 2 and "--precision int8" in result.output
+
+
+def test_analyse_batch_governor_counts_active_cameras():
+    """Test the governor budget follows the cameras still sending frames, not all ever seen."""
+    from src.pipeline.analysis import analyse_batch
+    from src.pipeline.camera_state import CameraState
+    from src.pipeline.governor import ResolutionGovernor
+    from src.pipeline.latency import LatencyTracker
+    from src.vision.frames import CapturedFrame
+    
+    seen_cameras = []
+    
+    class FixedCostGovernor(ResolutionGovernor):
+        def observe(self, elapsed_ms, frames=1, cameras=1):
+            seen_cameras.append(cameras)
+            return super().observe(5.0 * frames, frames, cameras)  # 5 ms/frame at every size
+    
+    class SizedDetector:
+        imgsz = 640
+        
+        def detect(self, frame, mask=None):
+            return []
+        
+        def detect_batch(self, frames, masks=None):
+            return [[] for _ in frames]
+        
+        def set_imgsz(self, imgsz):
+            self.imgsz = imgsz
+    
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    cameras = {camera_id: CameraState() for camera_id in "abcd"}
+    governor = FixedCostGovernor(budget_ms=12, min_imgsz=320, max_imgsz=640, window=1)
+    detector = SizedDetector()
+    stats = {'inference_skipped': 0, 'quality_assessed': 0}
+    
+    # Four cameras: 3 ms each, 5 ms/frame is over budget
+    batch = [(camera_id, CapturedFrame(frame, 0, captured_at=0.0)) for camera_id in "abcd"]
+    analyse_batch(batch, detector, cameras, stats, LatencyTracker(), governor)
+    assert detector.imgsz < 640
+    
+    # Only camera "a" keeps streaming: the others time out and the size steps back up
+    for t in range(1, 10):
+        batch = [("a", CapturedFrame(frame, t, captured_at=float(t)))]
+        analyse_batch(batch, detector, cameras, stats, LatencyTracker(), governor)
+    assert seen_cameras[0] == 4 and seen_cameras[-1] == 1
+    assert detector.imgsz == 640 and len(cameras) == 4
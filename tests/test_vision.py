@@ -1,10 +1,37 @@
 """Tests for vision module."""
 
-import pytest
+import itertools
+import os
+import time
+import types
+
 import cv2
 import numpy as np
-from src.vision.capture import stream_frames, get_video_props
-from src.vision.detect import FruitDetector, Detection, draw_detections
+import pytest
+
+from src.utils.video_simulator import generate_test_video
+from src.vision.boxes import iou_matrix
+from src.vision.capture import capture_frames, get_video_props, stream_frames
+from src.vision.detect import Detection, FruitDetector, draw_detections
+from src.vision.frame_pool import FramePool
+from src.vision.multi_source import MultiSourceCapture
+from src.vision.prefetch import PrefetchReader
+from src.vision.registry import ModelRegistry
+
+
+@pytest.fixture(autouse=True)
+def fresh_model_registry(monkeypatch):
+    """Empty model registry per test: models loaded under a monkeypatched YOLO never leak."""
+    from src.vision import detect as detect_module
+    monkeypatch.setattr(detect_module, "MODEL_REGISTRY", ModelRegistry())
+
+
+@pytest.fixture(scope="module")
+def sample_video(tmp_path_factory):
+    """Short synthetic video file (25 frames, 640x480)."""
+    path = tmp_path_factory.mktemp("videos") / "sample.avi"
+    generate_test_video(str(path), duration=1, fps=25.0)
+    return str(path)
 
 
 def test_stream_frames_with_limit():
@@ -13,6 +40,199 @@ def test_stream_frames_with_limit():
     assert len(frames) <= 5
 
 
+def test_stream_frames_prefetch_matches_sequential(sample_video):
+    """Test prefetched frames are identical and in the same order."""
+    sequential = [frame for _, frame in stream_frames(sample_video)]
+    prefetched = [frame for _, frame in stream_frames(sample_video, prefetch=3)]
+    
+    assert len(prefetched) == len(sequential) == 25
+    assert all(np.array_equal(a, b) for a, b in zip(sequential, prefetched))
+
+
+def test_prefetch_reader_early_stop_and_errors():
+    """Test consumer can stop early and decoder errors are re-raised."""
+    reader = PrefetchReader(iter(range(100)), depth=2)
+    for item in reader:
+        if item == 5:
+            break
+    assert not reader._thread.is_alive()
+    
+    with pytest.raises(ValueError):
+        list(stream_frames("missing_video.avi", prefetch=2))
+
+
+def test_stream_frames_live_drops_stale_frames(sample_video):
+    """Test live mode skips frames a slow consumer cannot keep up with."""
+    stats = {'frames_dropped': 0}
+    consumed = 0
+    for _, frame in stream_frames(sample_video, live=True, stats=stats):
+        time.sleep(0.02)  # Simulate slow inference
+        consumed += 1
+    
+    assert stats['frames_dropped'] > 0
+    assert consumed + stats['frames_dropped'] == 25
+
+
+def test_stream_frames_pool_reuses_buffers(sample_video):
+    """Test pooled decoding recycles buffers once the consumer releases them."""
+    pool = FramePool(capacity=4)
+    expected = [frame for _, frame in stream_frames(sample_video)]
+    
+    for i, (_, frame) in enumerate(stream_frames(sample_video, prefetch=2, pool=pool)):
+        assert np.array_equal(frame, expected[i])
+        pool.release(frame)
+    
+    assert pool.allocated <= 4  # prefetch depth + in-flight frames, not 25
+    assert pool.in_use == 0
+
+
+@pytest.mark.parametrize("mode", [{"prefetch": 4}, {"live": True}])
+def test_stream_frames_early_stop_returns_pooled_buffers(sample_video, mode):
+    """Test frames buffered ahead of a consumer that stops early go back to the pool."""
+    pool = FramePool(capacity=8)
+    frames = stream_frames(sample_video, pool=pool, **mode)
+    for _ in range(2):
+        _, frame = next(frames)
+        pool.release(frame)
+    time.sleep(0.1)  # Reader thread fills the queue / latest-frame slot
+    frames.close()  # Consumer stops early
+    
+    assert pool.in_use == 0
+    assert pool.available == pool.allocated  # Every buffer came back for reuse
+
+
+def test_frame_pool_refcounting():
+    """Test a buffer is recycled only after every holder releases it."""
+    pool = FramePool(capacity=2)
+    buffer = pool.acquire((4, 4, 3))
+    pool.retain(buffer)
+    
+    pool.release(buffer)
+    assert pool.acquire((4, 4, 3)) is not buffer  # Still held by one stage
+    pool.release(buffer)
+    assert pool.acquire((4, 4, 3)) is buffer
+
+
+def test_stream_frames_stride_skips_frames(sample_video):
+    """Test stride/target_fps yield every Nth frame of the source."""
+    all_frames = [frame for _, frame in stream_frames(sample_video)]
+    strided = [frame for _, frame in stream_frames(sample_video, frame_stride=5)]
+    by_fps = [frame for _, frame in stream_frames(sample_video, target_fps=5.0)]  # 25 fps / 5
+    
+    assert len(strided) == len(by_fps) == 5
+    assert all(np.array_equal(a, b) for a, b in zip(strided, all_frames[::5]))
+    assert all(np.array_equal(a, b) for a, b in zip(by_fps, strided))
+
+
+def test_capture_frames_carry_trace_metadata(sample_video):
+    """Test captured frames keep source positions, capture order and unique trace ids."""
+    frames = list(capture_frames(sample_video, frame_stride=5, start_frame=2))
+    
+    assert [f.frame_id for f in frames] == [2, 7, 12, 17, 22]
+    assert all(a.captured_at <= b.captured_at for a, b in itertools.pairwise(frames))
+    assert len({f.trace_id for f in frames}) == len(frames)
+    assert frames[0].age() >= 0
+
+
+def test_frame_cache_serves_repeat_runs_from_mmap(sample_video, tmp_path):
+    """Test the first run decodes into the cache and later runs read identical frames."""
+    options = {'frame_stride': 3, 'resize': (320, 240), 'cache_dir': str(tmp_path)}
+    first_stats, second_stats = {}, {}
+    decoded = [f.image for f in capture_frames(sample_video, stats=first_stats, **options)]
+    cached = list(capture_frames(sample_video, stats=second_stats, **options))
+    
+    assert (first_stats['frame_cache'], second_stats['frame_cache']) == ('miss', 'hit')
+    assert [f.frame_id for f in cached] == list(range(0, 25, 3))
+    assert all(np.array_equal(a, b.image) for a, b in zip(decoded, cached))
+    assert isinstance(cached[0].image.base, np.memmap)  # Zero-copy view, not a decoded copy
+    assert cached[0].image.shape == (240, 320, 3)
+    
+    uncached = [
+        frame for _, frame in stream_frames(sample_video, frame_stride=3, resize=(320, 240))
+    ]
+    assert all(np.array_equal(a, b) for a, b in zip(uncached, decoded))
+
+
+def test_multi_source_capture_merges_cameras(sample_video):
+    """Test frames from every camera are tagged and a broken camera is skipped."""
+    capture = MultiSourceCapture(
+        {"aisle-1": sample_video, "aisle-2": sample_video, "broken": "missing.avi"},
+        max_frames=10
+    )
+    items = list(capture)
+    
+    assert len(items) == 20
+    assert {camera_id for camera_id, _, _ in items} == {"aisle-1", "aisle-2"}
+    assert capture.frame_counts == {"aisle-1": 10, "aisle-2": 10, "broken": 0}
+    assert "broken" in capture.errors
+    assert all(frame.shape == (480, 640, 3) for _, _, frame in items)
+
+
+def test_camera_fleet_mixes_profiles_and_counts_drops(sample_video):
+    """Test simulated cameras get their own profile and a saturated consumer causes drops."""
+    from src.utils.fleet import CameraFleet, fleet_specs
+    
+    specs = fleet_specs(
+        4, sources=["synthetic", sample_video], fps=[200.0], resolutions=[(160, 120), None]
+    )
+    fleet = CameraFleet(specs, max_frames=10, queue_size=1, seed=0)
+    items = []
+    for item in fleet:
+        time.sleep(0.01)  # Slower than 4 cameras x 200 fps: the queue overflows
+        items.append(item)
+    
+    expected = {"sim-00": (120, 160, 3), "sim-01": (480, 640, 3),
+                "sim-02": (120, 160, 3), "sim-03": (480, 640, 3)}
+    assert all(frame.shape == expected[camera_id] for camera_id, _, frame in items)
+    assert fleet.frames_dropped > 0
+    assert len(items) == sum(fleet.frame_counts.values())
+
+
+def test_synthetic_source_ground_truth():
+    """Test rendered blobs sit inside their ground-truth boxes and matching scores them."""
+    from src.utils.synthetic import SyntheticSource, match_ground_truth
+    
+    source = SyntheticSource(320, 240, num_fruits=1, speed=3.0, seed=7)
+    frames = list(source.frames(3))
+    
+    for frame in frames:
+        (obj,) = frame.objects
+        x1, y1, x2, y2 = obj.bbox
+        centre = frame.image[(y1 + y2) // 2, (x1 + x2) // 2]
+        assert np.allclose(centre, obj.color, atol=2)  # Unshaded colour at the centre
+        assert not np.allclose(frame.image[y1, x1], obj.color, atol=2)  # Corner: background
+    assert frames[0].objects[0].bbox != frames[2].objects[0].bbox  # Blob drifts
+    
+    truth = frames[0].objects
+    perfect = [Detection(t.bbox, t.label, 0.9) for t in truth]
+    assert match_ground_truth(perfect, truth)['recall'] == 1.0
+    wrong_label = [Detection(truth[0].bbox, "pear", 0.9)]
+    assert match_ground_truth(wrong_label, truth) == {
+        'tp': 0, 'fp': 1, 'fn': 1, 'precision': 0.0, 'recall': 0.0
+    }
+    assert np.allclose(iou_matrix([[0, 0, 10, 10]], [[5, 0, 15, 10], [20, 20, 30, 30]]),
+                       [[1 / 3, 0.0]])
+
+
+def test_shelf_roi_crops_maps_and_filters():
+    """Test detection runs on the ROI crop, boxes return to frame coords, outsiders drop."""
+    from src.vision.roi import ShelfROI
+    
+    class CropDetector:
+        def detect(self, crop, mask=None):
+            self.shape = crop.shape
+            # Centres (15, 15) and (85, 85) in crop coords -> (65, 45) and (135, 115) in frame
+            return [Detection((10, 10, 20, 20), "apple", 0.9),
+                    Detection((80, 80, 90, 90), "orange", 0.8)]
+    
+    detector = CropDetector()
+    roi = ShelfROI([(50, 30), (150, 30), (50, 130)])  # Triangle: lower-right corner excluded
+    detections = roi.detect(detector, np.zeros((240, 320, 3), dtype=np.uint8))
+    
+    assert detector.shape == (101, 101, 3)
+    assert detections == [Detection((60, 40, 70, 50), "apple", 0.9)]
+
+
 def test_fruit_detector_initialization():
     """Test detector initialization."""
     detector = FruitDetector(conf_threshold=0.5)
@@ -29,3 +249,415 @@ def test_draw_detections():
     annotated = draw_detections(frame, detections)
     assert annotated.shape == frame.shape
     assert not np.array_equal(annotated, frame)  # Should be different
+    
+    out = np.empty_like(frame)
+    assert draw_detections(frame, detections, out=out) is out
+    assert np.array_equal(out, annotated)
+
+
+def test_shared_frame_ring_across_processes(sample_video):
+    """Test frames written by a capture process are read zero-copy by the consumer."""
+    import multiprocessing as mp
+
+    from src.vision.capture import stream_to_ring
+    from src.vision.shared_frames import SharedFrameRing
+    
+    expected = [frame for _, frame in stream_frames(sample_video, max_frames=10)]
+    context = mp.get_context("spawn")
+    ring = SharedFrameRing(slots=3, max_frame_shape=(480, 640, 3), context=context)
+    producer = context.Process(target=stream_to_ring, args=(sample_video, ring, 10))
+    producer.start()
+    
+    received = []
+    for slot, frame, index in ring.frames(timeout=30):
+        assert np.array_equal(frame, expected[index])
+        received.append(index)
+        del frame  # Drop the view before handing the slot back
+        ring.release(slot)
+    producer.join(timeout=30)
+    ring.close()
+    ring.unlink()
+    
+    assert received == list(range(10))
+
+
+def test_video_source_reconnects_after_read_failure(monkeypatch):
+    """Test a live source reconnects with backoff instead of ending the stream."""
+    from src.vision import source as source_module
+    
+    class FlakyCapture:
+        opened = 0
+        
+        def __init__(self, source):
+            FlakyCapture.opened += 1
+            self.reads = 0
+        
+        def isOpened(self):
+            return True
+        
+        def grab(self):
+            self.reads += 1
+            return FlakyCapture.opened > 1 or self.reads <= 3  # First connection drops
+        
+        def retrieve(self, image=None):
+            return True, np.zeros((4, 4, 3), dtype=np.uint8)
+        
+        def get(self, prop_id):
+            return 0.0
+        
+        def release(self):
+            pass
+    
+    monkeypatch.setattr(source_module.cv2, "VideoCapture", FlakyCapture)
+    monkeypatch.setattr(source_module.time, "sleep", lambda seconds: None)
+    stats = {}
+    frames = list(stream_frames("rtsp://shelf-cam/stream", max_frames=6, stats=stats))
+    
+    assert len(frames) == 6
+    assert stats['reconnects'] == 1
+    assert get_video_props("rtsp://shelf-cam/stream")['fps'] == 25.0  # Cached, not re-opened
+    assert FlakyCapture.opened == 2
+
+
+def test_probe_cache_follows_file_and_reconnect_changes(tmp_path, monkeypatch):
+    """Test cached properties are refreshed for rewritten files and reconnected cameras."""
+    from src.vision import source as source_module
+    
+    path = str(tmp_path / "shelf.avi")
+    generate_test_video(path, duration=1, width=320, height=240)
+    list(stream_frames(path, max_frames=1))  # Opening the file fills the cache
+    assert get_video_props(path)['width'] == 320
+    generate_test_video(path, duration=1, width=640, height=480)  # Same path, new file
+    assert get_video_props(path)['width'] == 640
+    
+    class ResizingCapture:
+        opened = 0
+        
+        def __init__(self, source):
+            ResizingCapture.opened += 1
+        
+        def isOpened(self):
+            return True
+        
+        def get(self, prop_id):
+            return 640.0 * ResizingCapture.opened if prop_id == cv2.CAP_PROP_FRAME_WIDTH else 0.0
+        
+        def release(self):
+            pass
+    
+    monkeypatch.setattr(source_module.cv2, "VideoCapture", ResizingCapture)
+    camera = source_module.VideoSource("rtsp://aisle-cam/stream")
+    assert get_video_props("rtsp://aisle-cam/stream")['width'] == 640
+    camera._connect(0, reconnect=True)  # Camera came back at a higher resolution
+    assert get_video_props("rtsp://aisle-cam/stream")['width'] == 1280
+    assert camera.props['width'] == 1280
+
+
+def test_video_source_keeps_props_when_file_changes(tmp_path):
+    """Test an open source keeps its probed properties after the shared cache entry goes stale."""
+    from src.vision import source as source_module
+    
+    path = str(tmp_path / "recording.avi")
+    generate_test_video(path, duration=1, width=320, height=240)
+    video = source_module.VideoSource(path)
+    os.utime(path, ns=(0, 0))  # Recording still being written: mtime moves after open
+    assert source_module.cached_props(path) is None
+    assert video.props['width'] == 320 and video.props['height'] == 240
+    video.release()
+
+
+@pytest.mark.parametrize("policy", ["catchup", "drop"])
+def test_frame_pacer_keeps_absolute_schedule(monkeypatch, policy):
+    """Test deadlines do not drift with work time and late frames are burst or dropped."""
+    from src.utils import pacing
+    
+    clock = {"now": 100.0}
+    monkeypatch.setattr(pacing.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(pacing.time, "sleep", lambda s: clock.update(now=clock["now"] + s))
+    pacer = pacing.FramePacer(fps=10, policy=policy)
+    
+    for _ in range(5):
+        pacer.wait()
+        clock["now"] += 0.03  # 30 ms of decode/processing per frame: absorbed, no drift
+    assert clock["now"] == pytest.approx(100.43)  # Frame 4 released at exactly 100.4
+    
+    clock["now"] += 0.25  # Consumer stalls until 100.68: deadlines 100.5 and 100.6 pass
+    skip = pacer.wait()
+    assert skip == (1 if policy == "drop" else 0)  # drop: skip frame 5, release frame 6 now
+    assert pacer.late == 1
+    assert pacer.emitted == 6 and pacer.dropped == skip
+
+
+def test_frame_pacer_achieved_fps_counts_stalls(monkeypatch):
+    """Test a resync after a long stall restarts the schedule but not the measured rate."""
+    from src.utils import pacing
+    
+    clock = {"now": 0.0}
+    monkeypatch.setattr(pacing.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(pacing.time, "sleep", lambda s: clock.update(now=clock["now"] + s))
+    pacer = pacing.FramePacer(fps=10, policy="catchup", max_catchup=1.0)
+    
+    for _ in range(5):
+        pacer.wait()  # Frames at 0.0 .. 0.4
+    clock["now"] += 2.0  # Stall past max_catchup: 2.4
+    pacer.wait()
+    pacer.wait()  # Back on the restarted schedule: 2.5
+    assert pacer.resyncs == 1
+    assert pacer.achieved_fps == pytest.approx(6 / 2.5)  # Not the nominal 10 fps
+
+
+def test_detector_parses_columnar_batch_with_class_mask(monkeypatch):
+    """Test boxes are parsed in bulk, filtered by class id and materialized on demand."""
+    import torch
+    from ultralytics.engine.results import Boxes
+
+    from src.vision import detect as detect_module
+    from src.vision.detect import DetectionBatch
+    
+    class FakeYOLO:
+        def __init__(self, model_name):
+            self.names = {0: "person", 1: "apple", 2: "orange"}
+        
+        def __call__(self, frame, **kwargs):
+            data = torch.tensor([[10.7, 20.0, 50.0, 60.0, 0.9, 1.0],    # apple
+                                 [0.0, 0.0, 30.0, 90.0, 0.8, 0.0],      # person: filtered
+                                 [100.0, 5.0, 140.0, 45.0, 0.5, 2.0]])  # orange
+            return [types.SimpleNamespace(boxes=Boxes(data, orig_shape=(240, 320)))]
+    
+    monkeypatch.setattr(detect_module, "YOLO", FakeYOLO)
+    detector = FruitDetector(classes=["apple", "orange"])
+    detections = detector.detect(np.zeros((240, 320, 3), dtype=np.uint8))
+    
+    assert isinstance(detections, DetectionBatch)
+    assert detections.labels == ["apple", "orange"]
+    assert detections.boxes.tolist() == [[10, 20, 50, 60], [100, 5, 140, 45]]
+    assert detections[0] == Detection((10, 20, 50, 60), "apple", pytest.approx(0.9))
+    assert len(detections[detections.confidences > 0.6]) == 1  # Mask -> filtered batch
+
+
+def test_nms_is_class_aware():
+    """Test overlapping boxes suppress each other only within the same class."""
+    from src.vision.boxes import nms
+    
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [1, 1, 10, 10], [50, 50, 60, 60]])
+    scores = np.array([0.9, 0.8, 0.7, 0.6])
+    
+    assert nms(boxes, scores, 0.5).tolist() == [0, 3]
+    assert nms(boxes, scores, 0.5, class_ids=np.array([0, 0, 1, 0])).tolist() == [0, 2, 3]
+
+
+def test_onnx_letterbox_and_decode_round_trip():
+    """Test raw YOLO output in letterboxed model pixels maps back to frame pixels."""
+    from src.vision.onnx_engine import decode_predictions, letterbox
+    
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    padded, scale, pad = letterbox(frame, 640)
+    assert padded.shape == (640, 640, 3) and scale == 2.0 and pad == (0, 80)
+    assert padded[0, 0, 0] == 114 and padded[320, 320, 0] == 0  # Grey bars, image in the middle
+    
+    # Anchors (columns): apple at frame (10, 20, 50, 60), weaker duplicate, below threshold
+    output = np.array([
+        [60, 62, 400],     # cx
+        [160, 160, 400],   # cy
+        [80, 80, 10],      # w
+        [80, 80, 10],      # h
+        [0.9, 0.6, 0.1],   # class 0 score
+        [0.05, 0.1, 0.2],  # class 1 score
+    ], dtype=np.float32)
+    boxes, scores, class_ids = decode_predictions(output, 0.25, 0.7, scale, pad, frame.shape)
+    
+    assert boxes.tolist() == [[10, 20, 50, 60]]
+    assert scores.tolist() == [pytest.approx(0.9)] and class_ids.tolist() == [0]
+
+
+def test_calibration_frames_sampled_across_video(tmp_path):
+    """Test calibration frames are spread over the video and fed letterboxed to the calibrator."""
+    from src.vision.quantize import FrameCalibrationReader, sample_frames
+    
+    video = str(tmp_path / "shelf.avi")
+    generate_test_video(video, duration=2, width=320, height=240, fps=10)  # 20 frames
+    frames = sample_frames([video], 4)
+    reader = FrameCalibrationReader(frames, "images", 64)
+    inputs = iter(reader.get_next, None)  # iter(callable, sentinel): call until None
+    
+    assert len(frames) == 4 and frames[0].shape == (240, 320, 3)
+    assert [batch["images"].shape for batch in inputs] == [(1, 3, 64, 64)] * 4
+    with pytest.raises(ValueError, match="int8"):
+        FruitDetector(engine="torch", precision="int8")
+
+
+def test_quantize_head_nodes_and_fp32_int8_report(tmp_path):
+    """Test the detection head is excluded from quantization and the report compares models."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper, numpy_helper
+
+    from src.vision.quantize import _head_nodes, compare_models
+    
+    # Tiny YOLO-shaped model: Conv -> (1, 4 box + 1 class, 1024 anchors) -> sigmoid class scores
+    bias = np.array([16, 16, 8, 8, 2], dtype=np.float32)  # Box (12, 12, 20, 20), score 0.88
+    graph = helper.make_graph(
+        [
+            helper.make_node("Conv", ["images", "w", "b"], ["features"], name="conv"),
+            helper.make_node("Reshape", ["features", "shape"], ["flat"], name="reshape"),
+            helper.make_node("Split", ["flat", "split"], ["box", "logit"], axis=1, name="split"),
+            helper.make_node("Sigmoid", ["logit"], ["score"], name="sigmoid"),
+            helper.make_node("Concat", ["box", "score"], ["output0"], axis=1, name="concat"),
+        ],
+        "head",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, 32, 32])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, 5, 1024])],
+        [
+            numpy_helper.from_array(np.zeros((5, 3, 1, 1), dtype=np.float32), "w"),
+            numpy_helper.from_array(bias, "b"),
+            numpy_helper.from_array(np.array([1, 5, -1], dtype=np.int64), "shape"),
+            numpy_helper.from_array(np.array([4, 1], dtype=np.int64), "split"),
+        ]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=8)
+    helper.set_model_props(model, {"names": "{0: 'apple'}"})
+    path = tmp_path / "tiny.onnx"
+    onnx.save(model, str(path))
+    
+    assert sorted(_head_nodes(model)) == ["concat", "reshape", "sigmoid", "split"]
+    frames = [np.full((64, 64, 3), 100, dtype=np.uint8)] * 3
+    report = compare_models(path, path, frames)
+    assert report["fp32"]["detections"] == report["int8"]["detections"] == 3  # One box per frame
+    assert report["agreement"]["matched"] == 3
+    assert report["agreement"]["recall"] == report["agreement"]["precision"] == 1.0
+
+
+def test_onnx_engine_runs_a_batch_in_one_session_call(tmp_path):
+    """Test a dynamic-batch export detects in all frames of a batch with one session.run."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper, numpy_helper
+
+    from src.vision.onnx_engine import OnnxEngine
+    
+    # Per-pixel box (12, 12, 20, 20) scored by the red channel: bright frames detect, dark don't
+    weights = np.zeros((5, 3, 1, 1), dtype=np.float32)
+    weights[4, 0] = 1.0  # Input is RGB after swapRB: channel 0 = red
+    graph = helper.make_graph(
+        [
+            helper.make_node("Conv", ["images", "w", "b"], ["features"]),
+            helper.make_node("Reshape", ["features", "shape"], ["output0"]),
+        ],
+        "dynamic",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, ["batch", 3, "h", "w"])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, ["batch", 5, "anchors"])],
+        [
+            numpy_helper.from_array(weights, "w"),
+            numpy_helper.from_array(np.array([16, 16, 8, 8, 0], dtype=np.float32), "b"),
+            numpy_helper.from_array(np.array([0, 5, -1], dtype=np.int64), "shape"),
+        ]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=8)
+    helper.set_model_props(model, {"names": "{0: 'apple'}", "imgsz": "[32, 32]"})
+    path = tmp_path / "dynamic.onnx"
+    onnx.save(model, str(path))
+    
+    engine = OnnxEngine(path)
+    assert engine.batched and engine.imgsz == 32  # Size from metadata: the axes are free
+    calls = []
+    session = engine.session
+    engine.session = types.SimpleNamespace(
+        run=lambda *args: calls.append(args[1]["images"].shape) or session.run(*args)
+    )
+    bright = np.full((64, 64, 3), (0, 0, 255), dtype=np.uint8)  # BGR red
+    dark = np.zeros((64, 64, 3), dtype=np.uint8)
+    predictions = engine.predict_batch([bright, dark, bright], conf_threshold=0.5)
+    
+    assert calls == [(3, 3, 32, 32)]
+    assert [len(class_ids) for _, _, class_ids in predictions] == [1, 0, 1]
+    assert predictions[0][0].tolist() == [[24, 24, 40, 40]]  # Model box x2 (64 -> 32 letterbox)
+
+
+def test_tiled_detection_merges_overlaps_and_skips_masked_tiles(monkeypatch):
+    """Test tiles cover the frame, duplicates in overlaps merge, masked-out tiles are not run."""
+    from src.vision.detect import DetectionBatch
+    from src.vision.tiling import tile_grid
+    
+    assert tile_grid((300, 500), 200, 0.5) == [
+        (0, 0, 200, 200), (100, 0, 300, 200), (200, 0, 400, 200), (300, 0, 500, 200),
+        (0, 100, 200, 300), (100, 100, 300, 300), (200, 100, 400, 300), (300, 100, 500, 300),
+    ]
+    
+    detector = FruitDetector.__new__(FruitDetector)  # Skip model loading, tiling logic only
+    detector.tile_size, detector.tile_overlap, detector.tile_iou = 200, 0.5, 0.5
+    detector.names = ("apple", "grape")
+    seen = []
+    
+    def fake_infer(crops):
+        seen.extend(crop.shape for crop in crops)
+        results = []
+        for crop in crops:  # "Detect" the bright pixels of each tile, in tile coordinates
+            ys, xs = np.nonzero(crop[..., 0])
+            boxes = [[xs.min(), ys.min(), xs.max() + 1, ys.max() + 1]] if len(xs) else []
+            results.append(DetectionBatch.from_arrays(
+                np.array(boxes).reshape(-1, 4), np.full(len(boxes), 0.8),
+                np.ones(len(boxes)), detector.names
+            ))
+        return results
+    
+    monkeypatch.setattr(detector, "_infer", fake_infer)
+    frame = np.zeros((300, 500, 3), dtype=np.uint8)
+    frame[80:95, 180:195] = 255  # Grape inside two overlapping tiles
+    frame[250:260, 40:50] = 255  # Grape inside one tile
+    mask = np.zeros((300, 500), dtype=np.uint8)
+    mask[:, :150] = 1  # Only tiles starting at x = 0 or 100 touch the shelf
+    detections = detector.detect(frame, mask)
+    
+    assert len(seen) == 4 and seen[0] == (200, 200, 3)
+    assert sorted(d.bbox for d in detections) == [(40, 250, 50, 260), (180, 80, 195, 95)]
+    assert detections.labels == ["grape", "grape"]
+
+
+def test_model_registry_loads_and_warms_once(monkeypatch):
+    """Test detectors with the same model share one loaded, warmed-up handle."""
+    from src.vision import detect as detect_module
+    
+    calls = {"load": 0, "infer": 0}
+    
+    class CountingYOLO:
+        def __init__(self, model_name):
+            self.names = {0: "apple"}
+            calls["load"] += 1
+        
+        def __call__(self, frame, **kwargs):
+            calls["infer"] += 1
+            return []
+    
+    monkeypatch.setattr(detect_module, "YOLO", CountingYOLO)
+    first = FruitDetector("fake-registry.pt", warmup=2)
+    second = FruitDetector("fake-registry.pt", conf_threshold=0.6, warmup=2)
+    other_size = FruitDetector("fake-registry.pt", imgsz=320, warmup=0)
+    
+    assert first.model is second.model and other_size.model is not first.model
+    assert calls == {"load": 2, "infer": 2}  # Warm-up ran for the first handle only
+
+
+def test_tracker_keeps_ids_and_refreshes_on_change():
+    """Test a static fruit keeps its track id and is re-scored only when it changes."""
+    from src.vision.tracker import Tracker
+    
+    frame = np.full((200, 300, 3), 40, dtype=np.uint8)
+    frame[20:80, 20:80] = (0, 0, 200)  # Red apple
+    apple = Detection((20, 20, 80, 80), "apple", 0.9)
+    tracker = Tracker()
+    
+    first = tracker.update([apple], frame)
+    second = tracker.update([Detection((22, 21, 82, 81), "apple", 0.8)], frame)
+    assert second[0].track_id == first[0].track_id and not second[0].refresh
+    
+    frame[20:80, 20:80] = (0, 60, 120)  # Browning
+    pear = Detection((25, 20, 85, 80), "pear", 0.7)  # Same place, other class
+    changed = tracker.update([apple, pear], frame)
+    assert changed[0].track_id == first[0].track_id and changed[0].refresh
+    assert changed[1].track_id != first[0].track_id and changed[1].refresh
+    assert tracker.created == 2
+    
+    centroid = Tracker("centroid")
+    centroid.update([apple], frame)
+    moved = centroid.update([Detection((40, 30, 100, 90), "apple", 0.9)], frame)  # IoU < 0.5
+    assert moved[0].track_id == 1